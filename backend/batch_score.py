@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Offline batch scoring: one resume against many job descriptions.
+
+The resume is extracted once, job descriptions are deduplicated and
+pre-scored, and results are written to ResumeAnalysisResults with
+BatchWriteItem, so each can be opened in the app by its resultId. The run
+prints the job descriptions ranked by score.
+
+Runs outside API Gateway (whose 30 s timeout a batch of model calls would
+exceed) with the operator's credentials; the per-user rate limits do not
+apply.
+
+    run      score now with on-demand model calls, --concurrency at a time
+    prepare  write a Bedrock batch inference input file and manifest instead,
+             optionally submitting the job (--submit); for runs of hundreds
+             of job descriptions, at batch inference pricing
+    status   show a submitted batch inference job
+    collect  read a finished job's output, store the results and rank them
+
+Usage:
+    python batch_score.py run --resume resume.pdf --jd-dir postings/ [--concurrency 4] [--user-id SUB]
+    python batch_score.py prepare --resume s3://bucket/uploads/SUB/resume.pdf --jd-dir postings/ \\
+        --out s3://bucket/batch/run-1 [--submit --role-arn ARN]
+    python batch_score.py status --job-arn ARN
+    python batch_score.py collect --manifest s3://bucket/batch/run-1/manifest.json \\
+        --output s3://bucket/batch/run-1/output/JOB_ID/records.jsonl.out
+"""
+
+import os
+import sys
+import json
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'lambdas'))
+from resume_tailor_core.batch import DEFAULT_CONCURRENCY  # noqa: E402
+from resume_tailor_core.batch_scoring import (apply_batch_output, batch_inference_records, extract_text,  # noqa: E402
+                                              plan_jobs, prepare_jobs, ranking, resume_document, score_batch,
+                                              store_results)
+from resume_tailor_core.clients import get_client  # noqa: E402
+from resume_tailor_core.result_store import BUCKET_NAME  # noqa: E402
+from resume_tailor_core.scoring import BEDROCK_REGION, MODEL_ID  # noqa: E402
+
+# Bedrock rejects batch inference jobs with fewer records than this
+MIN_BATCH_RECORDS = 100
+RECORDS_FILE = 'records.jsonl'
+MANIFEST_FILE = 'manifest.json'
+
+
+def split_s3_uri(uri):
+    bucket, _, key = uri[len('s3://'):].partition('/')
+    return bucket, key
+
+
+def read_text(location):
+    """Contents of a local path or s3:// URI"""
+    if location.startswith('s3://'):
+        bucket, key = split_s3_uri(location)
+        return get_client('s3').get_object(Bucket=bucket, Key=key)['Body'].read().decode('utf-8')
+    return Path(location).read_text(encoding='utf-8')
+
+
+def write_text(location, text):
+    """Write to a local path or s3:// URI"""
+    if location.startswith('s3://'):
+        bucket, key = split_s3_uri(location)
+        get_client('s3').put_object(Bucket=bucket, Key=key, Body=text.encode('utf-8'))
+    else:
+        Path(location).parent.mkdir(parents=True, exist_ok=True)
+        Path(location).write_text(text, encoding='utf-8')
+
+
+def join_location(base, name):
+    return f"{base.rstrip('/')}/{name}" if base.startswith('s3://') else str(Path(base) / name)
+
+
+def load_resume(location):
+    """(resume text, s3 key) for a .txt file, a local PDF, or a PDF in the app's bucket"""
+    if location.startswith('s3://'):
+        bucket, key = split_s3_uri(location)
+        if bucket != BUCKET_NAME:
+            sys.exit(f"Resumes must be in s3://{BUCKET_NAME}/ so results can link to them")
+        return extract_text(resume_document(key)), key
+    if location.lower().endswith('.pdf'):
+        return extract_text({'Bytes': Path(location).read_bytes()}), None
+    return Path(location).read_text(encoding='utf-8'), None
+
+
+def load_job_descriptions(files, directory):
+    """(name, text) per job description file, in name order for a directory"""
+    paths = [Path(f) for f in files or []]
+    if directory:
+        paths += sorted(p for p in Path(directory).iterdir() if p.is_file() and p.suffix in ('.txt', '.md'))
+    if not paths:
+        sys.exit("No job descriptions: pass --jd files or --jd-dir")
+    return [(p.name, p.read_text(encoding='utf-8')) for p in paths]
+
+
+def print_ranking(ranked, names, as_json):
+    for entry in ranked:
+        entry['files'] = [names[i] for i in entry.pop('inputs')]
+    if as_json:
+        print(json.dumps(ranked, indent=2))
+        return
+    print(f"{'rank':>4} {'score':>5} {'coverage':>8}  {'resultId':<36}  job description")
+    for entry in ranked:
+        rank = entry['rank'] if entry['rank'] is not None else '-'
+        score = entry['score'] if entry['score'] is not None else '-'
+        coverage = f"{entry['coverage']:.0%}" if entry.get('coverage') is not None else '-'
+        note = entry.get('invalid') or entry.get('error') or ''
+        print(f"{rank:>4} {score:>5} {coverage:>8}  {entry['resultId'] or '-':<36}  "
+              f"{', '.join(entry['files'])}: {entry['title']}" + (f"  [{note}]" if note else ''))
+
+
+def report_store_errors(jobs):
+    failed = [job for job in jobs if job.get('storeError')]
+    if failed:
+        print(f"⚠️  {len(failed)} job descriptions could not be stored and are kept inline in their results "
+              f"(first error: {failed[0]['storeError']})", file=sys.stderr)
+
+
+def command_run(args):
+    resume_text, s3_key = load_resume(args.resume)
+    named = load_job_descriptions(args.jd, args.jd_dir)
+    jobs = score_batch(resume_text, [text for _, text in named], s3_key, args.user_id, args.concurrency)
+    report_store_errors(jobs)
+    print_ranking(ranking(jobs), [name for name, _ in named], args.json)
+
+
+def command_prepare(args):
+    resume_text, s3_key = load_resume(args.resume)
+    named = load_job_descriptions(args.jd, args.jd_dir)
+    jobs = plan_jobs(text for _, text in named)
+    prepare_jobs(jobs, resume_text, concurrency=args.concurrency)
+    report_store_errors(jobs)
+    records = list(batch_inference_records(jobs))
+    if len(records) < MIN_BATCH_RECORDS:
+        print(f"⚠️  {len(records)} records; Bedrock batch inference needs at least {MIN_BATCH_RECORDS}. "
+              f"Use `run` for a batch this size.", file=sys.stderr)
+
+    records_location = join_location(args.out, RECORDS_FILE)
+    write_text(records_location, ''.join(json.dumps(record) + '\n' for record in records))
+    manifest = {
+        'resumeS3Key': s3_key,
+        'resumeText': None if s3_key else resume_text,
+        'userId': args.user_id,
+        'names': [name for name, _ in named],
+        'jobs': [{key: value for key, value in job.items() if key != 'prompt'} for job in jobs]
+    }
+    manifest_location = join_location(args.out, MANIFEST_FILE)
+    write_text(manifest_location, json.dumps(manifest))
+    print(f"{len(records)} records -> {records_location}\nmanifest -> {manifest_location}")
+
+    if args.submit:
+        if not (records_location.startswith('s3://') and args.role_arn):
+            sys.exit("--submit needs an s3:// --out and --role-arn")
+        output_location = args.output_s3 or join_location(args.out, 'output/')
+        response = get_client('bedrock', region_name=BEDROCK_REGION).create_model_invocation_job(
+            jobName=args.job_name or f"resume-batch-{os.urandom(4).hex()}",
+            roleArn=args.role_arn,
+            modelId=MODEL_ID,
+            inputDataConfig={'s3InputDataConfig': {'s3Uri': records_location}},
+            outputDataConfig={'s3OutputDataConfig': {'s3Uri': output_location}}
+        )
+        print(f"submitted {response['jobArn']}\noutput -> {output_location}<job id>/{RECORDS_FILE}.out")
+
+
+def command_status(args):
+    job = get_client('bedrock', region_name=BEDROCK_REGION).get_model_invocation_job(jobIdentifier=args.job_arn)
+    print(json.dumps({key: job.get(key) for key in ('jobName', 'status', 'message', 'submitTime', 'endTime')},
+                     indent=2, default=str))
+
+
+def command_collect(args):
+    manifest = json.loads(read_text(args.manifest))
+    jobs = manifest['jobs']
+    apply_batch_output(jobs, read_text(args.output).splitlines())
+    store_results(jobs, manifest['resumeS3Key'], manifest['resumeText'], manifest['userId'])
+    print_ranking(ranking(jobs), manifest['names'], args.json)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Score one resume against many job descriptions')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def add_inputs(command):
+        command.add_argument('--resume', required=True, help='.txt, .pdf, or s3:// URI of an uploaded PDF')
+        command.add_argument('--jd', nargs='*', help='job description files')
+        command.add_argument('--jd-dir', help='directory of .txt/.md job descriptions')
+        command.add_argument('--user-id', help='owner of the results (Cognito sub)')
+        command.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY)
+
+    run = commands.add_parser('run', help='score with on-demand model calls')
+    add_inputs(run)
+    run.add_argument('--json', action='store_true')
+
+    prepare = commands.add_parser('prepare', help='write Bedrock batch inference input')
+    add_inputs(prepare)
+    prepare.add_argument('--out', required=True, help='local directory or s3:// prefix')
+    prepare.add_argument('--submit', action='store_true', help='create the batch inference job')
+    prepare.add_argument('--role-arn', help='service role Bedrock assumes to read and write the S3 data')
+    prepare.add_argument('--output-s3', help='s3:// prefix for the job output (default <out>/output/)')
+    prepare.add_argument('--job-name')
+
+    status = commands.add_parser('status', help='show a batch inference job')
+    status.add_argument('--job-arn', required=True)
+
+    collect = commands.add_parser('collect', help='store and rank a finished job\'s output')
+    collect.add_argument('--manifest', required=True)
+    collect.add_argument('--output', required=True, help='the job\'s records.jsonl.out, local or s3://')
+    collect.add_argument('--json', action='store_true')
+
+    args = parser.parse_args()
+    {'run': command_run, 'prepare': command_prepare, 'status': command_status,
+     'collect': command_collect}[args.command](args)
+
+
+if __name__ == '__main__':
+    main()
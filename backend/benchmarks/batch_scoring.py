@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Batch scoring of one resume against many job descriptions, compared with
+one score_resume request per job description.
+
+Both sides score the recorded PDF resume against --jobs generated postings
+that share a different fraction of the recorded job description's
+vocabulary, plus a pasted duplicate and an invalid one. The fake model
+scores each by the keyword coverage in its prompt, so the expected order is
+known. This reports Textract and Bedrock calls, result table write calls and
+the time the scoring takes with the recorded service latencies (sleeping
+--time-scale of it), and checks that:
+
+  - the ranking is by score, the duplicate shares its posting's entry and
+    the invalid posting never reaches the model;
+  - get_score returns a batch result;
+  - the Bedrock batch inference path (input records, then the job's output
+    file, including a failed record) gives the same scores as on-demand
+    calls and reports the failure.
+
+Usage:
+    python benchmarks/batch_scoring.py [--jobs 40] [--concurrency 4] [--time-scale 0.02]
+"""
+
+import re
+import sys
+import json
+import time
+import random
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from harness import (FakeContext, LatencyModel, build_event, install_workload, invoke, load_handler,  # noqa: E402
+                     load_workload, silenced)
+
+RESUME_KEY = 'users/uploads/user-0001/2b7d.pdf'
+USER_ID = 'user-0001'
+
+UNRELATED = '''registered nurse patient care medication administration charting electronic health
+records triage wound care ventilator telemetry critical care bedside shift handover infection control
+phlebotomy discharge planning pediatric oncology cardiology licensure compassion family education
+rounds clinical protocols sterile technique vital signs'''.split()
+
+_COVERAGE_RE = re.compile(r'found in the resume: (\d+)%')
+
+
+def coverage_responder(prompt):
+    """Model output scoring a prompt by its keyword coverage line"""
+    match = _COVERAGE_RE.search(prompt)
+    score = int(match.group(1)) if match else 50
+    return json.dumps({'score': score, 'feedback': [f'Coverage {score}%.', 'Second point.', 'Third point.']})
+
+
+def postings(recorded, count, rng):
+    """count postings mixing the recorded job description's words with unrelated ones"""
+    words = recorded.split()
+    out = []
+    for i in range(count):
+        share = i / max(1, count - 1)
+        mixed = [rng.choice(words) if rng.random() < share else rng.choice(UNRELATED) for _ in range(160)]
+        out.append(f"Posting {i:03d}\n\n" + ' '.join(mixed))
+    return out
+
+
+class CountingPuts:
+    """Counts put_item calls on a fake table"""
+
+    def __init__(self, table):
+        self.calls = 0
+        original = table.put_item
+
+        def put_item(**kwargs):
+            self.calls += 1
+            return original(**kwargs)
+
+        table.put_item = put_item
+
+
+def count_textract(fakes):
+    calls = []
+    detect = fakes.textract.detect_document_text
+    fakes.textract.detect_document_text = lambda **kw: calls.append(1) or detect(**kw)
+    return calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare batch scoring with one request per job description')
+    parser.add_argument('--jobs', type=int, default=40)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--time-scale', type=float, default=0.02)
+    args = parser.parse_args()
+
+    from resume_tailor_core.batch_scoring import (apply_batch_output, batch_inference_records, plan_jobs,
+                                                  prepare_jobs, ranking, score_batch, store_results)
+
+    workload = load_workload()
+    events = workload['requests']['score_resume']['events']
+    resume_text = next(event['body']['resume_text'] for event in events if 'resume_text' in event['body'])
+    recorded_jd = events[0]['body']['job_description']
+    rng = random.Random(3)
+    job_descriptions = postings(recorded_jd, args.jobs, rng)
+    job_descriptions.append('  ' + job_descriptions[-1].replace(' ', '  ') + '\n')   # pasted duplicate
+    job_descriptions.append('Software Engineer')                                     # invalid
+    valid_distinct = args.jobs
+
+    def setup():
+        latency = LatencyModel(workload.get('latency'), time_scale=args.time_scale, seed=1)
+        fakes = install_workload(workload, latency)
+        fakes.textract.lines = resume_text.split('\n')
+        fakes.bedrock.responder = coverage_responder
+        return fakes, latency
+
+    # One score_resume request per job description
+    fakes, latency = setup()
+    textract_calls = count_textract(fakes)
+    puts = CountingPuts(fakes.dynamodb.Table('ResumeAnalysisResults'))
+    score_resume = load_handler('score_resume')
+    start = time.perf_counter()
+    for job_description in job_descriptions:
+        spec = {'body': {'s3_key': RESUME_KEY, 'job_description': job_description, 'with_auth': True},
+                'source_ip': '198.51.100.7'}
+        response, _ = invoke(score_resume, build_event(spec), FakeContext('score_resume'), latency)
+        if response['statusCode'] != 200:
+            print(f"❌ score_resume returned {response['statusCode']}: {response['body']}")
+            sys.exit(1)
+    sequential_s = (time.perf_counter() - start) / args.time_scale
+    baseline = (len(textract_calls), fakes.bedrock.calls, puts.calls, sequential_s)
+
+    # One batch
+    fakes, latency = setup()
+    textract_calls = count_textract(fakes)
+    results_table = fakes.dynamodb.Table('ResumeAnalysisResults')
+    puts = CountingPuts(results_table)
+    from resume_tailor_core.batch_scoring import extract_text, resume_document
+    start = time.perf_counter()
+    with silenced():
+        text = extract_text(resume_document(RESUME_KEY))
+        jobs = score_batch(text, job_descriptions, RESUME_KEY, USER_ID, args.concurrency)
+    batch_s = (time.perf_counter() - start) / args.time_scale
+    batched = (len(textract_calls), fakes.bedrock.calls, puts.calls + results_table.batch_calls, batch_s)
+
+    print(f"{len(job_descriptions)} job descriptions ({valid_distinct} distinct valid), "
+          f"concurrency {args.concurrency}\n")
+    print(f"{'':<26} {'textract':>9} {'bedrock':>8} {'result writes':>14} {'time s':>8}")
+    for name, (textract, bedrock, writes, seconds) in (('one request per JD', baseline), ('batch', batched)):
+        print(f"{name:<26} {textract:>9} {bedrock:>8} {writes:>14} {seconds:>8.1f}")
+
+    ranked = ranking(jobs)
+    scores = [entry['score'] for entry in ranked]
+    duplicate = next(entry for entry in ranked if len(entry['inputs']) > 1)
+    invalid = next(entry for entry in ranked if entry.get('invalid'))
+    if (batched[0] != 1 or batched[1] != valid_distinct or scores != sorted(scores, reverse=True)
+            or duplicate['inputs'] != [args.jobs - 1, args.jobs] or invalid['score'] != 0):
+        print("\n❌ batch did not extract once, deduplicate, pre-score and rank by score")
+        sys.exit(1)
+    print("\ntop 3:")
+    for entry in ranked[:3]:
+        print(f"  {entry['rank']}. {entry['score']:>3}  {entry['title']}")
+
+    # get_score reads a batch result
+    event = build_event({'query': {'resultId': ranked[0]['resultId']}, 'method': 'GET'})
+    response, _ = invoke(load_handler('get_score'), event, FakeContext('get_score'), latency)
+    if response['statusCode'] != 200 or int(json.loads(response['body'])['score']) != ranked[0]['score']:
+        print("\n❌ get_score could not read a batch result")
+        sys.exit(1)
+
+    # Batch inference: input records, then an output file with one failed record
+    fakes, latency = setup()
+    latency.time_scale = 0
+    planned = plan_jobs(job_descriptions)
+    prepare_jobs(planned, resume_text)
+    records = list(batch_inference_records(planned))
+    lines = []
+    for record in records:
+        prompt = record['modelInput']['messages'][0]['content']
+        output = {'recordId': record['recordId'], 'modelInput': record['modelInput']}
+        if record is records[0]:
+            output['error'] = {'errorCode': 400, 'errorMessage': 'Malformed input'}
+        else:
+            output['modelOutput'] = {'content': [{'type': 'text', 'text': coverage_responder(prompt)}]}
+        lines.append(json.dumps(output))
+    manifest_jobs = json.loads(json.dumps(planned))   # what collect reads back from the manifest
+    apply_batch_output(manifest_jobs, lines)
+    stored = store_results(manifest_jobs, RESUME_KEY, user_id=USER_ID)
+    on_demand = {job['jdHash']: job.get('score') for job in jobs}
+    collected = {job['jdHash']: job.get('score') for job in manifest_jobs}
+    failed = [entry for entry in ranking(manifest_jobs) if entry.get('error')]
+    failed_hash = next(job['jdHash'] for job in planned if job['recordId'] == records[0]['recordId'])
+    on_demand[failed_hash] = None
+    if (fakes.bedrock.calls or collected != on_demand or len(failed) != 1 or failed[0]['rank'] is not None
+            or stored != len(manifest_jobs) - 1):
+        print("\n❌ batch inference output did not match on-demand scoring")
+        sys.exit(1)
+    print(f"\nbatch inference: {len(records)} records, {stored} results stored, {len(failed)} failed record reported")
+    print("\n✅ one Textract call, one model call per distinct valid posting, results written in batches")
+
+
+if __name__ == '__main__':
+    main()
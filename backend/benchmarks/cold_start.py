@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Cold start benchmark for the Resume Tailor Lambda handlers.
+
+Measures the init phase of each handler - the time to import
+lambda_function in a fresh interpreter - the way the Lambda runtime does
+on a cold start. Optionally measures a baseline git revision as well so
+the effect of a change can be compared side by side.
+
+Usage:
+    python benchmarks/cold_start.py [--runs 5] [--baseline-ref HEAD~1] [--functions score_resume get_score]
+"""
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import statistics
+import subprocess
+import tarfile
+import tempfile
+from io import BytesIO
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+REPO_ROOT = BACKEND_DIR.parent
+
+MEASURE_SNIPPET = """
+import sys, time, json
+start = time.perf_counter()
+import lambda_function
+init_ms = (time.perf_counter() - start) * 1000
+print(json.dumps({'init_ms': init_ms, 'modules': len(sys.modules)}))
+"""
+
+
+def discover_functions(lambdas_dir):
+    """List function directories that contain a lambda_function.py"""
+    return sorted(p.parent.name for p in lambdas_dir.glob('*/lambda_function.py'))
+
+
+def copy_working_tree(dest):
+    """Copy the working tree's lambdas directory without bytecode caches"""
+    lambdas_dir = dest / 'lambdas'
+    shutil.copytree(
+        BACKEND_DIR / 'lambdas', lambdas_dir,
+        ignore=shutil.ignore_patterns('__pycache__', '*.pyc')
+    )
+    return lambdas_dir
+
+
+def extract_git_ref(ref, dest):
+    """Extract backend/lambdas at a git revision"""
+    archive = subprocess.run(
+        ['git', 'archive', '--format=tar', ref, 'backend/lambdas'],
+        cwd=REPO_ROOT, check=True, capture_output=True
+    ).stdout
+    with tarfile.open(fileobj=BytesIO(archive)) as tar:
+        tar.extractall(dest)
+    return dest / 'backend' / 'lambdas'
+
+
+def measure_init(function_dir, runs):
+    """Import the handler in `runs` fresh interpreters, returning per-run results"""
+    env = dict(os.environ)
+    env.setdefault('AWS_DEFAULT_REGION', 'us-east-2')
+    env['PYTHONDONTWRITEBYTECODE'] = '1'
+
+    results = []
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, '-c', MEASURE_SNIPPET],
+            cwd=function_dir, env=env, capture_output=True, text=True
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"{function_dir.name} failed to import:\n{proc.stderr.strip()}")
+        results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+    return results
+
+
+def summarize(results):
+    init_times = [r['init_ms'] for r in results]
+    return {
+        'median_ms': statistics.median(init_times),
+        'min_ms': min(init_times),
+        'modules': results[-1]['modules']
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure Lambda handler init-phase time')
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters per handler (default: 5)')
+    parser.add_argument('--baseline-ref', help='Git revision to compare against (e.g. HEAD~1)')
+    parser.add_argument('--functions', nargs='*', help='Handlers to measure (default: all)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        trees = {'current': copy_working_tree(temp_path / 'current')}
+        if args.baseline_ref:
+            trees['baseline'] = extract_git_ref(args.baseline_ref, temp_path / 'baseline')
+
+        functions = args.functions or discover_functions(trees['current'])
+        report = {}
+        for function_name in functions:
+            report[function_name] = {}
+            for label, lambdas_dir in trees.items():
+                function_dir = lambdas_dir / function_name
+                if not (function_dir / 'lambda_function.py').exists():
+                    continue
+                report[function_name][label] = summarize(measure_init(function_dir, args.runs))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    header = f"{'function':<24} {'current ms':>11} {'modules':>8}"
+    if args.baseline_ref:
+        header += f" {'baseline ms':>12} {'modules':>8} {'delta ms':>9}"
+    print(header)
+    print('-' * len(header))
+    for function_name, result in report.items():
+        current = result.get('current')
+        line = f"{function_name:<24} {current['median_ms']:>11.1f} {current['modules']:>8}"
+        baseline = result.get('baseline')
+        if baseline:
+            delta = current['median_ms'] - baseline['median_ms']
+            line += f" {baseline['median_ms']:>12.1f} {baseline['modules']:>8} {delta:>+9.1f}"
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Re-polling cost of get_master_resume and get_score, with and without
+conditional requests.
+
+A dashboard that re-polls unchanged data either refetches the full body
+every time, or sends the previous response's ETag as If-None-Match and gets
+a bodyless 304. This script replays both for each handler and reports per
+request: response bytes, handler CPU time, item bytes read from DynamoDB
+and presign calls. It also checks that a changed master resume (a new
+updatedAt) is answered with a fresh 200, never a stale 304.
+
+Usage:
+    python benchmarks/conditional_get.py [--polls 200]
+"""
+
+import sys
+import json
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from harness import (FakeContext, LatencyModel, build_event, install_workload, invoke, load_handler,  # noqa: E402
+                     load_workload, percentile)
+
+FUNCTIONS = ('get_master_resume', 'get_score')
+
+
+def wire_size_placeholder(value):
+    # Binary attributes count as their raw length, other non-JSON values as their text
+    if hasattr(value, 'value') and isinstance(value.value, bytes):
+        return 'x' * len(value.value)
+    return str(value)
+
+
+class Counting:
+    """Wraps a fake to count calls and the bytes of items it returns"""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.calls = 0
+        self.item_bytes = 0
+
+    def __getattr__(self, name):
+        method = getattr(self.inner, name)
+        if name not in ('get_item', 'generate_presigned_url'):
+            return method
+
+        def counted(*args, **kwargs):
+            self.calls += 1
+            result = method(*args, **kwargs)
+            if name == 'get_item' and result.get('Item'):
+                self.item_bytes += len(json.dumps(result['Item'], default=wire_size_placeholder))
+            return result
+        return counted
+
+
+def poll(module, name, event, latency, polls, conditional, s3, tables):
+    sizes, cpu = [], []
+    not_modified = 0
+    etag = None
+    s3.calls = 0
+    for table in tables:
+        table.calls = table.item_bytes = 0
+    for _ in range(polls):
+        headers = dict(event.get('headers') or {})
+        if conditional and etag:
+            headers['If-None-Match'] = etag
+        response, timing = invoke(module, dict(event, headers=headers), FakeContext(name), latency)
+        etag = (response.get('headers') or {}).get('ETag', etag)
+        sizes.append(len(response.get('body') or '') + len(json.dumps(response.get('headers') or {})))
+        cpu.append(timing['cpu_ms'])
+        not_modified += response['statusCode'] == 304
+    return {
+        'not_modified': not_modified,
+        'bytes_per_request': sum(sizes) / polls,
+        'cpu_p50_ms': percentile(cpu, 50),
+        'item_bytes_per_request': sum(t.item_bytes for t in tables) / polls,
+        'presigns': s3.calls
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare full refetches with If-None-Match revalidation')
+    parser.add_argument('--polls', type=int, default=200)
+    args = parser.parse_args()
+
+    from resume_tailor_core import clients
+
+    workload = load_workload()
+    latency = LatencyModel(workload.get('latency'), time_scale=0)
+    fakes = install_workload(workload, latency)
+    s3 = Counting(fakes.s3)
+    tables = {name: Counting(fakes.dynamodb.Table(name)) for name in ('ResumeMetadata', 'ResumeAnalysisResults')}
+    clients.set_client('s3', s3)
+    for name, table in tables.items():
+        clients.set_table(name, table)
+
+    print(f"{args.polls} polls of unchanged data per handler\n")
+    print(f"{'function':<20} {'mode':<12} {'bytes/req':>10} {'cpu p50 ms':>11} {'item bytes/req':>15} {'presigns':>9} {'304s':>5}")
+    for name in FUNCTIONS:
+        module = load_handler(name)
+        event = build_event(workload['requests'][name]['events'][0])
+        for mode in ('full', 'conditional'):
+            r = poll(module, name, event, latency, args.polls, mode == 'conditional', s3, list(tables.values()))
+            print(f"{name:<20} {mode:<12} {r['bytes_per_request']:>10.0f} {r['cpu_p50_ms']:>11.3f} "
+                  f"{r['item_bytes_per_request']:>15.0f} {r['presigns']:>9} {r['not_modified']:>5}")
+
+    # A revalidation after the master resume changes must return the new version
+    module = load_handler('get_master_resume')
+    event = build_event(workload['requests']['get_master_resume']['events'][0])
+    first, _ = invoke(module, event, FakeContext('get_master_resume'), latency)
+    user_id = event['requestContext']['authorizer']['jwt']['claims']['sub']
+    item = fakes.dynamodb.Table('ResumeMetadata').items[(user_id,)]
+    item['updatedAt'] = datetime.now().isoformat()
+    conditional = dict(event, headers=dict(event.get('headers') or {}, **{'If-None-Match': first['headers']['ETag']}))
+    second, _ = invoke(module, conditional, FakeContext('get_master_resume'), latency)
+    if second['statusCode'] != 200 or json.loads(second['body'])['version'] != item['updatedAt']:
+        print(f"\n❌ changed master resume answered with {second['statusCode']}")
+        sys.exit(1)
+    print("\n✅ a changed master resume is refetched, an unchanged one answered with 304")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Dashboard load time: serial fetches vs the get_dashboard bootstrap handler.
+
+The dashboard used to call get_master_resume, then get_tailored_resumes,
+then get_usage_stats, one after the other. get_dashboard does the same reads
+concurrently in one request. This script replays both against the in-process
+fakes and reports p50/p95 time until the dashboard has all its data:
+
+  serial     sum of the three handlers, plus one client round trip each
+  bootstrap  get_dashboard, plus one round trip
+
+It also checks that get_dashboard returns the same master entries, tailored
+files and usage counts as the three handlers.
+
+Service latency is slept at full length here (the reads are tens of
+milliseconds), since concurrent waits can't be scaled back per thread.
+
+Usage:
+    python benchmarks/dashboard_bootstrap.py [--invocations 50] [--rtt-ms 60]
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from harness import (FakeContext, LatencyModel, build_event, install_workload, invoke, load_handler,  # noqa: E402
+                     load_workload, percentile)
+
+SERIAL = ('get_master_resume', 'get_tailored_resumes', 'get_usage_stats')
+
+
+def without_urls(files):
+    # Presigned URLs carry a fresh signature each time
+    return [f['name'] for f in files]
+
+
+def check_equivalent(serial_bodies, dashboard):
+    master, tailored, usage = serial_bodies
+    problems = []
+    if dashboard['master']['entries'] != master['resumeData']:
+        problems.append('master entries differ')
+    if without_urls(dashboard['tailored']['files']) != without_urls(tailored['files']):
+        problems.append('tailored files differ')
+    for service in ('bedrock', 'textract'):
+        if dashboard['usage'][service] != usage[service]:
+            problems.append(f'{service} usage differs')
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare serial dashboard fetches with get_dashboard')
+    parser.add_argument('--invocations', type=int, default=50)
+    parser.add_argument('--rtt-ms', type=float, default=60.0, help='Client to API Gateway round trip per request')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    workload = load_workload()
+    latency = LatencyModel(workload.get('latency'), time_scale=1.0, seed=args.seed)
+    install_workload(workload, latency)
+    modules = {name: load_handler(name) for name in SERIAL + ('get_dashboard',)}
+    spec = workload['requests']['get_dashboard']['events'][0]
+
+    serial_ms, bootstrap_ms, problems = [], [], set()
+    for _ in range(args.invocations):
+        bodies = []
+        total = 0.0
+        for name in SERIAL:
+            response, timing = invoke(modules[name], build_event(spec), FakeContext(name), latency)
+            bodies.append(json.loads(response['body']))
+            total += timing['wall_ms'] + args.rtt_ms
+        serial_ms.append(total)
+
+        response, timing = invoke(modules['get_dashboard'], build_event(spec), FakeContext('get_dashboard'), latency)
+        bootstrap_ms.append(timing['wall_ms'] + args.rtt_ms)
+        problems.update(check_equivalent(bodies, json.loads(response['body'])))
+
+    print(f"{args.invocations} dashboard loads, {args.rtt_ms:g} ms round trip per request\n")
+    print(f"{'':<11} {'requests':>8} {'p50 ms':>8} {'p95 ms':>8}")
+    print(f"{'serial':<11} {len(SERIAL):>8} {percentile(serial_ms, 50):>8.1f} {percentile(serial_ms, 95):>8.1f}")
+    print(f"{'bootstrap':<11} {1:>8} {percentile(bootstrap_ms, 50):>8.1f} {percentile(bootstrap_ms, 95):>8.1f}")
+    if problems:
+        print(f"\n❌ get_dashboard differs from the serial handlers: {', '.join(sorted(problems))}")
+        sys.exit(1)
+    print("\n✅ get_dashboard returns the same data as the serial handlers")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Local check of the CloudWatch Embedded Metric Format blocks the handlers emit.
+
+Replays the recorded workload against every handler, captures stdout (where
+ResumeTailorLogger.flush_metrics writes EMF), and checks that each
+invocation:
+
+  1. flushes its metrics exactly once, in a single write;
+  2. writes only well-formed EMF: every declared dimension and metric is a
+     root member, values are numbers (at most 100 per metric), units are
+     CloudWatch units;
+  3. reports its Duration.
+
+Also checks that work fanned out with map_bounded logs through the
+invocation's logger without losing metric values or overrunning the log
+budget.
+
+Then aggregates the parsed metrics the way a CloudWatch percentile
+dashboard would, per metric and dimension set.
+
+Usage:
+    python benchmarks/emf_metrics.py [--invocations 20] [--functions score_resume]
+"""
+
+import io
+import os
+import sys
+import json
+import argparse
+import contextlib
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from harness import (FakeContext, LatencyModel, build_event, install_workload, invoke, load_handler,  # noqa: E402
+                     load_workload, percentile, sample_pdf_base64, simulate_sleeps)
+
+CLOUDWATCH_UNITS = {
+    'Seconds', 'Microseconds', 'Milliseconds', 'Bytes', 'Kilobytes', 'Megabytes', 'Gigabytes', 'Terabytes',
+    'Bits', 'Kilobits', 'Megabits', 'Gigabits', 'Terabits', 'Percent', 'Count', 'Bytes/Second',
+    'Kilobytes/Second', 'Megabytes/Second', 'Gigabytes/Second', 'Terabytes/Second', 'Bits/Second',
+    'Kilobits/Second', 'Megabits/Second', 'Gigabits/Second', 'Terabits/Second', 'Count/Second', 'None'
+}
+MAX_DIMENSIONS = 30
+MAX_VALUES = 100
+
+
+class WriteRecorder(io.TextIOBase):
+    """Keeps each write separately, so one flush per invocation can be checked"""
+
+    def __init__(self):
+        self.writes = []
+
+    def write(self, text):
+        self.writes.append(text)
+        return len(text)
+
+
+def validate_block(block):
+    """Problems with one EMF block, as strings"""
+    problems = []
+    aws = block.get('_aws')
+    if not isinstance(aws, dict) or not isinstance(aws.get('Timestamp'), int):
+        return ['missing _aws.Timestamp']
+    for directive in aws.get('CloudWatchMetrics', []):
+        if not isinstance(directive.get('Namespace'), str):
+            problems.append('missing Namespace')
+        for dimension_set in directive.get('Dimensions', []):
+            if len(dimension_set) > MAX_DIMENSIONS:
+                problems.append(f'{len(dimension_set)} dimensions')
+            for name in dimension_set:
+                if not isinstance(block.get(name), str):
+                    problems.append(f'dimension {name} is not a string root member')
+        for metric in directive.get('Metrics', []):
+            name = metric.get('Name')
+            if metric.get('Unit', 'None') not in CLOUDWATCH_UNITS:
+                problems.append(f"{name}: unknown unit {metric.get('Unit')}")
+            values = block.get(name)
+            values = values if isinstance(values, list) else [values]
+            if len(values) > MAX_VALUES:
+                problems.append(f'{name}: {len(values)} values')
+            if not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+                problems.append(f'{name}: non-numeric value')
+    return problems
+
+
+def parse_invocation(writes):
+    """EMF blocks from one invocation's stdout, plus any problems found"""
+    problems = []
+    emf_writes = [w for w in writes if '"_aws"' in w]
+    if len(emf_writes) != 1:
+        problems.append(f'{len(emf_writes)} metric flushes')
+    blocks = []
+    for line in ''.join(emf_writes).splitlines():
+        try:
+            block = json.loads(line)
+        except json.JSONDecodeError:
+            problems.append('stdout line is not JSON')
+            continue
+        problems.extend(validate_block(block))
+        blocks.append(block)
+    if not any('Duration' in block for block in blocks):
+        problems.append('no Duration metric')
+    return blocks, problems
+
+
+def aggregate(blocks, series):
+    """Add every metric value to series[(metric, dimensions)]"""
+    for block in blocks:
+        for directive in block['_aws']['CloudWatchMetrics']:
+            dimensions = tuple((name, block[name]) for name in directive['Dimensions'][0])
+            for metric in directive['Metrics']:
+                values = block[metric['Name']]
+                series[(metric['Name'], dimensions)].extend(values if isinstance(values, list) else [values])
+
+
+def check_fan_out(workers=16, tasks=64, values_per_task=200):
+    """
+    A handler that fans out with map_bounded, every task writing metrics and
+    log lines through current_logger(). Returns a list of problems.
+    """
+    from resume_tailor_core import logger as logger_module
+    from resume_tailor_core.batch import map_bounded
+
+    loggers = []
+
+    @logger_module.log_invocation
+    def handler(event, context):
+        logger_module.create_logger('fan_out')
+
+        def task(index):
+            logger = logger_module.current_logger()
+            loggers.append(logger)
+            for _ in range(values_per_task):
+                logger.put_metric('FanOut', 1, unit='Count')
+                logger.info("Fan-out task progress", {'index': index, 'padding': 'x' * 200})
+            return index
+
+        map_bounded(task, list(range(tasks)), workers)
+        budget = loggers[0]
+        return {'statusCode': 200, 'bytes': budget._bytes_written, 'dropped': budget._lines_dropped}
+
+    recorder = WriteRecorder()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(recorder), contextlib.redirect_stderr(devnull):
+        response = handler({}, FakeContext('fan_out'))
+    blocks, problems = parse_invocation(recorder.writes)
+    recorded = sum(len(block['FanOut']) if isinstance(block['FanOut'], list) else 1
+                   for block in blocks if 'FanOut' in block)
+    if len(loggers) != tasks or len({id(logger) for logger in loggers}) != 1 or loggers[0] is None:
+        problems.append("fanned-out tasks did not see the invocation's logger")
+    if recorded != tasks * values_per_task:
+        problems.append(f"{tasks * values_per_task - recorded} of {tasks * values_per_task} fanned-out metric values lost")
+    if response['bytes'] > logger_module.LOG_BUDGET_BYTES:
+        problems.append(f"log budget overrun: {response['bytes']} bytes")
+    print(f"fan-out: {tasks} tasks on {workers} threads, {recorded} metric values recorded, "
+          f"{response['bytes']} log bytes, {response['dropped']} lines dropped")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate and aggregate the EMF metrics handlers emit')
+    parser.add_argument('--invocations', type=int, default=20, help='Invocations per function')
+    parser.add_argument('--functions', nargs='+', help='Only replay these functions')
+    parser.add_argument('--time-scale', type=float, default=0,
+                        help='Fraction of recorded service latency actually slept')
+    args = parser.parse_args()
+
+    workload = load_workload()
+    latency = LatencyModel(workload.get('latency'), time_scale=args.time_scale, seed=7)
+    fakes = install_workload(workload, latency)
+    usage_table = fakes.dynamodb.Table('ApiUsageLimits')
+    pdf_base64 = sample_pdf_base64(workload)
+
+    series = defaultdict(list)
+    failures = {}
+    for name, spec in workload['requests'].items():
+        if args.functions and name not in args.functions:
+            continue
+        module = load_handler(name)
+        simulate_sleeps(module, latency)
+        for i in range(args.invocations):
+            usage_table.items.clear()
+            event = build_event(spec['events'][i % len(spec['events'])], pdf_base64)
+            recorder = WriteRecorder()
+            with open(os.devnull, 'w') as devnull, \
+                    contextlib.redirect_stdout(recorder), contextlib.redirect_stderr(devnull):
+                invoke(module, event, FakeContext(name), latency, quiet=False)
+            blocks, problems = parse_invocation(recorder.writes)
+            if problems:
+                failures.setdefault(name, problems)
+            aggregate(blocks, series)
+
+    print(f"{'metric':<16} {'dimensions':<90} {'n':>4} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for (metric, dimensions), values in sorted(series.items()):
+        label = ' '.join(f'{k}={v}' for k, v in dimensions)
+        print(f"{metric:<16} {label:<90} {len(values):>4} {percentile(values, 50):>8.2f} "
+              f"{percentile(values, 95):>8.2f} {percentile(values, 99):>8.2f}")
+
+    print()
+    fan_out_problems = check_fan_out()
+    if fan_out_problems:
+        failures['fan_out'] = fan_out_problems
+
+    if failures:
+        for name, problems in failures.items():
+            print(f"❌ {name}: {'; '.join(sorted(set(problems)))}")
+        sys.exit(1)
+    print("\n✅ every invocation flushed well-formed EMF once; fanned-out work shares the invocation's logger")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,640 @@
+"""
+In-process fakes for the AWS services the handlers use.
+
+Each fake implements only the calls the handlers make, with the same
+request/response shapes as boto3. Calls are delayed by a LatencyModel so
+local runs reflect service time; the injected delay is also accumulated per
+thread, so harnesses can account for it without actually sleeping
+(time_scale=0). The model can also throttle calls, raising the error code
+the real service uses.
+
+    fakes = install_fakes(LatencyModel({'bedrock': {'dist': 'constant', 'ms': 4000}}))
+    fakes.dynamodb.seed('ResumeMetadata', [{'resume_id': 'user-1', 'entries': [...]}])
+"""
+
+import copy
+import io
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from botocore.exceptions import ClientError
+
+# Error code each service returns when it throttles a request
+THROTTLE_ERRORS = {
+    'bedrock': 'ThrottlingException',
+    'textract': 'ProvisionedThroughputExceededException',
+    'dynamodb': 'ProvisionedThroughputExceededException',
+    's3': 'SlowDown',
+}
+
+# Key attributes of the DynamoDB tables the handlers use
+KEY_SCHEMAS = {
+    'ApiUsageLimits': ('identifier', 'date_service'),
+    'ResumeMetadata': ('resume_id',),
+    'ResumeAnalysisResults': ('resultId',),
+    'JobDescriptions': ('jdHash',),
+    'TailoredResumes': ('userId', 'tailorId'),
+}
+
+
+def client_error(code, operation, message=''):
+    return ClientError({'Error': {'Code': code, 'Message': message or code}}, operation)
+
+
+class LatencyModel:
+    """
+    Per-service latency distributions.
+
+    Specs are dicts keyed by service name (or 'service.operation' for a more
+    specific override):
+        {'dist': 'constant', 'ms': 20}
+        {'dist': 'uniform', 'low_ms': 10, 'high_ms': 40}
+        {'dist': 'lognormal', 'median_ms': 3000, 'sigma': 0.4}
+
+    Throttling specs are keyed by service name:
+        {'probability': 0.02}                         # throttle 2% of calls at random
+        {'requests_per_second': 2, 'burst': 10}       # token bucket, in simulated time
+    Token buckets refill as simulated time passes, so they need time_scale > 0.
+    """
+
+    def __init__(self, specs=None, time_scale=1.0, seed=None, throttling=None):
+        self.specs = specs or {}
+        self.time_scale = time_scale
+        self.throttling = throttling or {}
+        self.throttled = {}
+        self.random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._buckets = {}
+        self._local = threading.local()
+
+    def sample(self, service, operation):
+        spec = self.specs.get(f'{service}.{operation}') or self.specs.get(service)
+        if not spec:
+            return 0.0
+        dist = spec.get('dist', 'constant')
+        with self._random_lock:
+            if dist == 'constant':
+                return float(spec['ms'])
+            if dist == 'uniform':
+                return self.random.uniform(spec['low_ms'], spec['high_ms'])
+            if dist == 'lognormal':
+                return spec['median_ms'] * math.exp(self.random.gauss(0, spec.get('sigma', 0.5)))
+        raise ValueError(f'Unknown latency distribution: {dist}')
+
+    def is_throttled(self, service):
+        spec = self.throttling.get(service)
+        if not spec:
+            return False
+        with self._random_lock:
+            if self.random.random() < spec.get('probability', 0):
+                return True
+            if 'requests_per_second' not in spec:
+                return False
+            now = time.monotonic()
+            tokens, last = self._buckets.get(service, (spec.get('burst', 1), now))
+            elapsed = (now - last) / self.time_scale if self.time_scale else 0
+            tokens = min(spec.get('burst', 1), tokens + elapsed * spec['requests_per_second'])
+            allowed = tokens >= 1
+            self._buckets[service] = (tokens - 1 if allowed else tokens, now)
+            return not allowed
+
+    def apply(self, service, operation):
+        """Delay the calling thread and record the simulated latency, or raise if throttled"""
+        if self.is_throttled(service):
+            with self._random_lock:
+                self.throttled[service] = self.throttled.get(service, 0) + 1
+            raise client_error(THROTTLE_ERRORS.get(service, 'ThrottlingException'), operation, 'Rate exceeded')
+        return self.add(self.sample(service, operation))
+
+    def add(self, latency_ms):
+        """Record latency_ms of waiting, sleeping for it scaled by time_scale"""
+        self._local.simulated_ms = self.simulated_ms() + latency_ms
+        if latency_ms and self.time_scale:
+            time.sleep(latency_ms * self.time_scale / 1000)
+        return latency_ms
+
+    def simulated_ms(self):
+        return getattr(self._local, 'simulated_ms', 0.0)
+
+    def reset(self):
+        self._local.simulated_ms = 0.0
+
+
+# --- DynamoDB expressions -------------------------------------------------
+
+_TOKEN_RE = re.compile(r'\s*(<>|<=|>=|[=<>(),+\-]|[:#]?[A-Za-z_][A-Za-z0-9_.]*)')
+
+
+def _tokenize(expression):
+    tokens = []
+    position = 0
+    expression = expression.strip()
+    while position < len(expression):
+        match = _TOKEN_RE.match(expression, position)
+        if not match:
+            raise ValueError(f'Cannot parse expression at: {expression[position:]}')
+        tokens.append(match.group(1))
+        position = match.end()
+    return tokens
+
+
+class _Expression:
+    """Evaluates the subset of DynamoDB expression syntax the handlers use"""
+
+    MISSING = object()
+
+    def __init__(self, expression, names, values):
+        self.tokens = _tokenize(expression)
+        self.position = 0
+        self.names = names or {}
+        self.values = values or {}
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def take(self, expected=None):
+        token = self.peek()
+        if expected is not None and (token or '').upper() != expected:
+            raise ValueError(f'Expected {expected}, got {token}')
+        self.position += 1
+        return token
+
+    def attribute_name(self, token):
+        return self.names[token] if token.startswith('#') else token
+
+    # Operands
+
+    def operand(self, item):
+        token = self.take()
+        if token.startswith(':'):
+            return self.values[token]
+        if self.peek() == '(':
+            return self.function(token, item)
+        return item.get(self.attribute_name(token), self.MISSING)
+
+    def function(self, name, item):
+        self.take('(')
+        if name in ('attribute_exists', 'attribute_not_exists'):
+            path = self.attribute_name(self.take())
+            self.take(')')
+            return (path in item) == (name == 'attribute_exists')
+        if name == 'if_not_exists':
+            path = self.attribute_name(self.take())
+            self.take(',')
+            default = self.operand(item)
+            self.take(')')
+            return item[path] if path in item else default
+        if name == 'list_append':
+            first = self.operand(item)
+            self.take(',')
+            second = self.operand(item)
+            self.take(')')
+            return list(first) + list(second)
+        if name == 'size':
+            value = self.operand(item)
+            self.take(')')
+            return len(value) if value is not self.MISSING else self.MISSING
+        raise ValueError(f'Unsupported function: {name}')
+
+    def arithmetic(self, item):
+        value = self.operand(item)
+        while self.peek() in ('+', '-'):
+            operator = self.take()
+            other = self.operand(item)
+            value = value + other if operator == '+' else value - other
+        return value
+
+    # Conditions
+
+    def condition(self, item):
+        result = self.conjunction(item)
+        while (self.peek() or '').upper() == 'OR':
+            self.take()
+            other = self.conjunction(item)
+            result = result or other
+        return result
+
+    def conjunction(self, item):
+        result = self.negation(item)
+        while (self.peek() or '').upper() == 'AND':
+            self.take()
+            other = self.negation(item)
+            result = result and other
+        return result
+
+    def negation(self, item):
+        if (self.peek() or '').upper() == 'NOT':
+            self.take()
+            return not self.negation(item)
+        if self.peek() == '(':
+            self.take()
+            result = self.condition(item)
+            self.take(')')
+            return result
+        return self.comparison(item)
+
+    def comparison(self, item):
+        left = self.operand(item)
+        operator = self.peek()
+        if operator not in ('=', '<>', '<', '<=', '>', '>='):
+            return bool(left) if left is not self.MISSING else False
+        self.take()
+        right = self.operand(item)
+        if left is self.MISSING or right is self.MISSING:
+            return operator == '<>'
+        return {
+            '=': lambda: left == right,
+            '<>': lambda: left != right,
+            '<': lambda: left < right,
+            '<=': lambda: left <= right,
+            '>': lambda: left > right,
+            '>=': lambda: left >= right,
+        }[operator]()
+
+    # Updates
+
+    def apply_update(self, item):
+        action = None
+        while self.peek() is not None:
+            if self.peek().upper() in ('SET', 'REMOVE', 'ADD'):
+                action = self.take().upper()
+            path = self.attribute_name(self.take())
+            if action == 'SET':
+                self.take('=')
+                item[path] = self.arithmetic(item)
+            elif action == 'REMOVE':
+                item.pop(path, None)
+            elif action == 'ADD':
+                increment = self.operand(item)
+                item[path] = item.get(path, 0) + increment
+            if self.peek() == ',':
+                self.take()
+        return item
+
+
+def evaluate_condition(expression, item, names=None, values=None):
+    return _Expression(expression, names, values).condition(item)
+
+
+def apply_update(expression, item, names=None, values=None):
+    return _Expression(expression, names, values).apply_update(item)
+
+
+# --- Fakes ------------------------------------------------------------------
+
+class _StreamingBody(io.BytesIO):
+    """Stands in for botocore's StreamingBody"""
+
+
+def _check_types(value):
+    """Reject floats the way boto3's serializer does"""
+    if isinstance(value, float):
+        raise TypeError('Float types are not supported. Use Decimal types instead.')
+    if isinstance(value, dict):
+        for nested in value.values():
+            _check_types(nested)
+    elif isinstance(value, (list, tuple, set)):
+        for nested in value:
+            _check_types(nested)
+
+
+def _to_wire(value):
+    """Return numbers as Decimal and bytes as Binary, like boto3's deserializer"""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, Decimal)):
+        return Decimal(value)
+    if isinstance(value, (bytes, bytearray)):
+        from boto3.dynamodb.types import Binary
+        return Binary(bytes(value))
+    if isinstance(value, dict):
+        return {key: _to_wire(nested) for key, nested in value.items()}
+    if isinstance(value, list):
+        return [_to_wire(nested) for nested in value]
+    return value
+
+
+def _from_wire(value):
+    """Unwrap Binary values on the way in"""
+    if hasattr(value, 'value') and type(value).__name__ == 'Binary':
+        return bytes(value.value)
+    if isinstance(value, dict):
+        return {key: _from_wire(nested) for key, nested in value.items()}
+    if isinstance(value, list):
+        return [_from_wire(nested) for nested in value]
+    return value
+
+
+class FakeTable:
+    def __init__(self, name, key_schema, latency):
+        self.name = name
+        self.table_name = name
+        self.key_schema = key_schema
+        self.latency = latency
+        self.items = {}
+        self.batch_calls = 0
+        self.lock = threading.Lock()
+
+    def _key(self, key):
+        try:
+            return tuple(key[attribute] for attribute in self.key_schema)
+        except KeyError as e:
+            raise client_error('ValidationException', 'GetItem', f'Missing key attribute {e}')
+
+    def _project(self, item, projection, names):
+        if not projection:
+            return item
+        attributes = [names.get(p.strip(), p.strip()) if names else p.strip() for p in projection.split(',')]
+        return {attribute: item[attribute] for attribute in attributes if attribute in item}
+
+    def get_item(self, Key, ProjectionExpression=None, ExpressionAttributeNames=None, ConsistentRead=False):
+        self.latency.apply('dynamodb', 'get_item')
+        with self.lock:
+            item = self.items.get(self._key(Key))
+            if item is None:
+                return {}
+            return {'Item': _to_wire(self._project(copy.deepcopy(item), ProjectionExpression, ExpressionAttributeNames))}
+
+    def put_item(self, Item, ConditionExpression=None, ExpressionAttributeNames=None,
+                 ExpressionAttributeValues=None, **kwargs):
+        self.latency.apply('dynamodb', 'put_item')
+        _check_types(Item)
+        values = _from_wire(ExpressionAttributeValues or {})
+        with self.lock:
+            key = self._key(Item)
+            existing = self.items.get(key, {})
+            if ConditionExpression and not evaluate_condition(ConditionExpression, existing, ExpressionAttributeNames, values):
+                raise client_error('ConditionalCheckFailedException', 'PutItem')
+            self.items[key] = copy.deepcopy(_from_wire(Item))
+        return {}
+
+    def update_item(self, Key, UpdateExpression, ConditionExpression=None, ExpressionAttributeNames=None,
+                    ExpressionAttributeValues=None, ReturnValues='NONE', **kwargs):
+        self.latency.apply('dynamodb', 'update_item')
+        values = _from_wire(ExpressionAttributeValues or {})
+        _check_types(values)
+        with self.lock:
+            key = self._key(Key)
+            existing = self.items.get(key)
+            item = copy.deepcopy(existing) if existing else dict(Key)
+            if ConditionExpression and not evaluate_condition(ConditionExpression, existing or {}, ExpressionAttributeNames, values):
+                raise client_error('ConditionalCheckFailedException', 'UpdateItem')
+            updated = apply_update(UpdateExpression, item, ExpressionAttributeNames, values)
+            self.items[key] = updated
+            if ReturnValues in ('UPDATED_NEW', 'ALL_NEW'):
+                return {'Attributes': _to_wire(copy.deepcopy(updated))}
+        return {}
+
+    def batch_writer(self, overwrite_by_pkeys=None):
+        return _FakeBatchWriter(self)
+
+    def delete_item(self, Key, ConditionExpression=None, ExpressionAttributeNames=None,
+                    ExpressionAttributeValues=None, **kwargs):
+        self.latency.apply('dynamodb', 'delete_item')
+        values = _from_wire(ExpressionAttributeValues or {})
+        with self.lock:
+            key = self._key(Key)
+            existing = self.items.get(key, {})
+            if ConditionExpression and not evaluate_condition(ConditionExpression, existing, ExpressionAttributeNames, values):
+                raise client_error('ConditionalCheckFailedException', 'DeleteItem')
+            self.items.pop(key, None)
+        return {}
+
+
+class _FakeBatchWriter:
+    """Table.batch_writer(): buffers puts and writes them 25 at a time, one batch_write_item call each"""
+
+    BATCH_SIZE = 25
+
+    def __init__(self, table):
+        self.table = table
+        self.pending = []
+
+    def put_item(self, Item):
+        _check_types(Item)
+        self.pending.append(copy.deepcopy(_from_wire(Item)))
+        if len(self.pending) >= self.BATCH_SIZE:
+            self._flush()
+
+    def _flush(self):
+        batch, self.pending = self.pending[:self.BATCH_SIZE], self.pending[self.BATCH_SIZE:]
+        if not batch:
+            return
+        self.table.latency.apply('dynamodb', 'batch_write_item')
+        with self.table.lock:
+            self.table.batch_calls += 1
+            for item in batch:
+                self.table.items[self.table._key(item)] = item
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        while self.pending:
+            self._flush()
+
+
+class FakeDynamoDB:
+    """Stands in for boto3.resource('dynamodb')"""
+
+    def __init__(self, latency, key_schemas=None):
+        self.latency = latency
+        self.key_schemas = dict(KEY_SCHEMAS, **(key_schemas or {}))
+        self.tables = {}
+        self.lock = threading.Lock()
+
+    def Table(self, name):
+        with self.lock:
+            if name not in self.tables:
+                if name not in self.key_schemas:
+                    raise ValueError(f'No key schema for fake table {name}')
+                self.tables[name] = FakeTable(name, self.key_schemas[name], self.latency)
+            return self.tables[name]
+
+    def seed(self, table_name, items):
+        table = self.Table(table_name)
+        for item in items:
+            table.items[table._key(item)] = copy.deepcopy(item)
+
+
+class _FakePaginator:
+    def __init__(self, s3, page_size=1000):
+        self.s3 = s3
+        self.page_size = page_size
+
+    def paginate(self, Bucket, Prefix=''):
+        keys = sorted(key for (bucket, key) in self.s3.objects if bucket == Bucket and key.startswith(Prefix))
+        for start in range(0, max(len(keys), 1), self.page_size):
+            self.s3.latency.apply('s3', 'list_objects_v2')
+            page = keys[start:start + self.page_size]
+            yield {'Contents': [{'Key': key, 'Size': len(self.s3.objects[(Bucket, key)]['Body'])} for key in page]} if page else {}
+
+
+class FakeS3:
+    def __init__(self, latency):
+        self.latency = latency
+        self.objects = {}
+        self.lock = threading.Lock()
+
+    def put_object(self, Bucket, Key, Body=b'', Metadata=None, **kwargs):
+        self.latency.apply('s3', 'put_object')
+        body = Body.encode() if isinstance(Body, str) else bytes(Body)
+        with self.lock:
+            self.objects[(Bucket, Key)] = {
+                'Body': body,
+                'Metadata': dict(Metadata or {}),
+                'LastModified': datetime.now(timezone.utc),
+                'ContentType': kwargs.get('ContentType', 'binary/octet-stream')
+            }
+        return {'ETag': f'"{uuid.uuid4().hex}"'}
+
+    def _get(self, Bucket, Key, operation):
+        with self.lock:
+            obj = self.objects.get((Bucket, Key))
+        if obj is None:
+            raise client_error('404' if operation == 'HeadObject' else 'NoSuchKey', operation)
+        return obj
+
+    def head_object(self, Bucket, Key, **kwargs):
+        self.latency.apply('s3', 'head_object')
+        obj = self._get(Bucket, Key, 'HeadObject')
+        return {'ContentLength': len(obj['Body']), 'LastModified': obj['LastModified'], 'Metadata': obj['Metadata']}
+
+    def get_object(self, Bucket, Key, **kwargs):
+        self.latency.apply('s3', 'get_object')
+        obj = self._get(Bucket, Key, 'GetObject')
+        return {'Body': _StreamingBody(obj['Body']), 'ContentLength': len(obj['Body']), 'Metadata': obj['Metadata']}
+
+    def copy_object(self, Bucket, Key, CopySource, Metadata=None, **kwargs):
+        self.latency.apply('s3', 'copy_object')
+        source = self._get(CopySource['Bucket'], CopySource['Key'], 'CopyObject')
+        with self.lock:
+            self.objects[(Bucket, Key)] = dict(source, Metadata=dict(Metadata or source['Metadata']),
+                                               LastModified=datetime.now(timezone.utc))
+        return {}
+
+    def delete_object(self, Bucket, Key, **kwargs):
+        self.latency.apply('s3', 'delete_object')
+        with self.lock:
+            self.objects.pop((Bucket, Key), None)
+        return {}
+
+    def generate_presigned_url(self, ClientMethod, Params, ExpiresIn=3600):
+        # Presigning is local computation in boto3 - no latency
+        return f"https://{Params['Bucket']}.s3.amazonaws.com/{Params['Key']}?X-Amz-Expires={ExpiresIn}&X-Amz-Signature={uuid.uuid4().hex}"
+
+    def get_paginator(self, operation_name):
+        if operation_name != 'list_objects_v2':
+            raise ValueError(f'Unsupported paginator: {operation_name}')
+        return _FakePaginator(self)
+
+    def seed(self, bucket, keys, body=b'%PDF-1.4\n%%EOF\n'):
+        for key in keys:
+            self.objects[(bucket, key)] = {'Body': body, 'Metadata': {}, 'LastModified': datetime.now(timezone.utc)}
+
+
+class FakeTextract:
+    def __init__(self, latency, lines=None, polls_until_done=1):
+        self.latency = latency
+        self.lines = lines or ['Jane Doe', 'Software Engineer', 'Python, AWS, React']
+        self.polls_until_done = polls_until_done
+        self.jobs = {}
+        self.lock = threading.Lock()
+
+    def _blocks(self):
+        return [{'BlockType': 'PAGE'}] + [{'BlockType': 'LINE', 'Text': line} for line in self.lines]
+
+    def detect_document_text(self, Document):
+        self.latency.apply('textract', 'detect_document_text')
+        return {'Blocks': self._blocks()}
+
+    def start_document_text_detection(self, DocumentLocation, **kwargs):
+        self.latency.apply('textract', 'start_document_text_detection')
+        job_id = uuid.uuid4().hex
+        with self.lock:
+            self.jobs[job_id] = 0
+        return {'JobId': job_id}
+
+    def get_document_text_detection(self, JobId, NextToken=None, **kwargs):
+        self.latency.apply('textract', 'get_document_text_detection')
+        with self.lock:
+            self.jobs[JobId] += 1
+            polls = self.jobs[JobId]
+        if polls < self.polls_until_done:
+            return {'JobStatus': 'IN_PROGRESS', 'Blocks': []}
+        return {'JobStatus': 'SUCCEEDED', 'Blocks': self._blocks()}
+
+
+class FakeBedrock:
+    """
+    Returns canned model output chosen by a responder(prompt) callable,
+    wrapped in the Anthropic messages response envelope.
+    """
+
+    def __init__(self, latency, responder=None):
+        self.latency = latency
+        self.responder = responder or (lambda prompt: '{}')
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def invoke_model(self, modelId, body, **kwargs):
+        self.latency.apply('bedrock', 'invoke_model')
+        request = json.loads(body)
+        prompt = request['messages'][0]['content']
+        with self.lock:
+            self.calls += 1
+        text = self.responder(prompt)
+        payload = {
+            'content': [{'type': 'text', 'text': text}],
+            'usage': {'input_tokens': len(prompt) // 4, 'output_tokens': len(text) // 4}
+        }
+        return {'body': _StreamingBody(json.dumps(payload).encode()), 'contentType': 'application/json'}
+
+
+class FakeLambda:
+    """Records asynchronous invocations; the caller runs them (see harness.run_async_invocations)"""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.invocations = []
+        self.lock = threading.Lock()
+
+    def invoke(self, FunctionName, Payload=b'', InvocationType='RequestResponse', **kwargs):
+        self.latency.apply('lambda', 'invoke')
+        if InvocationType != 'Event':
+            raise NotImplementedError('Only asynchronous invocations are faked')
+        with self.lock:
+            self.invocations.append((FunctionName, json.loads(Payload)))
+        return {'StatusCode': 202}
+
+
+class Fakes:
+    def __init__(self, latency):
+        self.latency = latency
+        self.s3 = FakeS3(latency)
+        self.dynamodb = FakeDynamoDB(latency)
+        self.textract = FakeTextract(latency)
+        self.bedrock = FakeBedrock(latency)
+        self.lambda_ = FakeLambda(latency)
+
+
+def install_fakes(latency=None, regions=(None, 'us-east-2')):
+    """Route every resume_tailor_core.clients lookup to a fresh set of fakes"""
+    from resume_tailor_core import clients
+
+    fakes = Fakes(latency or LatencyModel())
+    clients.reset()
+    for region in regions:
+        clients.set_client('s3', fakes.s3, region_name=region)
+        clients.set_client('textract', fakes.textract, region_name=region)
+        clients.set_client('bedrock-runtime', fakes.bedrock, region_name=region)
+        clients.set_client('lambda', fakes.lambda_, region_name=region)
+        clients.set_resource('dynamodb', fakes.dynamodb, region_name=region)
+    return fakes
@@ -0,0 +1,205 @@
+"""
+Shared helpers for running Lambda handlers locally against the fakes in
+benchmarks/fakes.py.
+
+Handlers are imported from backend/lambdas the same way the Lambda runtime
+imports them, each under its own module name so several can be loaded in one
+process. Service latency is injected by the fakes; with time_scale=0 nothing
+actually sleeps and the injected latency is reported separately, so a whole
+workload replays in seconds.
+"""
+
+import base64
+import contextlib
+import importlib.util
+import json
+import math
+import os
+import resource
+import sys
+import time
+import uuid
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+LAMBDAS_DIR = BACKEND_DIR / 'lambdas'
+WORKLOADS_DIR = Path(__file__).resolve().parent / 'workloads'
+
+if str(LAMBDAS_DIR) not in sys.path:
+    sys.path.insert(0, str(LAMBDAS_DIR))
+
+from fakes import LatencyModel, install_fakes  # noqa: E402
+
+BUCKET_NAME = 'resume-tailor-bucket.kp'
+
+
+def load_workload(path=None):
+    with open(path or WORKLOADS_DIR / 'recorded.json') as f:
+        return json.load(f)
+
+
+def load_handler(function_name):
+    """Import lambdas/<function_name>/lambda_function.py under a unique module name"""
+    path = LAMBDAS_DIR / function_name / 'lambda_function.py'
+    spec = importlib.util.spec_from_file_location(f'{function_name}_lambda_function', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class FakeContext:
+    """The attributes of the Lambda context object the handlers read"""
+
+    def __init__(self, function_name, memory_limit_in_mb=128, timeout_seconds=30, time_scale=1.0):
+        self.function_name = function_name
+        self.function_version = '$LATEST'
+        self.memory_limit_in_mb = memory_limit_in_mb
+        self.aws_request_id = str(uuid.uuid4())
+        self.invoked_function_arn = f'arn:aws:lambda:us-east-2:000000000000:function:{function_name}'
+        # With service latency compressed by time_scale, the timeout counts down in simulated time
+        self._time_scale = time_scale or 1.0
+        self._deadline = time.time() + timeout_seconds * self._time_scale
+
+    def get_remaining_time_in_millis(self):
+        return max(0, int((self._deadline - time.time()) / self._time_scale * 1000))
+
+
+class _SimulatedTime:
+    """
+    Replaces a handler module's `time` so fixed waits (Textract polling)
+    count as simulated latency instead of sleeping.
+    """
+
+    def __init__(self, latency):
+        self._latency = latency
+
+    def sleep(self, seconds):
+        self._latency.add(seconds * 1000)
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+def simulate_sleeps(module, latency):
+    if hasattr(module, 'time'):
+        module.time = _SimulatedTime(latency)
+
+
+def build_event(spec, pdf_base64=None):
+    """
+    Build an API Gateway HTTP API event from a workload spec:
+        {"body": {...}, "query": {...}, "user_id": "...", "source_ip": "..."}
+    The placeholder "$PDF" in a body value is replaced by the sample PDF.
+    """
+    request_id = str(uuid.uuid4())
+    event = {
+        'version': '2.0',
+        'headers': {'content-type': 'application/json'},
+        'requestContext': {
+            'requestId': request_id,
+            'identity': {'sourceIp': spec.get('source_ip', '203.0.113.10')},
+            'http': {'method': spec.get('method', 'POST'), 'sourceIp': spec.get('source_ip', '203.0.113.10')}
+        }
+    }
+    if spec.get('user_id'):
+        event['requestContext']['authorizer'] = {'jwt': {'claims': {'sub': spec['user_id']}}}
+    if 'body' in spec:
+        body = {key: (pdf_base64 if value == '$PDF' else value) for key, value in spec['body'].items()}
+        event['body'] = json.dumps(body)
+    if 'query' in spec:
+        event['queryStringParameters'] = dict(spec['query'])
+    return event
+
+
+def sample_pdf_base64(workload):
+    return workload.get('pdf_base64') or base64.b64encode(
+        b'%PDF-1.4\n1 0 obj << /Type /Pages /Count 1 >> endobj\n2 0 obj << /Type /Page >> endobj\n%%EOF\n'
+    ).decode()
+
+
+def install_workload(workload, latency):
+    """Install fakes seeded with the workload's tables, objects and model output"""
+    fakes = install_fakes(latency)
+    for table_name, items in workload.get('tables', {}).items():
+        fakes.dynamodb.seed(table_name, items)
+    fakes.s3.seed(BUCKET_NAME, workload.get('s3_objects', []))
+    textract = workload.get('textract', {})
+    fakes.textract.lines = textract.get('lines', fakes.textract.lines)
+    fakes.textract.polls_until_done = textract.get('polls_until_done', 1)
+
+    responses = workload.get('bedrock_responses', {})
+
+    def responder(prompt):
+        # Pick the canned response by the prompt's opening instruction
+        for marker, text in responses.items():
+            if marker in prompt:
+                return text
+        return '{}'
+
+    fakes.bedrock.responder = responder
+    return fakes
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process (ru_maxrss is KiB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def invoke(module, event, context, latency, quiet=True):
+    """
+    Run one invocation, by default with handler logs suppressed.
+    Returns (response, {'wall_ms', 'cpu_ms', 'io_ms'}).
+
+    Suppression redirects the process-wide stdout/stderr, so concurrent
+    callers pass quiet=False and wrap the whole run in silenced() instead.
+    """
+    latency.reset()
+    wall_start = time.perf_counter()
+    cpu_start = time.thread_time()
+    with silenced() if quiet else contextlib.nullcontext():
+        response = module.lambda_handler(event, context)
+    cpu_ms = (time.thread_time() - cpu_start) * 1000
+    wall_ms = (time.perf_counter() - wall_start) * 1000
+    return response, {'wall_ms': wall_ms, 'cpu_ms': cpu_ms, 'io_ms': latency.simulated_ms()}
+
+
+def run_async_invocations(fakes, latency, quiet=True, timeout_seconds=900):
+    """
+    Run the asynchronous Lambda invocations recorded by the fake Lambda
+    client, including any they make in turn, each with timeout_seconds of
+    simulated time. Returns [(function name, response, timing)] in the order
+    they ran.
+    """
+    ran = []
+    while fakes.lambda_.invocations:
+        function_arn, payload = fakes.lambda_.invocations.pop(0)
+        function_name = function_arn.rsplit(':', 1)[-1]
+        context = FakeContext(function_name, timeout_seconds=timeout_seconds, time_scale=latency.time_scale)
+        response, timing = invoke(load_handler(function_name), payload, context, latency, quiet)
+        ran.append((function_name, response, timing))
+    return ran
+
+
+@contextlib.contextmanager
+def silenced():
+    """Discard handler logs (they are still formatted, so their cost is measured)"""
+    with open(os.devnull, 'w') as devnull:
+        with contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+            yield
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+__all__ = [
+    'BACKEND_DIR', 'LAMBDAS_DIR', 'WORKLOADS_DIR', 'BUCKET_NAME', 'FakeContext', 'LatencyModel',
+    'build_event', 'install_workload', 'invoke', 'load_handler', 'load_workload', 'peak_rss_mb',
+    'percentile', 'sample_pdf_base64', 'silenced', 'simulate_sleeps'
+]
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Storage and capacity units of job descriptions stored inline in every score
+result versus once per distinct text in the JobDescriptions table.
+
+Replays --results score results whose job descriptions are drawn, with
+Zipf-like popularity, from --distinct postings. Each posting is pasted with
+random whitespace and invisible-character differences, as copies from
+different job boards are. For both layouts this reports the bytes stored,
+write units of the puts and updates, and read units of the lookups
+(jd_store reads the JD item before deciding whether to write it).
+
+It also checks that:
+
+  - every pasted variant of a posting maps to one jdHash;
+  - get_score returns the stored job description for a result holding
+    only its hash;
+  - a guest-only job description expires, and loses its ttl once a
+    signed-in user saves the same text;
+  - a guest job description too large for an item is not stored, so
+    guests never leave offloaded objects that no lifecycle rule expires.
+
+Usage:
+    python benchmarks/jd_dedup.py [--results 1000] [--distinct 60]
+"""
+
+import sys
+import math
+import json
+import random
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from harness import (FakeContext, LatencyModel, build_event, install_workload, invoke, load_handler,  # noqa: E402
+                     load_workload)
+
+
+class Metered:
+    """Wraps a fake table to add up the capacity units of its calls"""
+
+    def __init__(self, inner, item_size):
+        self.inner = inner
+        self.item_size = item_size
+        self.wcu = 0
+        self.rcu = 0.0
+
+    def __getattr__(self, name):
+        return getattr(self.inner, name)
+
+    def get_item(self, **kwargs):
+        result = self.inner.get_item(**kwargs)
+        size = self.item_size(result['Item']) if result.get('Item') else 0
+        self.rcu += max(1, math.ceil(size / 4096)) * 0.5
+        return result
+
+    def put_item(self, Item, **kwargs):
+        self.wcu += math.ceil(self.item_size(Item) / 1024)
+        return self.inner.put_item(Item=Item, **kwargs)
+
+    def update_item(self, Key, **kwargs):
+        current = self.inner.items.get(self.inner._key(Key))
+        self.wcu += max(1, math.ceil(self.item_size(current or Key) / 1024))
+        return self.inner.update_item(Key=Key, **kwargs)
+
+    def stored_bytes(self):
+        return sum(self.item_size(item) for item in self.inner.items.values())
+
+
+def pasted_variant(text, rng):
+    """text as pasted from somewhere else: different spacing, line endings and stray invisibles"""
+    lines = text.split('\n')
+    out = []
+    for line in lines:
+        words = line.split(' ')
+        spacer = rng.choice([' ', '  ', '\u00a0'])
+        line = spacer.join(words)
+        if rng.random() < 0.1:
+            line = '\u200b' + line
+        out.append(line + rng.choice(['', ' ', '\t']))
+    return rng.choice(['\n', '\r\n']).join(out) + rng.choice(['', '\n', '\n\n\n'])
+
+
+def posting(words, rng):
+    """A few KB of job description text in short paragraphs"""
+    paragraphs = []
+    for _ in range(rng.randint(6, 14)):
+        rng.shuffle(words)
+        paragraphs.append(' '.join(words[:rng.randint(40, 90)]))
+    return '\n\n'.join(paragraphs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare inline and deduplicated job description storage')
+    parser.add_argument('--results', type=int, default=1000)
+    parser.add_argument('--distinct', type=int, default=60)
+    args = parser.parse_args()
+
+    from resume_tailor_core import clients
+    from resume_tailor_core.jd_store import clean_text, jd_hash, save_job_description
+    from resume_tailor_core.result_store import encode_result, item_size
+
+    workload = load_workload()
+    recorded = workload['tables']['ResumeAnalysisResults'][0]
+    latency = LatencyModel(workload.get('latency'), time_scale=0)
+    fakes = install_workload(workload, latency)
+    rng = random.Random(11)
+
+    words = (recorded['jobDescription'] + ' ' + ' '.join(recorded['feedback'])).split()
+    postings = [posting(list(words), rng) for _ in range(args.distinct)]
+    weights = [1 / (rank + 1) for rank in range(args.distinct)]
+
+    inline = Metered(fakes.dynamodb.Table('ResumeAnalysisResults'), item_size)
+    fakes.dynamodb.key_schemas['ResumeResultsByHash'] = ('resultId',)
+    by_hash = Metered(fakes.dynamodb.Table('ResumeResultsByHash'), item_size)
+    jd_table = Metered(fakes.dynamodb.Table('JobDescriptions'), item_size)
+
+    hashes_per_posting = [set() for _ in postings]
+    for i in range(args.results):
+        index = rng.choices(range(args.distinct), weights)[0]
+        text = pasted_variant(postings[index], rng)
+        base = {
+            'resultId': f'result-{i:05d}',
+            'score': 70,
+            'feedback': recorded['feedback'],
+            'createdAt': '2025-01-01T00:00:00',
+            'resumeId': recorded['resumeId'],
+            'inputMode': 'pdf',
+            'userId': 'user-0001'
+        }
+        inline.put_item(Item=encode_result(dict(base, jobDescription=text)))
+        record = save_job_description(text, table=jd_table, s3=fakes.s3)
+        by_hash.put_item(Item=encode_result(dict(base, jdHash=record['jdHash'])))
+        hashes_per_posting[index].add(record['jdHash'])
+
+    used = sum(1 for hashes in hashes_per_posting if hashes)
+    print(f"{args.results} results over {used} distinct job descriptions\n")
+    print(f"{'layout':<22} {'stored bytes':>13} {'WCU':>7} {'RCU':>7}")
+    print(f"{'inline in results':<22} {inline.stored_bytes():>13} {inline.wcu:>7} {inline.rcu:>7.1f}")
+    total_bytes = by_hash.stored_bytes() + jd_table.stored_bytes()
+    print(f"{'jdHash + JD store':<22} {total_bytes:>13} {by_hash.wcu + jd_table.wcu:>7} "
+          f"{by_hash.rcu + jd_table.rcu:>7.1f}")
+    print(f"{'  of which JD store':<22} {jd_table.stored_bytes():>13} {jd_table.wcu:>7} {jd_table.rcu:>7.1f}")
+
+    if any(len(hashes) > 1 for hashes in hashes_per_posting) or len(jd_table.inner.items) != used:
+        print("\n❌ pasted variants of one posting hashed differently")
+        sys.exit(1)
+
+    # get_score resolves a result's jdHash to the stored text
+    clients.set_table('ResumeAnalysisResults', fakes.dynamodb.Table('ResumeAnalysisResults'))
+    clients.set_table('JobDescriptions', jd_table.inner)
+    event = build_event(workload['requests']['get_score']['events'][0])
+    result_id = event['queryStringParameters']['resultId']
+    digest = jd_hash(clean_text(postings[0]))
+    stored = {key: value for key, value in recorded.items() if key != 'jobDescription'}
+    fakes.dynamodb.seed('ResumeAnalysisResults', [dict(stored, resultId=result_id, jdHash=digest)])
+    response, _ = invoke(load_handler('get_score'), event, FakeContext('get_score'), latency)
+    body = json.loads(response['body'])
+    if response['statusCode'] != 200 or body['jobDescription'] != clean_text(postings[0]) or body['jdHash'] != digest:
+        print("\n❌ get_score did not resolve the job description hash")
+        sys.exit(1)
+
+    # Guest-only text expires; a signed-in save of the same text keeps it
+    guest_text = posting(list(words), rng)
+    record = save_job_description(guest_text, guest=True, table=jd_table, s3=fakes.s3)
+    if 'ttl' not in jd_table.inner.items[(record['jdHash'],)]:
+        print("\n❌ guest job description has no ttl")
+        sys.exit(1)
+    save_job_description(pasted_variant(guest_text, rng), table=jd_table, s3=fakes.s3)
+    if 'ttl' in jd_table.inner.items[(record['jdHash'],)]:
+        print("\n❌ job description saved by a signed-in user still expires")
+        sys.exit(1)
+
+    # Too large for an item: offloaded to S3 for a signed-in user, refused for a guest
+    from resume_tailor_core.jd_store import MAX_BLOB_BYTES
+    huge_text = ' '.join(''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(8))
+                         for _ in range(MAX_BLOB_BYTES // 3))
+    objects = len(fakes.s3.objects)
+    try:
+        save_job_description(huge_text, guest=True, table=jd_table, s3=fakes.s3)
+        refused = False
+    except ValueError:
+        refused = True
+    if not refused or len(fakes.s3.objects) != objects:
+        print("\n❌ an oversized guest job description was offloaded to S3")
+        sys.exit(1)
+    record = save_job_description(huge_text, table=jd_table, s3=fakes.s3)
+    if 'contentS3Key' not in jd_table.inner.items[(record['jdHash'],)] or len(fakes.s3.objects) != objects + 1:
+        print("\n❌ an oversized job description was not offloaded to S3")
+        sys.exit(1)
+    print("\n✅ one JD item per posting; get_score resolves hashes; guest-only JDs expire until reused; "
+          "guests cannot offload to S3")
+
+
+if __name__ == '__main__':
+    main()
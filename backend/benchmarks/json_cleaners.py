@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Replay benchmark for the model-response JSON cleaners.
+
+Runs every cleaner over the corpus of recorded Bedrock outputs in
+benchmarks/workloads/bedrock_outputs.jsonl - clean responses alongside
+pathological ones with markdown fences, surrounding prose, control and
+format characters, literal newlines in strings and truncation - and reports
+for each cleaner:
+
+  parsed   share of responses that produced a value
+  correct  share whose value equals the expected one (truncated responses
+           are correct only if the cleaner rejects them)
+  ns/byte  mean parse time per byte of response
+
+The legacy cleaners are the three per-handler variants that
+resume_tailor_core.json_parser.load_model_json replaced, kept here verbatim
+so the replacement can be re-checked against them.
+
+Usage:
+    python benchmarks/json_cleaners.py [--repeat 20] [--kind score] [--failures]
+"""
+
+import re
+import sys
+import json
+import time
+import argparse
+import unicodedata
+from collections import defaultdict
+from pathlib import Path
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCHMARKS_DIR.parent / 'lambdas'))
+
+from resume_tailor_core.json_parser import load_model_json  # noqa: E402
+
+CORPUS = BENCHMARKS_DIR / 'workloads' / 'bedrock_outputs.jsonl'
+
+# Top-level type each handler expects
+EXPECTED_TYPES = {'score': dict, 'tailor': list, 'process': list}
+
+
+# --- Legacy cleaners ---------------------------------------------------------
+
+LEGACY_INTRO_PHRASES = [
+    "Here is the enhanced resume with tailored content:",
+    "Here is the tailored resume:",
+    "Here are the enhanced resume items:",
+    "The enhanced resume with tailored content:",
+    "Enhanced resume:",
+    "Tailored resume:",
+]
+_LEGACY_CONTROL_CHARS_RE = re.compile(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]')
+
+
+def _legacy_clean_json_string(text):
+    text = unicodedata.normalize('NFKC', text)
+    cleaned = ''.join(char for char in text if unicodedata.category(char) not in ['Cc', 'Cf'])
+    return cleaned.strip()
+
+
+def _legacy_extract_fenced_object(text):
+    if text.strip().startswith('```'):
+        start_idx = text.find('{')
+        end_idx = text.rfind('}')
+        if start_idx != -1 and end_idx != -1 and end_idx > start_idx:
+            return text[start_idx:end_idx+1]
+    return text
+
+
+def legacy_score(raw_text):
+    """score_resume: NFKC + Cc/Cf filter, fenced object, then two ASCII fallbacks"""
+    try:
+        return json.loads(_legacy_extract_fenced_object(_legacy_clean_json_string(raw_text)))
+    except json.JSONDecodeError as e:
+        first_error = e
+    ascii_only = ''.join(c for c in raw_text if ord(c) < 128 and (c.isprintable() or c in '\n\t\r '))
+    try:
+        return json.loads(_legacy_extract_fenced_object(ascii_only))
+    except json.JSONDecodeError:
+        pass
+    safe_text = re.sub(r'[^\x20-\x7E\n\t\r]', ' ', raw_text)
+    safe_text = re.sub(r'\s+', ' ', safe_text)
+    try:
+        return json.loads(_legacy_extract_fenced_object(safe_text))
+    except json.JSONDecodeError:
+        raise first_error
+
+
+def legacy_tailor(raw_text):
+    """tailor_master_resume: ASCII control chars, intro phrases, skip to first bracket"""
+    cleaned = _LEGACY_CONTROL_CHARS_RE.sub('', raw_text).strip()
+    for phrase in LEGACY_INTRO_PHRASES:
+        if cleaned.lower().startswith(phrase.lower()):
+            cleaned = cleaned[len(phrase):].strip()
+            break
+    start_idx = -1
+    for i, char in enumerate(cleaned):
+        if char in ['[', '{']:
+            start_idx = i
+            break
+    if start_idx > 0:
+        cleaned = cleaned[start_idx:]
+    return json.loads(cleaned.strip())
+
+
+def legacy_process(raw_text):
+    """process_master_resume: ASCII control chars only"""
+    return json.loads(_LEGACY_CONTROL_CHARS_RE.sub('', raw_text))
+
+
+CLEANERS = {
+    'legacy_score': lambda raw, kind: legacy_score(raw),
+    'legacy_tailor': lambda raw, kind: legacy_tailor(raw),
+    'legacy_process': lambda raw, kind: legacy_process(raw),
+    'load_model_json': lambda raw, kind: load_model_json(raw, expect=EXPECTED_TYPES[kind]),
+}
+
+
+def load_corpus(kind=None):
+    with open(CORPUS, encoding='utf-8') as f:
+        samples = [json.loads(line) for line in f if line.strip()]
+    return [s for s in samples if kind is None or s['kind'] == kind]
+
+
+def run_cleaner(cleaner, sample):
+    try:
+        return True, cleaner(sample['raw'], sample['kind'])
+    except Exception:  # every failure mode counts as "not parsed"
+        return False, None
+
+
+def benchmark(samples, repeat):
+    results = {}
+    for name, cleaner in CLEANERS.items():
+        parsed = correct = 0
+        failures = []
+        by_tag = defaultdict(lambda: [0, 0])
+        for sample in samples:
+            ok, value = run_cleaner(cleaner, sample)
+            is_correct = (not ok) if sample['expected'] is None else (ok and value == sample['expected'])
+            parsed += ok
+            correct += is_correct
+            for tag in sample['tags']:
+                by_tag[tag][0] += is_correct
+                by_tag[tag][1] += 1
+            if not is_correct:
+                failures.append(sample['id'])
+
+        total_bytes = sum(len(s['raw'].encode('utf-8')) for s in samples)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for sample in samples:
+                run_cleaner(cleaner, sample)
+        elapsed = time.perf_counter() - start
+
+        results[name] = {
+            'parsed': parsed / len(samples),
+            'correct': correct / len(samples),
+            'ns_per_byte': elapsed * 1e9 / (total_bytes * repeat),
+            'by_tag': {tag: f"{ok}/{n}" for tag, (ok, n) in sorted(by_tag.items())},
+            'failures': failures
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark model-response JSON cleaners on recorded outputs')
+    parser.add_argument('--repeat', type=int, default=20, help='Timing passes over the corpus')
+    parser.add_argument('--kind', choices=sorted(EXPECTED_TYPES), help='Only replay responses for one handler')
+    parser.add_argument('--failures', action='store_true', help='List the samples each cleaner gets wrong')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    samples = load_corpus(args.kind)
+    results = benchmark(samples, args.repeat)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{len(samples)} recorded responses, {sum(len(s['raw']) for s in samples) / 1024:.0f} KB\n")
+    print(f"{'cleaner':<18} {'parsed':>7} {'correct':>8} {'ns/byte':>8}")
+    for name, r in results.items():
+        print(f"{name:<18} {r['parsed']:>7.1%} {r['correct']:>8.1%} {r['ns_per_byte']:>8.1f}")
+
+    tags = sorted({tag for r in results.values() for tag in r['by_tag']})
+    print(f"\n{'correct by tag':<18} " + ' '.join(f"{name[:15]:>15}" for name in results))
+    for tag in tags:
+        print(f"{tag:<18} " + ' '.join(f"{r['by_tag'].get(tag, '-'):>15}" for r in results.values()))
+
+    if args.failures:
+        for name, r in results.items():
+            print(f"\n{name} wrong on: {', '.join(r['failures']) or 'none'}")
+
+
+if __name__ == '__main__':
+    main()
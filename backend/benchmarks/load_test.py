@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Local end-to-end load test for the Resume Tailor backend.
+
+Imports every handler in one process with its AWS clients swapped for the
+in-process fakes in benchmarks/fakes.py, then drives a weighted mix of the
+recorded requests (benchmarks/workloads/recorded.json) from a pool of
+concurrent workers, spread over a population of users and guest IPs. Service
+latency follows the recorded distributions and can be compressed with
+--time-scale; reported latencies are converted back to real time.
+
+Reports per endpoint: p50/p95/p99 latency, throughput, status codes,
+requests rejected by the rate limiter and calls throttled by the fakes, and
+checks that no usage counter ended above its limit.
+
+Usage:
+    python benchmarks/load_test.py [--requests 500] [--concurrency 20] [--users 25]
+    python benchmarks/load_test.py --time-scale 0.01 --bedrock-rps 2 --bedrock-burst 10
+"""
+
+import sys
+import json
+import random
+import argparse
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from harness import (FakeContext, LatencyModel, build_event, install_workload, invoke, load_handler,  # noqa: E402
+                     load_workload, percentile, sample_pdf_base64, silenced, simulate_sleeps)
+
+SEED_USER = 'user-0001'
+SEED_IP = '203.0.113.10'
+
+
+def personalize(value, user_id, source_ip):
+    """Rewrite a recorded request or seed item for another user"""
+    text = json.dumps(value).replace(SEED_USER, user_id).replace(SEED_IP, source_ip)
+    return json.loads(text)
+
+
+def user_population(count):
+    return [(f'user-{i + 1:04d}', f'203.0.113.{10 + i % 240}') for i in range(count)]
+
+
+def build_schedule(requests, total, users, seed):
+    """A shuffled list of (function_name, event spec) following the recorded request mix"""
+    rng = random.Random(seed)
+    names = list(requests)
+    weights = [requests[name].get('weight', 1) for name in names]
+    schedule = []
+    for _ in range(total):
+        name = rng.choices(names, weights)[0]
+        user_id, source_ip = rng.choice(users)
+        spec = rng.choice(requests[name]['events'])
+        schedule.append((name, personalize(spec, user_id, source_ip)))
+    return schedule
+
+
+def seed_population(workload, users):
+    """Give every simulated user their own copy of the recorded table items and objects"""
+    seeded = dict(workload)
+    seeded['tables'] = {
+        table: [personalize(item, user_id, ip) for item in items for user_id, ip in users]
+        for table, items in workload.get('tables', {}).items()
+    }
+    seeded['s3_objects'] = sorted({
+        personalize(key, user_id, ip) for key in workload.get('s3_objects', []) for user_id, ip in users
+    })
+    return seeded
+
+
+def run(args):
+    workload = load_workload(args.workload)
+    requests = workload['requests']
+    if args.functions:
+        requests = {name: spec for name, spec in requests.items() if name in args.functions}
+
+    throttling = dict(workload.get('throttling', {}))
+    if args.bedrock_rps:
+        throttling['bedrock'] = {'requests_per_second': args.bedrock_rps, 'burst': args.bedrock_burst}
+    if args.throttle_probability:
+        for service in ('bedrock', 'textract'):
+            throttling.setdefault(service, {})['probability'] = args.throttle_probability
+    latency_specs = dict(workload.get('latency', {}))
+    if args.bedrock_median_ms:
+        latency_specs['bedrock'] = dict(latency_specs.get('bedrock', {'dist': 'lognormal', 'sigma': 0.35}),
+                                        median_ms=args.bedrock_median_ms)
+
+    latency = LatencyModel(latency_specs, time_scale=args.time_scale, seed=args.seed, throttling=throttling)
+    users = user_population(args.users)
+    fakes = install_workload(seed_population(workload, users), latency)
+    pdf_base64 = sample_pdf_base64(workload)
+
+    modules = {}
+    for name in requests:
+        modules[name] = load_handler(name)
+        simulate_sleeps(modules[name], latency)
+
+    schedule = build_schedule(requests, args.requests, users, args.seed)
+    results = defaultdict(list)
+    results_lock = threading.Lock()
+
+    def worker(item):
+        name, spec = item
+        event = build_event(spec, pdf_base64)
+        try:
+            response, timing = invoke(modules[name], event, FakeContext(name), latency, quiet=False)
+            status = response.get('statusCode')
+        except Exception as e:  # handlers catch their own errors; this is a harness bug
+            response, timing = {}, {'wall_ms': 0, 'io_ms': 0, 'cpu_ms': 0}
+            status = f'raised {type(e).__name__}'
+        # Undo --time-scale: sleeps covered io_ms * time_scale of the measured wall time
+        latency_ms = timing['wall_ms'] + timing['io_ms'] * (1 - args.time_scale)
+        with results_lock:
+            results[name].append((latency_ms, status))
+
+    start = time.perf_counter()
+    with silenced(), ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        list(executor.map(worker, schedule))
+    elapsed = time.perf_counter() - start
+    # Wall time of the run in real-time terms, for throughput
+    real_elapsed = elapsed / args.time_scale if 0 < args.time_scale < 1 else elapsed
+
+    return summarize(results, real_elapsed, fakes, latency)
+
+
+def summarize(results, real_elapsed, fakes, latency):
+    endpoints = {}
+    for name, samples in sorted(results.items()):
+        latencies = [s[0] for s in samples]
+        statuses = defaultdict(int)
+        for _, status in samples:
+            statuses[str(status)] += 1
+        rate_limited = statuses.get('429', 0)
+        endpoints[name] = {
+            'requests': len(samples),
+            'p50_ms': percentile(latencies, 50),
+            'p95_ms': percentile(latencies, 95),
+            'p99_ms': percentile(latencies, 99),
+            'throughput_rps': len(samples) / real_elapsed,
+            'rate_limited': rate_limited,
+            'statuses': dict(statuses)
+        }
+
+    # Conditional updates must never let a counter pass its limit, however many requests race.
+    # score_resume counts guest IPs against user limits when with_auth is set, so guest
+    # counters are checked against the highest limit for their service.
+    from resume_tailor_core.rate_limiter import create_rate_limiter
+    from resume_tailor_core.single_flight import FLIGHT_PREFIX
+    limits = create_rate_limiter().LIMITS
+    # Single-flight claims share the table but are not usage counters
+    usage_items = [item for item in fakes.dynamodb.Table('ApiUsageLimits').items.values()
+                   if not item['identifier'].startswith(FLIGHT_PREFIX)]
+    over_limit = []
+    for item in usage_items:
+        service = item['date_service'].split('#', 1)[1]
+        if item['identifier'].startswith('guest_'):
+            limit = max(user_limits[service] for user_limits in limits.values())
+        else:
+            limit = limits['user'][service]
+        if item['request_count'] > limit:
+            over_limit.append({'identifier': item['identifier'], 'service': service, 'count': int(item['request_count'])})
+
+    total = sum(e['requests'] for e in endpoints.values())
+    return {
+        'total_requests': total,
+        'elapsed_s': real_elapsed,
+        'throughput_rps': total / real_elapsed,
+        'endpoints': endpoints,
+        'throttled_calls': dict(latency.throttled),
+        'bedrock_calls': fakes.bedrock.calls,
+        'usage_counters': len(usage_items),
+        'counters_over_limit': over_limit
+    }
+
+
+def print_report(report, args):
+    print(f"\n{report['total_requests']} requests, concurrency {args.concurrency}, {args.users} users, "
+          f"time scale {args.time_scale}")
+    print(f"{'endpoint':<24} {'reqs':>5} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'rps':>7} {'429':>5}  statuses")
+    for name, e in report['endpoints'].items():
+        statuses = ' '.join(f"{code}:{count}" for code, count in sorted(e['statuses'].items()))
+        print(f"{name:<24} {e['requests']:>5} {e['p50_ms']:>8.0f} {e['p95_ms']:>8.0f} {e['p99_ms']:>8.0f} "
+              f"{e['throughput_rps']:>7.2f} {e['rate_limited']:>5}  {statuses}")
+    print(f"\nOverall throughput: {report['throughput_rps']:.2f} req/s over {report['elapsed_s']:.1f}s")
+    print(f"Bedrock calls: {report['bedrock_calls']}, throttled service calls: {report['throttled_calls'] or 'none'}")
+    if report['counters_over_limit']:
+        print(f"❌ {len(report['counters_over_limit'])} usage counters exceeded their limit:")
+        for entry in report['counters_over_limit']:
+            print(f"   {entry}")
+    else:
+        print(f"✅ {report['usage_counters']} usage counters, none above its limit")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the handlers locally against AWS fakes')
+    parser.add_argument('--requests', type=int, default=500, help='Total requests to send')
+    parser.add_argument('--concurrency', type=int, default=20, help='Concurrent in-flight requests')
+    parser.add_argument('--users', type=int, default=25, help='Distinct users/guest IPs in the traffic')
+    parser.add_argument('--functions', nargs='+', help='Only send traffic to these functions')
+    parser.add_argument('--time-scale', type=float, default=0.01,
+                        help='Fraction of recorded service latency actually slept (1 = real time)')
+    parser.add_argument('--bedrock-median-ms', type=float, help='Override the median Bedrock latency')
+    parser.add_argument('--bedrock-rps', type=float, help='Bedrock token bucket refill rate (requests/s)')
+    parser.add_argument('--bedrock-burst', type=int, default=10, help='Bedrock token bucket size')
+    parser.add_argument('--throttle-probability', type=float,
+                        help='Probability that any Bedrock/Textract call is throttled')
+    parser.add_argument('--workload', default=str(Path(__file__).resolve().parent / 'workloads' / 'recorded.json'))
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+
+    if not 0 < args.time_scale <= 1:
+        parser.error('--time-scale must be in (0, 1]; concurrency needs real (scaled) waits')
+
+    report = run(args)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report, args)
+    if report['counters_over_limit']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Per-request logging overhead of each handler.
+
+Replays the recorded workload (as tune_memory.py does) twice per handler:
+once with logging enabled and once with logging.disable(), so the
+difference in handler CPU time is what logging costs a request. Bytes and
+lines written are counted as well, since CloudWatch ingestion is billed per
+byte.
+
+Usage:
+    python benchmarks/logging_overhead.py [--invocations 200] [--budget-us 1500]
+"""
+
+import sys
+import json
+import logging
+import argparse
+import contextlib
+import statistics
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from harness import (FakeContext, LatencyModel, build_event, install_workload, invoke, load_handler,  # noqa: E402
+                     load_workload, sample_pdf_base64, simulate_sleeps)
+
+
+class CountingSink:
+    """A write-only stream that counts what would have been logged"""
+
+    def __init__(self):
+        self.bytes = 0
+        self.lines = 0
+
+    def write(self, text):
+        self.bytes += len(text.encode('utf-8'))
+        self.lines += text.count('\n')
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+def measure(module, name, spec, pdf_base64, latency, usage_table, invocations):
+    """Median handler CPU time per invocation, and log volume per invocation"""
+    sink = CountingSink()
+    cpu = []
+    with contextlib.redirect_stdout(sink), contextlib.redirect_stderr(sink):
+        for i in range(invocations):
+            usage_table.items.clear()
+            event = build_event(spec['events'][i % len(spec['events'])], pdf_base64)
+            _, timing = invoke(module, event, FakeContext(name), latency, quiet=False)
+            cpu.append(timing['cpu_ms'])
+    return statistics.median(cpu), sink.bytes / invocations, sink.lines / invocations
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure logging cost per request for each handler')
+    parser.add_argument('--invocations', type=int, default=200)
+    parser.add_argument('--functions', nargs='+', help='Only measure these functions')
+    parser.add_argument('--budget-us', type=float, help='Fail if any handler spends more than this on logging')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    workload = load_workload()
+    latency = LatencyModel(workload.get('latency'), time_scale=0, seed=7)
+    fakes = install_workload(workload, latency)
+    usage_table = fakes.dynamodb.Table('ApiUsageLimits')
+    pdf_base64 = sample_pdf_base64(workload)
+
+    results = {}
+    for name, spec in workload['requests'].items():
+        if args.functions and name not in args.functions:
+            continue
+        module = load_handler(name)
+        simulate_sleeps(module, latency)
+        measure(module, name, spec, pdf_base64, latency, usage_table, 5)  # warm up
+
+        enabled_ms, log_bytes, log_lines = measure(module, name, spec, pdf_base64, latency, usage_table,
+                                                   args.invocations)
+        logging.disable(logging.CRITICAL)
+        try:
+            disabled_ms, _, _ = measure(module, name, spec, pdf_base64, latency, usage_table, args.invocations)
+        finally:
+            logging.disable(logging.NOTSET)
+
+        results[name] = {
+            'cpu_ms_logging_on': enabled_ms,
+            'cpu_ms_logging_off': disabled_ms,
+            'logging_us': max(0.0, enabled_ms - disabled_ms) * 1000,
+            'log_bytes': log_bytes,
+            'log_lines': log_lines
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'function':<24} {'cpu on ms':>10} {'cpu off ms':>11} {'logging µs':>11} {'lines':>6} {'bytes':>8}")
+        for name, r in results.items():
+            print(f"{name:<24} {r['cpu_ms_logging_on']:>10.2f} {r['cpu_ms_logging_off']:>11.2f} "
+                  f"{r['logging_us']:>11.0f} {r['log_lines']:>6.1f} {r['log_bytes']:>8.0f}")
+
+    if args.budget_us is not None:
+        over = {name: r['logging_us'] for name, r in results.items() if r['logging_us'] > args.budget_us}
+        if over:
+            print(f"\n❌ logging over {args.budget_us:.0f} µs/request: " +
+                  ', '.join(f"{name} ({us:.0f} µs)" for name, us in over.items()))
+            sys.exit(1)
+        print(f"\n✅ every handler within {args.budget_us:.0f} µs/request of logging")
+
+
+if __name__ == '__main__':
+    main()
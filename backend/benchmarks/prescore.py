@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Accuracy, savings and cost of the local pre-scorer in score_resume.
+
+  1. Classifies a labelled set of job descriptions - the recorded ones,
+     shuffled-word variants of them, short but real postings, postings in
+     Cyrillic, Chinese and Japanese, and typical
+     junk (a bare title, lorem ipsum, keyboard mash, repeated words) - and
+     fails on any valid posting rejected. Junk it lets through still gets
+     the model's own validity check, so misses are reported, not failed.
+  2. Replays score_resume with an invalid and a valid job description in
+     both input modes, and reports Bedrock and Textract calls, rate limit
+     counter writes and simulated service time. Invalid ones must use none
+     of them and store nothing, and get the feedback in the response.
+  3. Times the pre-scoring steps and reports the prompt growth from the
+     overlap section.
+
+Usage:
+    python benchmarks/prescore.py [--iterations 2000]
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from harness import (FakeContext, LatencyModel, build_event, install_workload, invoke, load_handler,  # noqa: E402
+                     load_workload, percentile)
+
+SHORT_VALID = [
+    "Barista wanted for weekend shifts at our downtown cafe. You need a year of espresso experience, "
+    "a food hygiene certificate, friendly customer service and availability on Saturdays and Sundays.",
+    "Part-time bookkeeper for a small accounting firm: reconcile bank statements, run payroll in QuickBooks, "
+    "prepare quarterly VAT returns. Two years of bookkeeping experience required.",
+    "Warehouse associate, night shift. Pick and pack orders, operate RF scanners and pallet jacks, "
+    "forklift certification preferred, able to lift 50 lbs.",
+]
+
+# Postings in scripts the keyword tokenizer does not read; the rules must not apply to them
+NON_LATIN_VALID = [
+    "Ищем backend-разработчика в команду платежей. Обязанности: разработка и поддержка сервисов на Python, "
+    "проектирование REST API, работа с PostgreSQL и Kafka. Требования: опыт коммерческой разработки от трёх лет, "
+    "знание Docker и Kubernetes, умение писать тесты. Мы предлагаем удалённую работу и гибкий график.",
+    "招聘高级后端工程师，负责支付平台核心服务的设计、开发与维护。任职要求：计算机相关专业本科及以上学历，"
+    "三年以上Java或Go开发经验，熟悉MySQL、Redis和消息队列，具备良好的沟通能力和团队合作精神。",
+    "営業アシスタント募集。主な業務は見積書と請求書の作成、顧客からの電話・メール対応、営業資料の準備です。"
+    "Excelの基本操作ができる方、事務経験一年以上の方を歓迎します。",
+]
+
+INVALID = [
+    ('too_short', "Software Engineer"),
+    ('too_short', "Senior Product Manager - Remote"),
+    ('too_short', "see attached"),
+    ('too_short', "N/A"),
+    ('too_short', ""),
+    ('placeholder', "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor incididunt "
+                    "ut labore et dolore magna aliqua. Ut enim ad minim veniam, quis nostrud exercitation."),
+    ('placeholder', "test test test test test test test test test test test test test"),
+    ('gibberish', "sdfkjh xcvbnm qwrtplk zxcvbnm hjklmnb sdfghjk wrtpsdf bnmxcvz lkjhgfd ppqrstv zzxcvbn"),
+    ('repetitive', "urgent hiring java developer remote fulltime senior backend spring immediate joiner apply " * 6),
+]
+
+
+def shuffled(text, rng):
+    words = text.split()
+    rng.shuffle(words)
+    return ' '.join(words)
+
+
+def usage_writes(fakes):
+    return sum(int(item.get('request_count', 0)) for item in fakes.dynamodb.Table('ApiUsageLimits').items.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the score_resume pre-scorer')
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+
+    from resume_tailor_core.prescore import check_job_description, keyword_overlap
+
+    workload = load_workload()
+    events = workload['requests']['score_resume']['events']
+    recorded_jds = sorted({event['body']['job_description'] for event in events})
+    resume_text = next(event['body']['resume_text'] for event in events if 'resume_text' in event['body'])
+    rng = random.Random(5)
+
+    # 1. Classification
+    valid = recorded_jds + [shuffled(jd, rng) for jd in recorded_jds for _ in range(5)] + SHORT_VALID + NON_LATIN_VALID
+    false_rejects = [(check_job_description(jd), jd[:40]) for jd in valid if check_job_description(jd)]
+    print(f"{'label':<12} {'verdict':<12} text")
+    missed = 0
+    for label, text in INVALID:
+        verdict = check_job_description(text)
+        missed += verdict is None
+        print(f"{label:<12} {str(verdict):<12} {text[:50]!r}")
+    print(f"\nvalid postings: {len(valid)}, rejected: {len(false_rejects)}; "
+          f"invalid: {len(INVALID)}, let through to the model: {missed}")
+    if false_rejects:
+        print(f"❌ valid job descriptions rejected: {false_rejects}")
+        sys.exit(1)
+
+    # 2. Handler: what an invalid job description no longer costs
+    latency = LatencyModel(workload.get('latency'), time_scale=0)
+    score_resume = load_handler('score_resume')
+    print(f"\n{'mode':<6} {'job description':<16} {'status':>6} {'bedrock':>8} {'textract':>9} "
+          f"{'quota writes':>13} {'io ms':>7} {'cpu ms':>7}")
+    for event_spec in events:
+        mode = 'pdf' if 's3_key' in event_spec['body'] else 'text'
+        for kind, job_description in (('invalid', INVALID[0][1]), ('valid', event_spec['body']['job_description'])):
+            fakes = install_workload(workload, latency)
+            spec = dict(event_spec, body=dict(event_spec['body'], job_description=job_description))
+            textract_calls = []
+            detect = fakes.textract.detect_document_text
+            fakes.textract.detect_document_text = lambda **kw: textract_calls.append(1) or detect(**kw)
+            quota_before = usage_writes(fakes)
+            results_before = len(fakes.dynamodb.Table('ResumeAnalysisResults').items)
+            response, timing = invoke(score_resume, build_event(spec), FakeContext('score_resume'), latency)
+            quota = usage_writes(fakes) - quota_before
+            print(f"{mode:<6} {kind:<16} {response['statusCode']:>6} {fakes.bedrock.calls:>8} "
+                  f"{len(textract_calls):>9} {quota:>13} {timing['io_ms']:>7.0f} {timing['cpu_ms']:>7.2f}")
+            if kind != 'invalid':
+                continue
+            body = json.loads(response['body'])
+            writes = len(fakes.dynamodb.Table('ResumeAnalysisResults').items) - results_before
+            if (response['statusCode'] != 200 or fakes.bedrock.calls or textract_calls or quota or writes
+                    or body['resultId'] is not None or body['score'] != 0 or not body['feedback']):
+                print(f"❌ invalid job description in {mode} mode reached the model or the rate limiter, or was stored")
+                sys.exit(1)
+
+    # 3. Cost of the pre-scoring steps
+    from resume_tailor_core.jd_store import keyword_counts
+
+    job_description = recorded_jds[0]
+    keywords = keyword_counts(job_description)
+    steps = (
+        ('check_job_description', lambda: check_job_description(job_description)),
+        ('keyword_counts (JD store miss)', lambda: keyword_counts(job_description)),
+        ('keyword_overlap', lambda: keyword_overlap(resume_text, keywords)),
+    )
+    print(f"\n{'step':<32} {'p50 us':>8}")
+    for name, step in steps:
+        samples = []
+        for _ in range(args.iterations):
+            start = time.thread_time_ns()
+            step()
+            samples.append((time.thread_time_ns() - start) / 1000)
+        print(f"{name:<32} {percentile(samples, 50):>8.1f}")
+
+    plain = score_resume.format_prompt(resume_text, job_description)
+    with_overlap = score_resume.format_prompt(resume_text, job_description, keyword_overlap(resume_text, keywords))
+    print(f"\nprompt: {len(plain)} -> {len(with_overlap)} chars with the overlap section")
+    print("\n✅ no valid posting rejected; invalid job descriptions skip Textract, Bedrock and the rate limiter")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Size, capacity units and read latency of ResumeAnalysisResults items with
+plain and encoded large attributes.
+
+Text-mode results carry the resume text, the job description and the
+feedback in the item. Encoded items (resume_tailor_core/result_store.py)
+hold those compressed, and move them to S3 when the item would still be too
+big for DynamoDB. For results of realistic sizes this reports:
+
+  - item size as DynamoDB meters it, write capacity units of put_item (one
+    per started KB) and read capacity units of an eventually consistent
+    get_item (0.5 per started 4 KB);
+  - CPU time of encode_result;
+  - get_score CPU time and simulated I/O time (recorded latency model).
+
+It also checks that get_score returns the same body for both encodings,
+including a job description large enough to be offloaded to S3.
+
+Text is made of the recorded job description and feedback, words shuffled,
+so it compresses like new text from the same vocabulary rather than repeats.
+
+Usage:
+    python benchmarks/result_encoding.py [--iterations 500]
+"""
+
+import sys
+import json
+import math
+import time
+import random
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from harness import (FakeContext, LatencyModel, build_event, install_workload, invoke, load_handler,  # noqa: E402
+                     load_workload, percentile)
+from resume_entries_encoding import item_size as wire_item_size, read_units  # noqa: E402
+
+from boto3.dynamodb.types import TypeSerializer  # noqa: E402
+
+MAX_DYNAMODB_ITEM_BYTES = 400 * 1024
+
+# (name, resume text KB, job description KB, feedback points)
+PROFILES = [
+    ('short', 3, 2, 3),
+    ('typical', 8, 6, 5),
+    ('long', 20, 30, 8),
+    ('oversized JD', 8, 1500, 5),  # pasted document; the Lambda payload limit is 6 MB
+]
+
+
+def write_units(size):
+    return math.ceil(size / 1024)
+
+
+def text_of(words, kb, rng):
+    """About kb kilobytes of words, shuffled"""
+    out, size = [], 0
+    while size < kb * 1024:
+        rng.shuffle(words)
+        out.extend(words)
+        size += sum(len(w) + 1 for w in words)
+    return ' '.join(out)[:kb * 1024]
+
+
+def result_item(recorded, resume_kb, jd_kb, feedback_points, rng):
+    words = (recorded['jobDescription'] + ' ' + ' '.join(recorded['feedback'])).split()
+    feedback = [recorded['feedback'][i % len(recorded['feedback'])] for i in range(feedback_points)]
+    return {
+        'resultId': recorded['resultId'],
+        'jobDescription': text_of(list(words), jd_kb, rng),
+        'score': 72,
+        'feedback': feedback,
+        'createdAt': '2025-01-01T00:00:00',
+        'resumeText': text_of(list(words), resume_kb, rng),
+        'inputMode': 'text',
+        'userId': recorded.get('userId', 'user-0001')
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare plain and encoded ResumeAnalysisResults items')
+    parser.add_argument('--iterations', type=int, default=500)
+    args = parser.parse_args()
+
+    from resume_tailor_core import clients
+    from resume_tailor_core.result_store import PAYLOAD_KEY_ATTRIBUTE, encode_result
+
+    workload = load_workload()
+    recorded = workload['tables']['ResumeAnalysisResults'][0]
+    latency = LatencyModel(workload.get('latency'), time_scale=0)
+    fakes = install_workload(workload, latency)
+    table = fakes.dynamodb.Table('ResumeAnalysisResults')
+    clients.set_table('ResumeAnalysisResults', table)
+    clients.set_client('s3', fakes.s3)
+    module = load_handler('get_score')
+    event = build_event(workload['requests']['get_score']['events'][0])
+    serializer = TypeSerializer()
+    rng = random.Random(7)
+
+    print(f"{'profile':<13} {'encoding':<9} {'item bytes':>11} {'WCU':>4} {'RCU':>5} "
+          f"{'encode p50 us':>14} {'get_score cpu ms':>17} {'io ms':>6}")
+    for name, resume_kb, jd_kb, feedback_points in PROFILES:
+        plain = result_item(recorded, resume_kb, jd_kb, feedback_points, rng)
+        encode_us = []
+        for _ in range(args.iterations):
+            start = time.thread_time_ns()
+            encoded = encode_result(plain, s3=fakes.s3)
+            encode_us.append((time.thread_time_ns() - start) / 1000)
+
+        bodies = {}
+        for encoding, item, encode_p50 in (('plain', plain, 0.0), ('encoded', encoded, percentile(encode_us, 50))):
+            size = wire_item_size({k: serializer.serialize(v) for k, v in item.items()})
+            row = f"{name:<13} {encoding:<9} {size:>11} {write_units(size):>4} {read_units(size):>5} {encode_p50:>14.1f}"
+            if size > MAX_DYNAMODB_ITEM_BYTES:
+                print(f"{row} {'rejected: over 400 KB':>24}")
+                continue
+            table.items.clear()
+            fakes.dynamodb.seed('ResumeAnalysisResults', [item])
+            cpu, io = [], []
+            for _ in range(max(1, args.iterations // 10)):
+                response, timing = invoke(module, event, FakeContext('get_score'), latency)
+                cpu.append(timing['cpu_ms'])
+                io.append(timing['io_ms'])
+            if response['statusCode'] != 200:
+                print(f"❌ get_score returned {response['statusCode']} for {name} ({encoding})")
+                sys.exit(1)
+            bodies[encoding] = json.loads(response['body'])
+            print(f"{row} {percentile(cpu, 50):>17.3f} {percentile(io, 50):>6.0f}")
+
+        expected = {'fileContent': plain['resumeText'], 'jobDescription': plain['jobDescription'],
+                    'feedback': plain['feedback'], 'score': '72'}
+        if any(bodies['encoded'][k] != v for k, v in expected.items()):
+            print(f"❌ {name} does not round-trip through the encoded item")
+            sys.exit(1)
+        if 'plain' in bodies and bodies['plain'] != bodies['encoded']:
+            print(f"❌ {name} reads differently from plain and encoded items")
+            sys.exit(1)
+        if name == 'oversized JD' and PAYLOAD_KEY_ATTRIBUTE not in encoded:
+            print("❌ oversized result was not offloaded to S3")
+            sys.exit(1)
+
+    print("\n✅ encoded results read back the same as plain ones; oversized results are offloaded to S3")
+
+
+if __name__ == '__main__':
+    main()
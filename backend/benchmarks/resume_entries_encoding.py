@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Size and read cost of master resume entries in the legacy and compact
+ResumeMetadata encodings.
+
+Legacy items hold `entries` as a nested list of maps; compact items hold one
+compressed JSON Binary attribute (resume_tailor_core/resume_store.py). For
+the recorded master resume, and longer resumes made of --scale copies of it,
+this reports:
+
+  - item size as DynamoDB meters it, and the read capacity units of an
+    eventually consistent get_item (0.5 per started 4 KB);
+  - CPU time to turn the wire-format item into Python entries - boto3's
+    TypeDeserializer for the legacy map, TypeDeserializer plus unpack_json
+    for the compact blob.
+
+It also checks that both encodings decode to the same entries, and that
+load_master migrates a legacy item in place.
+
+Copies beyond the first have the words of each field shuffled, so they
+compress like new text from the same vocabulary rather than repeats.
+
+Usage:
+    python benchmarks/resume_entries_encoding.py [--scale 1 4 8] [--iterations 2000]
+"""
+
+import sys
+import math
+import time
+import random
+import argparse
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from harness import LatencyModel, install_workload, load_workload, percentile  # noqa: E402
+
+from boto3.dynamodb.types import Binary, TypeDeserializer, TypeSerializer  # noqa: E402
+
+
+def attribute_size(value):
+    """Size of one AttributeValue, per the DynamoDB item size rules"""
+    (kind, inner), = value.items()
+    if kind == 'S':
+        return len(inner.encode('utf-8'))
+    if kind == 'N':
+        digits = inner.lstrip('-').replace('.', '').lstrip('0') or '0'
+        return math.ceil(len(digits) / 2) + 1
+    if kind == 'B':
+        return len(bytes(inner.value if isinstance(inner, Binary) else inner))
+    if kind in ('BOOL', 'NULL'):
+        return 1
+    if kind == 'M':
+        return 3 + sum(len(k.encode('utf-8')) + attribute_size(v) + 1 for k, v in inner.items())
+    if kind == 'L':
+        return 3 + sum(attribute_size(v) + 1 for v in inner)
+    raise ValueError(kind)
+
+
+def item_size(wire_item):
+    return sum(len(name.encode('utf-8')) + attribute_size(value) for name, value in wire_item.items())
+
+
+def read_units(size):
+    return math.ceil(size / 4096) * 0.5
+
+
+def longer_resume(entries, scale, seed=7):
+    """scale copies of entries, words shuffled within each copy's text so copies don't compress away"""
+    rng = random.Random(seed)
+    result = list(entries)
+    for _ in range(scale - 1):
+        for entry in entries:
+            copy = {}
+            for key, value in entry.items():
+                words = value.split(' ') if isinstance(value, str) else value
+                if isinstance(value, str) and key != 'type':
+                    rng.shuffle(words)
+                    value = ' '.join(words)
+                copy[key] = value
+            result.append(copy)
+    return result
+
+
+def time_decode(decode, wire_item, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.thread_time_ns()
+        decode(wire_item)
+        samples.append((time.thread_time_ns() - start) / 1000)
+    return percentile(samples, 50)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare legacy and compact ResumeMetadata entries')
+    parser.add_argument('--scale', type=int, nargs='+', default=[1, 4, 8],
+                        help='Copies of the recorded entries per resume')
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+
+    from resume_tailor_core.resume_store import decode_entries, load_master, master_item
+
+    workload = load_workload()
+    recorded = workload['tables']['ResumeMetadata'][0]
+    serializer, deserializer = TypeSerializer(), TypeDeserializer()
+
+    def deserialize(wire_item):
+        return {name: deserializer.deserialize(value) for name, value in wire_item.items()}
+
+    print(f"{'entries':>8} {'encoding':<9} {'item bytes':>11} {'RCU':>5} {'decode p50 us':>14}")
+    for scale in args.scale:
+        entries = longer_resume(recorded['entries'], scale)
+        legacy = dict(recorded, entries=entries, updatedAt='2025-01-01T00:00:00')
+        compact = master_item(recorded['resume_id'], recorded['s3_key'], entries, '2025-01-01T00:00:00')
+        for name, item in (('legacy', legacy), ('compact', compact)):
+            wire = {key: serializer.serialize(value) for key, value in item.items()}
+            size = item_size(wire)
+            decode_us = time_decode(lambda w: decode_entries(deserialize(w)), wire, args.iterations)
+            print(f"{len(entries):>8} {name:<9} {size:>11} {read_units(size):>5} {decode_us:>14.1f}")
+            if decode_entries(deserialize(wire)) != [
+                {k: (int(v) if isinstance(v, Decimal) else v) for k, v in e.items()} for e in entries
+            ]:
+                print(f"❌ {name} entries do not round-trip")
+                sys.exit(1)
+
+    # A legacy item is returned as-is and rewritten compactly on first read
+    fakes = install_workload(workload, LatencyModel(workload.get('latency'), time_scale=0))
+    table = fakes.dynamodb.Table('ResumeMetadata')
+    loaded = load_master(recorded['resume_id'], table=table)
+    stored = table.items[(recorded['resume_id'],)]
+    if loaded['entries'] != recorded['entries'] or 'entries' in stored or 'entriesBlob' not in stored:
+        print("❌ legacy item was not migrated")
+        sys.exit(1)
+    if load_master(recorded['resume_id'], table=table)['entries'] != recorded['entries']:
+        print("❌ migrated item reads back differently")
+        sys.exit(1)
+    print("\n✅ both encodings decode to the same entries; legacy items migrate on first read")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Duplicate-burst benchmark for the single-flight layer.
+
+Sends bursts of identical concurrent requests (a double submit or client
+retries) to score_resume and tailor_master_resume, each burst from a
+different user, with single-flight on and then off. Reports per function:
+Bedrock calls, Bedrock quota charged, status codes and latency. With
+single-flight on, each burst should cost one model call and one unit of
+quota, and every duplicate should get the leader's response. Then checks
+that a failed request's retry runs again rather than waiting on its claim,
+and that a claim table that cannot be written does not fail requests and
+emits the SingleFlight bypass metric.
+
+Service latency and the single-flight poll interval are both compressed by
+--time-scale; reported latencies are converted back to real time.
+
+Usage:
+    python benchmarks/single_flight.py [--bursts 20] [--burst-size 3]
+"""
+
+import io
+import sys
+import json
+import argparse
+import threading
+import contextlib
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from harness import (FakeContext, LatencyModel, build_event, install_workload, invoke, load_handler,  # noqa: E402
+                     load_workload, percentile, sample_pdf_base64, silenced)
+from load_test import personalize, seed_population, user_population  # noqa: E402
+
+FUNCTIONS = ('score_resume', 'tailor_master_resume')
+
+
+def run(workload, args, enabled):
+    from resume_tailor_core import single_flight
+
+    latency = LatencyModel(workload.get('latency'), time_scale=args.time_scale, seed=args.seed)
+    users = user_population(args.bursts)
+    fakes = install_workload(seed_population(workload, users), latency)
+    pdf_base64 = sample_pdf_base64(workload)
+
+    single_flight.SINGLE_FLIGHT_ENABLED = enabled
+    single_flight.POLL_SECONDS = 0.5 * args.time_scale
+    single_flight.MAX_WAIT_SECONDS = 20 * args.time_scale
+    modules = {name: load_handler(name) for name in FUNCTIONS}
+
+    results = {}
+    for name in FUNCTIONS:
+        spec = workload['requests'][name]['events'][0]
+        calls_before = fakes.bedrock.calls
+        samples = []
+        lock = threading.Lock()
+
+        def send(user):
+            user_id, source_ip = user
+            event = build_event(personalize(spec, user_id, source_ip), pdf_base64)
+            response, timing = invoke(modules[name], event, FakeContext(name), latency, quiet=False)
+            flight = (response.get('headers') or {}).get('X-Single-Flight')
+            if flight:
+                # A follower's wall time is spent waiting on the leader's scaled service calls
+                real_ms = timing['wall_ms'] / args.time_scale
+            else:
+                real_ms = timing['wall_ms'] + timing['io_ms'] * (1 - args.time_scale)
+            with lock:
+                samples.append((response['statusCode'], real_ms, flight))
+
+        with silenced(), ThreadPoolExecutor(max_workers=args.burst_size * 4) as executor:
+            list(executor.map(send, [user for user in users for _ in range(args.burst_size)]))
+
+        usage = fakes.dynamodb.Table('ApiUsageLimits').items.values()
+        charged = sum(int(item['request_count']) for item in usage
+                      if item['date_service'].endswith('#bedrock_requests'))
+        statuses = defaultdict(int)
+        for status, _, _ in samples:
+            statuses[str(status)] += 1
+        latencies = [ms for _, ms, _ in samples]
+        results[name] = {
+            'requests': len(samples),
+            'bedrock_calls': fakes.bedrock.calls - calls_before,
+            'quota_charged': charged,
+            'shared_responses': sum(1 for _, _, flight in samples if flight and flight.startswith('follower')),
+            'statuses': dict(statuses),
+            'p50_ms': percentile(latencies, 50),
+            'p95_ms': percentile(latencies, 95)
+        }
+        for item in usage:
+            item['request_count'] = 0  # count the next function's quota on its own
+    return results
+
+
+def check_failures(workload, args):
+    """
+    A failed request releases its claim, so an identical retry runs again
+    instead of waiting out the lease; a claim table that cannot be written
+    runs the handler without deduplication. Returns a list of failures.
+    """
+    from fakes import client_error
+    from resume_tailor_core import single_flight
+
+    latency = LatencyModel(workload.get('latency'), time_scale=0, seed=args.seed)
+    fakes = install_workload(workload, latency)
+    single_flight.SINGLE_FLIGHT_ENABLED = True
+    tailor = load_handler('tailor_master_resume')
+    spec = workload['requests']['tailor_master_resume']['events'][0]
+    failures = []
+
+    # No master resume for this user: a 404, twice, rather than a 404 then a 409
+    orphan = personalize(spec, 'user-9999', '203.0.113.250')
+    statuses = [invoke(tailor, build_event(orphan), FakeContext('tailor_master_resume'), latency)[0]['statusCode']
+                for _ in range(2)]
+    if statuses != [404, 404]:
+        failures.append(f"a failed request's retry returned {statuses[1]}")
+
+    # Claims cannot be written (e.g. a missing IAM permission): the handler still runs
+    usage = fakes.dynamodb.Table('ApiUsageLimits')
+    put_item = usage.put_item
+
+    def denied_put_item(**kwargs):
+        if kwargs.get('Item', {}).get('identifier', '').startswith(single_flight.FLIGHT_PREFIX):
+            raise client_error('AccessDeniedException', 'PutItem')
+        return put_item(**kwargs)
+
+    usage.put_item = denied_put_item
+    calls = fakes.bedrock.calls
+    captured = io.StringIO()
+    with contextlib.redirect_stdout(captured), contextlib.redirect_stderr(captured):
+        response, _ = invoke(tailor, build_event(spec), FakeContext('tailor_master_resume'), latency, quiet=False)
+    usage.put_item = put_item
+    if response['statusCode'] != 200 or fakes.bedrock.calls != calls + 1:
+        failures.append(f"an unwritable claim table returned {response['statusCode']}")
+    # The bypass is what to alarm on: its metric must reach the flushed EMF block
+    bypass_metrics = [line for line in captured.getvalue().splitlines()
+                      if '"_aws"' in line and json.loads(line).get('role') == 'bypass']
+    if not bypass_metrics:
+        failures.append('a bypassed claim emitted no SingleFlight bypass metric')
+
+    print(f"failed request retried: {statuses}; claim table denied: {response['statusCode']}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure single-flight deduplication under duplicate bursts')
+    parser.add_argument('--bursts', type=int, default=20, help='Distinct users, one burst each')
+    parser.add_argument('--burst-size', type=int, default=3, help='Identical requests per burst')
+    parser.add_argument('--time-scale', type=float, default=0.01,
+                        help='Fraction of recorded service latency actually slept')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    workload = load_workload()
+    report = {'off': run(workload, args, enabled=False), 'on': run(workload, args, enabled=True)}
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{args.bursts} bursts of {args.burst_size} identical requests per function\n")
+    print(f"{'function':<22} {'single-flight':<14} {'bedrock':>8} {'quota':>6} {'shared':>7} "
+          f"{'p50 ms':>8} {'p95 ms':>8}  statuses")
+    for name in FUNCTIONS:
+        for mode in ('off', 'on'):
+            r = report[mode][name]
+            statuses = ' '.join(f"{code}:{count}" for code, count in sorted(r['statuses'].items()))
+            print(f"{name:<22} {mode:<14} {r['bedrock_calls']:>8} {r['quota_charged']:>6} {r['shared_responses']:>7} "
+                  f"{r['p50_ms']:>8.0f} {r['p95_ms']:>8.0f}  {statuses}")
+
+    print()
+    failures = check_failures(workload, args)
+    if failures:
+        print(f"\n❌ {'; '.join(failures)}")
+        sys.exit(1)
+    print("\n✅ failed requests release their claim; dedup failures fall back to running the handler")
+
+
+if __name__ == '__main__':
+    main()
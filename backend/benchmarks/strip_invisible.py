@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Equivalence check and benchmark for json_parser.strip_invisible_characters.
+
+The stripper uses a table of Cc/Cf code points compiled into one regex:
+precomputed for the Unicode versions of the supported runtimes, derived
+from unicodedata at import on any other. This script checks it against the
+per-character unicodedata.category implementation it replaced:
+
+  1. exhaustively, over every code point, which also catches drift between
+     the precomputed table and the runtime's Unicode database (run it under
+     each supported Python version to check its precomputed table);
+  2. property-style, over random strings mixing ASCII, whitespace, control,
+     format, astral and combining characters;
+
+and then times both (plus a str.translate variant) on the recorded model
+responses and on a long non-ASCII feedback string.
+
+Usage:
+    python benchmarks/strip_invisible.py [--cases 20000] [--repeat 50]
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+import unicodedata
+from pathlib import Path
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCHMARKS_DIR.parent / 'lambdas'))
+
+from resume_tailor_core import json_parser  # noqa: E402
+from resume_tailor_core.json_parser import strip_invisible_characters  # noqa: E402
+
+KEPT = '\t\n\r'
+
+
+def reference(text):
+    """The per-character implementation the table replaced"""
+    return ''.join(char for char in text if char in KEPT or unicodedata.category(char) not in ('Cc', 'Cf'))
+
+
+_TRANSLATE_TABLE = {
+    code_point: None
+    for start, end in json_parser._INVISIBLE_RANGES
+    for code_point in range(start, end + 1)
+}
+
+
+def translate_variant(text):
+    return text.translate(_TRANSLATE_TABLE)
+
+
+def check_exhaustive():
+    """Every code point, alone and between letters, strips the same way"""
+    mismatches = []
+    for code_point in range(0x110000):
+        if 0xD800 <= code_point <= 0xDFFF:
+            continue  # lone surrogates cannot appear in decoded model output
+        text = f'a{chr(code_point)}b'
+        if strip_invisible_characters(text) != reference(text):
+            mismatches.append(code_point)
+    return mismatches
+
+
+def random_text(rng, length):
+    invisible = [chr(c) for start, end in json_parser._INVISIBLE_RANGES for c in range(start, min(end, start + 3) + 1)]
+    pools = [
+        lambda: chr(rng.randrange(0x20, 0x7F)),                # printable ASCII
+        lambda: rng.choice(KEPT + ' '),                         # JSON whitespace
+        lambda: rng.choice(invisible),                          # Cc / Cf
+        lambda: chr(rng.randrange(0xA0, 0x3000)),               # BMP letters, symbols, combining marks
+        lambda: chr(rng.randrange(0x1F300, 0x1FAFF)),           # emoji
+        lambda: rng.choice('"{}[],:\\'),                        # JSON punctuation
+    ]
+    weights = [50, 10, 10, 15, 5, 10]
+    return ''.join(rng.choices(pools, weights)[0]() for _ in range(length))
+
+
+def check_random(cases, seed):
+    rng = random.Random(seed)
+    for _ in range(cases):
+        text = random_text(rng, rng.randrange(0, 200))
+        if not text.isascii() and rng.random() < 0.2:
+            text = text.encode('ascii', 'ignore').decode()  # exercise the ASCII fast path too
+        if strip_invisible_characters(text) != reference(text):
+            return text
+    return None
+
+
+def time_per_byte(function, texts, repeat):
+    total_bytes = sum(len(t.encode('utf-8')) for t in texts)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            function(text)
+    return (time.perf_counter() - start) * 1e9 / (total_bytes * repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check and benchmark invisible-character stripping')
+    parser.add_argument('--cases', type=int, default=20000, help='Random strings to compare')
+    parser.add_argument('--repeat', type=int, default=50, help='Timing passes')
+    parser.add_argument('--seed', type=int, default=11)
+    args = parser.parse_args()
+
+    source = ('precomputed' if unicodedata.unidata_version in json_parser._INVISIBLE_RANGES_ADDED
+              else f"derived at import, precomputed for {', '.join(json_parser._INVISIBLE_RANGES_ADDED)}")
+    print(f"Unicode database {unicodedata.unidata_version}: table {source}")
+    mismatches = check_exhaustive()
+    if mismatches:
+        print(f"❌ {len(mismatches)} code points differ from unicodedata, first: "
+              f"{', '.join(f'U+{c:04X}' for c in mismatches[:10])}")
+    else:
+        print("✅ every code point matches the reference")
+
+    failure = check_random(args.cases, args.seed)
+    if failure is not None:
+        print(f"❌ random case differs: {failure!r}")
+    else:
+        print(f"✅ {args.cases} random strings match the reference")
+
+    with open(BENCHMARKS_DIR / 'workloads' / 'bedrock_outputs.jsonl', encoding='utf-8') as f:
+        corpus = [json.loads(line)['raw'] for line in f if line.strip()]
+    feedback = ('Your experience with distributed systems — especially the DynamoDB work — is “directly” relevant. ' * 200)
+    workloads = {'recorded responses': corpus, 'long non-ASCII feedback': [feedback]}
+
+    print(f"\n{'input':<26} {'reference':>10} {'translate':>10} {'regex':>10} {'speedup':>8}   (ns/byte)")
+    for name, texts in workloads.items():
+        ref = time_per_byte(reference, texts, args.repeat)
+        trans = time_per_byte(translate_variant, texts, args.repeat)
+        regex = time_per_byte(strip_invisible_characters, texts, args.repeat)
+        print(f"{name:<26} {ref:>10.1f} {trans:>10.1f} {regex:>10.1f} {ref / regex:>7.0f}x")
+
+    if mismatches or failure is not None:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
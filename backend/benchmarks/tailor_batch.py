@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Batch tailoring of the master resume against many job descriptions,
+compared with one tailor_master_resume request per job description.
+
+Reports ResumeMetadata reads, Bedrock calls and the time to tailor --jobs
+postings with the recorded service latencies (sleeping --time-scale of
+them), and the bytes the dashboard reads while polling the batch status
+with If-None-Match. Checks that:
+
+  - every job's result is stored and get_tailor_batch returns it;
+  - polling a status that has not changed gets a 304;
+  - the status item counts completed and failed jobs (one model response
+    is made unparseable);
+  - a repeated delivery of the worker event tailors nothing again;
+  - jobs past the daily Bedrock limit are reported instead of queued;
+  - another user cannot read the batch;
+  - a worker about to run out of time stops starting jobs and marks the
+    batch failed, and a batch whose worker died is reported as failed.
+
+Usage:
+    python benchmarks/tailor_batch.py [--jobs 8] [--concurrency 4] [--poll-seconds 2] [--time-scale 0.02]
+"""
+
+import sys
+import json
+import time
+import argparse
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from harness import (FakeContext, LatencyModel, build_event, install_workload, invoke, load_handler,  # noqa: E402
+                     load_workload, run_async_invocations, silenced)
+
+USER_ID = 'user-0001'
+BROKEN_MARKER = 'Posting 001'
+
+
+class CountingGets:
+    """Counts get_item calls on a fake table"""
+
+    def __init__(self, table):
+        self.calls = 0
+        original = table.get_item
+
+        def get_item(**kwargs):
+            self.calls += 1
+            return original(**kwargs)
+
+        table.get_item = get_item
+
+
+def poll(get_tailor_batch, latency, query, etag=None, user_id=USER_ID, quiet=True):
+    event = build_event({'query': query, 'method': 'GET', 'user_id': user_id})
+    if etag:
+        event['headers']['If-None-Match'] = etag
+    response, _ = invoke(get_tailor_batch, event, FakeContext('get_tailor_batch'), latency, quiet)
+    return response
+
+
+def poll_until_done(get_tailor_batch, latency, batch_id, interval, done):
+    """Poll as the dashboard does, with If-None-Match; returns [(status code, body bytes)]"""
+    etag, polls = None, []
+    while True:
+        finished = done.is_set()
+        response = poll(get_tailor_batch, latency, {'batchId': batch_id}, etag, quiet=False)
+        etag = response['headers']['ETag']
+        polls.append((response['statusCode'], len(response.get('body') or '')))
+        if finished:
+            return polls
+        done.wait(interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare batch tailoring with one tailor request per job description')
+    parser.add_argument('--jobs', type=int, default=8)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--time-scale', type=float, default=0.02)
+    parser.add_argument('--poll-seconds', type=float, default=2)
+    args = parser.parse_args()
+
+    workload = load_workload()
+    spec = workload['requests']['tailor_master_resume']['events'][0]
+    recorded_jd = spec['body']['jobDescription']
+    job_descriptions = [f"Posting {i:03d}\n\n{recorded_jd}" for i in range(args.jobs)]
+
+    def setup():
+        latency = LatencyModel(workload.get('latency'), time_scale=args.time_scale, seed=1)
+        fakes = install_workload(workload, latency)
+        responder = fakes.bedrock.responder
+        # One posting gets a response that is not JSON
+        fakes.bedrock.responder = lambda prompt: 'Sorry, I cannot help.' if BROKEN_MARKER in prompt else responder(prompt)
+        return fakes, latency, CountingGets(fakes.dynamodb.Table('ResumeMetadata'))
+
+    # One tailor_master_resume request per job description
+    fakes, latency, master_reads = setup()
+    tailor = load_handler('tailor_master_resume')
+    start = time.perf_counter()
+    for job_description in job_descriptions:
+        event = build_event(dict(spec, body={'jobDescription': job_description}))
+        invoke(tailor, event, FakeContext('tailor_master_resume'), latency)
+    baseline = (master_reads.calls, fakes.bedrock.calls, (time.perf_counter() - start) / args.time_scale)
+
+    # One batch, with the dashboard polling its status every --poll-seconds of simulated time
+    fakes, latency, master_reads = setup()
+    tailor_batch, get_tailor_batch = load_handler('tailor_batch'), load_handler('get_tailor_batch')
+    start = time.perf_counter()
+    event = build_event({'body': {'jobDescriptions': job_descriptions, 'concurrency': args.concurrency},
+                         'user_id': USER_ID})
+    response, _ = invoke(tailor_batch, event, FakeContext('tailor_batch'), latency)
+    if response['statusCode'] != 202:
+        print(f"❌ tailor_batch returned {response['statusCode']}: {response.get('body')}")
+        sys.exit(1)
+    batch_id = json.loads(response['body'])['batchId']
+    worker_event = fakes.lambda_.invocations[0]
+    done, polls = threading.Event(), []
+    poller = threading.Thread(target=lambda: polls.extend(
+        poll_until_done(get_tailor_batch, latency, batch_id, args.poll_seconds * args.time_scale, done)))
+    with silenced():
+        poller.start()
+        ran = run_async_invocations(fakes, latency, quiet=False)
+        done.set()
+        poller.join()
+    batched = (master_reads.calls, fakes.bedrock.calls, (time.perf_counter() - start) / args.time_scale)
+
+    print(f"{args.jobs} job descriptions, concurrency {args.concurrency}\n")
+    print(f"{'':<28} {'master reads':>13} {'bedrock':>8} {'time s':>8}")
+    for name, (reads, bedrock, seconds) in (('one request per JD', baseline), ('batch', batched)):
+        print(f"{name:<28} {reads:>13} {bedrock:>8} {seconds:>8.1f}")
+
+    final = poll(get_tailor_batch, latency, {'batchId': batch_id})
+    status = json.loads(final['body'])
+    polled_bytes = sum(size for _, size in polls)
+    print(f"\nstatus polls every {args.poll_seconds:g} s: {len(polls)}, {sum(code == 304 for code, _ in polls)} answered 304, "
+          f"{polled_bytes} response bytes ({len(final['body']) * len(polls)} without If-None-Match)")
+
+    failures = []
+    if len(ran) != 1 or json.loads(ran[0][1]['body'])['status'] != 'complete':
+        failures.append('worker did not complete')
+    if status['status'] != 'complete' or status['completed'] != args.jobs - 1 or status['failed'] != 1:
+        failures.append(f"status counts {status['completed']}/{status['failed']}")
+    for job in status['jobs']:
+        result = poll(get_tailor_batch, latency, {'batchId': batch_id, 'index': str(job['index'])})
+        expected = 404 if job['state'] == 'failed' else 200
+        if result['statusCode'] != expected:
+            failures.append(f"result {job['index']} returned {result['statusCode']}")
+        elif expected == 200 and not json.loads(result['body'])['resumeItems']:
+            failures.append(f"result {job['index']} is empty")
+    if any(code not in (200, 304) for code, _ in polls):
+        failures.append('a status poll failed')
+    if poll(get_tailor_batch, latency, {'batchId': batch_id}, final['headers']['ETag'])['statusCode'] != 304:
+        failures.append('an unchanged status was sent again')
+    if batched[0] != 2:
+        failures.append(f"{batched[0]} master reads (expected the request's check and the worker's load)")
+
+    # A repeated delivery of the worker event is skipped
+    calls = fakes.bedrock.calls
+    replay, _ = invoke(tailor_batch, worker_event[1], FakeContext('tailor_batch'), latency)
+    if json.loads(replay['body'])['status'] != 'skipped' or fakes.bedrock.calls != calls:
+        failures.append('repeated worker event tailored again')
+
+    # Another user cannot read it
+    if poll(get_tailor_batch, latency, {'batchId': batch_id}, user_id='user-9999')['statusCode'] != 404:
+        failures.append("another user's ID read the batch")
+
+    # Near the daily limit (50 for users): 2 requests left, 5 job descriptions sent
+    from resume_tailor_core.rate_limiter import create_rate_limiter
+    rate_limiter = create_rate_limiter()
+    while rate_limiter.get_usage_stats(USER_ID, 'bedrock_requests')[0] < 48:
+        rate_limiter.check_and_increment_usage(USER_ID, 'user', 'bedrock_requests')
+    extra = [f"Posting {i:03d} (extra)\n\n{recorded_jd}" for i in range(5)]
+    response, _ = invoke(tailor_batch, build_event({'body': {'jobDescriptions': extra}, 'user_id': USER_ID}),
+                         FakeContext('tailor_batch'), latency)
+    body = json.loads(response['body'])
+    queued, limited = len(body.get('jobs', [])), len(body.get('rateLimited', []))
+    print(f"2 requests left, 5 job descriptions: {queued} queued, {limited} reported as rate limited")
+    if (queued, limited) != (2, 3):
+        failures.append('jobs past the daily limit were queued')
+
+    # A worker with too little time left for the second wave of jobs
+    from datetime import datetime, timedelta
+    from resume_tailor_core.tailor_store import TIMED_OUT, WORKER_TIMEOUT_SECONDS, batch_key
+    fakes, latency, _ = setup()
+    tailor_batch = load_handler('tailor_batch')
+    event = build_event({'body': {'jobDescriptions': job_descriptions, 'concurrency': args.concurrency},
+                         'user_id': USER_ID})
+    batch_id = json.loads(invoke(tailor_batch, event, FakeContext('tailor_batch'), latency)[0]['body'])['batchId']
+    reserve_seconds = tailor_batch.TIME_RESERVE_MS / 1000
+    with silenced():
+        ran = run_async_invocations(fakes, latency, quiet=False, timeout_seconds=reserve_seconds + 2)
+    status = json.loads(poll(get_tailor_batch, latency, {'batchId': batch_id})['body'])
+    states = [job['state'] for job in status['jobs']]
+    print(f"worker with {reserve_seconds + 2:g} s: status {status['status']}, {states.count('done')} done, "
+          f"{sum(job['error'] == TIMED_OUT for job in status['jobs'])} not started, {states.count('pending')} pending")
+    if (json.loads(ran[0][1]['body'])['status'] != 'failed' or status['status'] != 'failed'
+            or status['error'] != TIMED_OUT or 'pending' in states or 'done' not in states):
+        failures.append('a worker running out of time left the batch unfinished')
+
+    # A worker killed at the Lambda timeout never marks its batch finished
+    response, _ = invoke(tailor_batch, event, FakeContext('tailor_batch'), latency)
+    batch_id = json.loads(response['body'])['batchId']
+    fakes.lambda_.invocations.clear()
+    started = (datetime.now() - timedelta(seconds=WORKER_TIMEOUT_SECONDS + 60)).isoformat()
+    fakes.dynamodb.Table('TailoredResumes').update_item(
+        Key={'userId': USER_ID, 'tailorId': batch_key(batch_id)},
+        UpdateExpression='SET #status = :running, startedAt = :started',
+        ExpressionAttributeNames={'#status': 'status'},
+        ExpressionAttributeValues={':running': 'running', ':started': started}
+    )
+    status = json.loads(poll(get_tailor_batch, latency, {'batchId': batch_id})['body'])
+    print(f"worker killed {WORKER_TIMEOUT_SECONDS + 60} s ago: status {status['status']}, "
+          f"jobs {sorted(set(job['state'] for job in status['jobs']))}")
+    if status['status'] != 'failed' or any(job['state'] != 'failed' for job in status['jobs']):
+        failures.append('a batch whose worker died is still reported as running')
+
+    if failures:
+        print(f"\n❌ {'; '.join(failures)}")
+        sys.exit(1)
+    print("\n✅ master entries read once per batch; results stored and fetchable; unchanged status polls answered 304; "
+          "timed-out batches end as failed")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Cached tailorings: repeat tailor_master_resume requests against stored
+results keyed by master resume version, job description hash and prompt
+version.
+
+Runs a sequence of requests for one user and reports, for each, whether it
+was served from the cache, the Bedrock calls and daily quota it cost and its
+simulated service time. Checks that:
+
+  - a repeat of the same job description, as text (with different
+    whitespace) or by jdHash, returns the stored result without calling
+    Bedrock or charging the quota;
+  - uploading a new master resume with process_master_resume, or bumping
+    PROMPT_VERSION, makes the next request tailor again;
+  - another user's identical request is not served from this user's cache;
+  - a batch only charges, and only calls Bedrock for, job descriptions that
+    are not cached;
+  - a job cached when its batch was queued but gone when the worker runs is
+    charged then, or fails if the user is out of quota.
+
+Usage:
+    python benchmarks/tailor_cache.py
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from harness import (FakeContext, LatencyModel, build_event, install_workload, invoke, load_handler,  # noqa: E402
+                     load_workload, run_async_invocations, sample_pdf_base64)
+
+USER_ID = 'user-0001'
+OTHER_USER_ID = 'user-0002'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Repeat tailoring requests against the tailoring cache')
+    parser.parse_args()
+
+    from resume_tailor_core import single_flight, tailor_store
+    from resume_tailor_core.rate_limiter import create_rate_limiter
+
+    # Single-flight shares a response with identical requests for RESULT_SECONDS;
+    # turn it off so every repeat reaches the handler and its cache
+    single_flight.SINGLE_FLIGHT_ENABLED = False
+
+    workload = load_workload()
+    spec = workload['requests']['tailor_master_resume']['events'][0]
+    job_description = spec['body']['jobDescription']
+    latency = LatencyModel(workload.get('latency'), time_scale=0, seed=1)
+    fakes = install_workload(workload, latency)
+    master = dict(workload['tables']['ResumeMetadata'][0], resume_id=OTHER_USER_ID)
+    fakes.dynamodb.seed('ResumeMetadata', [master])
+    rate_limiter = create_rate_limiter()
+    tailor = load_handler('tailor_master_resume')
+    process = load_handler('process_master_resume')
+
+    def usage(user_id=USER_ID):
+        return rate_limiter.get_usage_stats(user_id, 'bedrock_requests')[0]
+
+    rows, failures = [], []
+
+    def step(name, body, expect_cached, user_id=USER_ID):
+        bedrock, charged = fakes.bedrock.calls, usage(user_id)
+        event = build_event({'body': body, 'user_id': user_id})
+        response, timing = invoke(tailor, event, FakeContext('tailor_master_resume'), latency)
+        result = json.loads(response['body'])
+        row = (name, response['statusCode'], result.get('cached'), fakes.bedrock.calls - bedrock,
+               usage(user_id) - charged, timing['io_ms'])
+        rows.append(row)
+        if response['statusCode'] != 200:
+            failures.append(f"{name}: {response['statusCode']}")
+        elif result['cached'] != expect_cached or (row[3], row[4]) != ((0, 0) if expect_cached else (1, 1)):
+            failures.append(f"{name}: cached={result['cached']}, {row[3]} Bedrock calls, {row[4]} quota")
+        return result
+
+    first = step('first request', {'jobDescription': job_description}, False)
+    repeat = step('same text', {'jobDescription': job_description}, True)
+    if repeat['resumeItems'] != first['resumeItems'] or repeat['jdHash'] != first['jdHash']:
+        failures.append('the cached result differs from the tailored one')
+    step('same text, other whitespace', {'jobDescription': '\u200b  ' + job_description.replace('\n\n', '\n \n\n') + '\n'},
+         True)
+    step('by jdHash', {'jdHash': first['jdHash']}, True)
+    step('same text, other user', {'jobDescription': job_description}, False, user_id=OTHER_USER_ID)
+
+    upload = build_event(workload['requests']['process_master_resume']['events'][0], sample_pdf_base64(workload))
+    response, _ = invoke(process, upload, FakeContext('process_master_resume'), latency)
+    if response['statusCode'] != 200:
+        failures.append(f"process_master_resume returned {response['statusCode']}")
+    step('after a new master upload', {'jobDescription': job_description}, False)
+    step('repeat after the upload', {'jobDescription': job_description}, True)
+
+    tailor_store.PROMPT_VERSION += 1
+    step('after a prompt version bump', {'jdHash': first['jdHash']}, False)
+    step('repeat after the bump', {'jdHash': first['jdHash']}, True)
+
+    print(f"{'request':<30} {'status':>6} {'cached':>7} {'bedrock':>8} {'quota':>6} {'service ms':>11}")
+    for name, status, cached, bedrock, charged, io_ms in rows:
+        print(f"{name:<30} {status:>6} {str(cached):>7} {bedrock:>8} {charged:>6} {io_ms:>11.1f}")
+
+    # A batch of one cached and two new job descriptions
+    tailor_batch = load_handler('tailor_batch')
+    bedrock, charged = fakes.bedrock.calls, usage()
+    batch_jds = [{'jdHash': first['jdHash']}] + [f"Posting {i:03d}\n\n{job_description}" for i in range(2)]
+    event = build_event({'body': {'jobDescriptions': batch_jds}, 'user_id': USER_ID})
+    response, _ = invoke(tailor_batch, event, FakeContext('tailor_batch'), latency)
+    jobs = json.loads(response['body']).get('jobs', [])
+    run_async_invocations(fakes, latency)
+    get_tailor_batch = load_handler('get_tailor_batch')
+    event = build_event({'query': {'batchId': json.loads(response['body'])['batchId']}, 'method': 'GET',
+                         'user_id': USER_ID})
+    status = json.loads(invoke(get_tailor_batch, event, FakeContext('get_tailor_batch'), latency)[0]['body'])
+    batch_costs = (fakes.bedrock.calls - bedrock, usage() - charged)
+    print(f"\nbatch of 3, 1 cached: {sum(job['cached'] for job in jobs)} reported cached, "
+          f"{batch_costs[0]} Bedrock calls, {batch_costs[1]} quota, {status['completed']} completed")
+    if batch_costs != (2, 2) or status['completed'] != 3:
+        failures.append('the batch tailored or charged a cached job description')
+
+    # The batch cached its new tailorings for single requests
+    step('a batch job, single request', {'jobDescription': batch_jds[1]}, True)
+    print(f"{rows[-1][0]:<30} {rows[-1][1]:>6} {str(rows[-1][2]):>7} {rows[-1][3]:>8} {rows[-1][4]:>6} "
+          f"{rows[-1][5]:>11.1f}")
+
+    # Cached at queue time, expired before the worker runs: charged by the worker
+    def expired_batch():
+        bedrock, charged = fakes.bedrock.calls, usage()
+        event = build_event({'body': {'jobDescriptions': [{'jdHash': first['jdHash']}]}, 'user_id': USER_ID})
+        response, _ = invoke(tailor_batch, event, FakeContext('tailor_batch'), latency)
+        queued = json.loads(response['body'])
+        cached_items = fakes.dynamodb.Table('TailoredResumes').items
+        for key in [key for key in cached_items if key[0] == USER_ID and
+                    key[1].startswith(tailor_store.CACHE_PREFIX) and first['jdHash'] in key[1]]:
+            del cached_items[key]
+        run_async_invocations(fakes, latency)
+        event = build_event({'query': {'batchId': queued['batchId']}, 'method': 'GET', 'user_id': USER_ID})
+        job = json.loads(invoke(get_tailor_batch, event, FakeContext('get_tailor_batch'), latency)[0]['body'])['jobs'][0]
+        return queued['jobs'][0]['cached'], job['state'], fakes.bedrock.calls - bedrock, usage() - charged
+
+    queued_cached, state, calls, charged = expired_batch()
+    print(f"cached job expired before the worker: {state}, {calls} Bedrock calls, {charged} quota")
+    if not queued_cached or (state, calls, charged) != ('done', 1, 1):
+        failures.append('an expired cached job was tailored without being charged')
+
+    limit = rate_limiter.get_usage_stats(USER_ID, 'bedrock_requests')[1]
+    for item in fakes.dynamodb.Table('ApiUsageLimits').items.values():
+        if item['date_service'].endswith('#bedrock_requests'):
+            item['request_count'] = limit
+    queued_cached, state, calls, charged = expired_batch()
+    print(f"same, out of quota: {state}, {calls} Bedrock calls, {charged} quota")
+    if not queued_cached or (state, calls, charged) != ('failed', 0, 0):
+        failures.append('an expired cached job was tailored past the daily limit')
+
+    if failures:
+        print(f"\n❌ {'; '.join(failures)}")
+        sys.exit(1)
+    print("\n✅ repeats served from storage without Bedrock or quota; new master or prompt versions tailor again")
+
+
+if __name__ == '__main__':
+    main()
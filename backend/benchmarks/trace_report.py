@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Per-request stage breakdown from handler traces.
+
+Sampled and failed invocations log their span tree as a "Request trace"
+line (see resume_tailor_core/tracing.py); replays here trace every one. This script collects those lines - by
+replaying the recorded workload locally, or from a file of exported log
+lines - and reports per function:
+
+  - p50/p99 duration of each stage, and each stage's share of the slowest
+    1% of requests, i.e. which stage dominates p99;
+  - a flamegraph-style timeline of the p99 request;
+
+and can write folded stacks (`root;child;grandchild self_us`) for
+flamegraph.pl or speedscope with --folded.
+
+Service latency is slept at --time-scale of the recorded distributions, so
+replayed durations are in scaled time; shares are what to compare.
+
+Usage:
+    python benchmarks/trace_report.py [--invocations 50] [--functions score_resume]
+    python benchmarks/trace_report.py --from-log exported.jsonl --folded stacks.txt
+"""
+
+import io
+import os
+import sys
+import json
+import argparse
+import contextlib
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from harness import (FakeContext, LatencyModel, build_event, install_workload, invoke, load_handler,  # noqa: E402
+                     load_workload, percentile, sample_pdf_base64, simulate_sleeps)
+
+TRACE_MESSAGE = 'Request trace'
+BAR_WIDTH = 60
+
+
+def read_traces(lines):
+    """Trace records from JSON log lines; other lines are skipped"""
+    traces = []
+    for line in lines:
+        line = line.strip()
+        if not line.startswith('{'):
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if record.get('message') == TRACE_MESSAGE and record.get('spans'):
+            traces.append(record)
+    return traces
+
+
+def replay(args):
+    """Run the recorded workload and capture the trace lines the handlers log"""
+    from resume_tailor_core import logger
+
+    logger.TRACE_SAMPLE_RATE = 1  # every invocation, not the deployed sample
+    workload = load_workload()
+    latency = LatencyModel(workload.get('latency'), time_scale=args.time_scale, seed=7)
+    fakes = install_workload(workload, latency)
+    usage_table = fakes.dynamodb.Table('ApiUsageLimits')
+    pdf_base64 = sample_pdf_base64(workload)
+
+    captured = io.StringIO()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(captured):
+        for name, spec in workload['requests'].items():
+            if args.functions and name not in args.functions:
+                continue
+            module = load_handler(name)
+            simulate_sleeps(module, latency)
+            for i in range(args.invocations):
+                usage_table.items.clear()
+                event = build_event(spec['events'][i % len(spec['events'])], pdf_base64)
+                invoke(module, event, FakeContext(name), latency, quiet=False)
+    return read_traces(captured.getvalue().splitlines())
+
+
+def root_of(trace):
+    return next(s for s in trace['spans'] if s['parent_id'] not in {x['span_id'] for x in trace['spans']})
+
+
+def children_of(trace):
+    children = defaultdict(list)
+    for s in trace['spans']:
+        children[s['parent_id']].append(s)
+    return children
+
+
+def self_times(trace):
+    """Span ID -> duration not covered by its children"""
+    children = children_of(trace)
+    return {s['span_id']: max(0.0, s['duration_ms'] - sum(c['duration_ms'] for c in children[s['span_id']]))
+            for s in trace['spans']}
+
+
+def stage_totals(trace):
+    """Time per stage name in one request, with the root's own time as '(self)'"""
+    root = root_of(trace)
+    own = self_times(trace)
+    totals = defaultdict(float)
+    for s in trace['spans']:
+        if s is root:
+            totals['(self)'] += own[s['span_id']]
+        elif s['parent_id'] == root['span_id']:
+            totals[s['name']] += s['duration_ms']
+    return totals
+
+
+def folded_stacks(traces):
+    """Folded stack lines, summed over all traces, with self time in microseconds"""
+    stacks = defaultdict(float)
+    for trace in traces:
+        by_id = {s['span_id']: s for s in trace['spans']}
+        own = self_times(trace)
+        for s in trace['spans']:
+            path = [s['name']]
+            parent = by_id.get(s['parent_id'])
+            while parent is not None:
+                path.append(parent['name'])
+                parent = by_id.get(parent['parent_id'])
+            stacks[';'.join(reversed(path))] += own[s['span_id']] * 1000
+    return [f"{stack} {round(us)}" for stack, us in sorted(stacks.items()) if round(us) > 0]
+
+
+def render_timeline(trace):
+    """The span tree of one request, each span a bar placed on the request's timeline"""
+    root = root_of(trace)
+    total = root['duration_ms'] or 1.0
+    children = children_of(trace)
+    lines = []
+
+    def visit(s, depth):
+        start = int(s['start_ms'] / total * BAR_WIDTH)
+        width = max(1, int(round(s['duration_ms'] / total * BAR_WIDTH)))
+        bar = ' ' * start + '█' * min(width, BAR_WIDTH - start)
+        label = ('  ' * depth + s['name'] + (' !' + s['error'] if s.get('error') else ''))[:36]
+        lines.append(f"  {label:<36} {s['duration_ms']:>9.1f} ms |{bar:<{BAR_WIDTH}}|")
+        for child in sorted(children[s['span_id']], key=lambda c: c['start_ms']):
+            visit(child, depth + 1)
+
+    visit(root, 0)
+    return lines
+
+
+def report(traces, tail_pct):
+    by_function = defaultdict(list)
+    for trace in traces:
+        by_function[root_of(trace)['name']].append(trace)
+
+    for name, group in sorted(by_function.items()):
+        durations = [root_of(t)['duration_ms'] for t in group]
+        cutoff = percentile(durations, 100 - tail_pct)
+        tail = [t for t in group if root_of(t)['duration_ms'] >= cutoff]
+
+        per_stage = defaultdict(list)
+        for trace in group:
+            for stage, ms in stage_totals(trace).items():
+                per_stage[stage].append(ms)
+        tail_share = defaultdict(float)
+        for trace in tail:
+            total = root_of(trace)['duration_ms'] or 1.0
+            for stage, ms in stage_totals(trace).items():
+                tail_share[stage] += ms / total / len(tail)
+
+        failed = sum(1 for t in group if ((root_of(t).get('attributes') or {}).get('status_code') or 500) >= 500)
+        print(f"\n{name}: {len(group)} requests, p50 {percentile(durations, 50):.1f} ms, "
+              f"p99 {percentile(durations, 99):.1f} ms" + (f", {failed} failed" if failed else ''))
+        print(f"  {'stage':<36} {'p50 ms':>9} {'p99 ms':>9} {f'share of slowest {tail_pct:g}%':>24}")
+        for stage, values in sorted(per_stage.items(), key=lambda kv: -tail_share[kv[0]]):
+            print(f"  {stage:<36} {percentile(values, 50):>9.1f} {percentile(values, 99):>9.1f} "
+                  f"{tail_share[stage]:>23.1%}")
+
+        slowest = max(tail, key=lambda t: root_of(t)['duration_ms'])
+        print(f"  p99 request {slowest.get('correlation_id')}:")
+        for line in render_timeline(slowest):
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stage breakdown and flamegraph data from handler traces')
+    parser.add_argument('--from-log', help='Read JSON log lines from this file ("-" for stdin) instead of replaying')
+    parser.add_argument('--invocations', type=int, default=50, help='Replayed invocations per function')
+    parser.add_argument('--functions', nargs='+', help='Only replay these functions')
+    parser.add_argument('--time-scale', type=float, default=0.01,
+                        help='Fraction of recorded service latency actually slept while replaying')
+    parser.add_argument('--tail', type=float, default=1.0, help='Percent of slowest requests to attribute')
+    parser.add_argument('--folded', help='Write folded stacks to this file')
+    args = parser.parse_args()
+
+    if args.from_log:
+        if args.from_log == '-':
+            traces = read_traces(sys.stdin)
+        else:
+            with open(args.from_log, encoding='utf-8') as f:
+                traces = read_traces(f)
+    else:
+        traces = replay(args)
+    if not traces:
+        print("No request traces found")
+        sys.exit(1)
+
+    report(traces, args.tail)
+    if args.folded:
+        with open(args.folded, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(folded_stacks(traces)) + '\n')
+        print(f"\nFolded stacks written to {args.folded}")
+
+
+if __name__ == '__main__':
+    main()
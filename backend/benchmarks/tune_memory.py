@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Memory and timeout tuning for the Resume Tailor Lambda functions.
+
+Replays the recorded workload (benchmarks/workloads/recorded.json) against
+each handler locally, with AWS calls answered by in-process fakes that inject
+the recorded service latencies. For every function it measures handler CPU
+time, injected I/O wait and peak RSS, then models duration at each Lambda
+memory tier: Lambda allocates CPU in proportion to memory (one full vCPU at
+1769 MB), so CPU time stretches below that while I/O wait does not.
+
+The recommendation is the cheapest tier (GB-seconds per invocation) whose
+p95 modelled duration meets the function's latency target and which leaves
+headroom above peak RSS. Timeouts are raised to at least 3x the p99 duration
+at that tier; they are never lowered automatically.
+
+Usage:
+    python benchmarks/tune_memory.py [--invocations 50] [--functions score_resume get_score]
+    python benchmarks/tune_memory.py --write   # save to lambda_tuning.json for deploy.py
+"""
+
+import os
+import sys
+import json
+import math
+import argparse
+import subprocess
+from pathlib import Path
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = BENCHMARKS_DIR.parent
+
+MEMORY_TIERS = [128, 256, 512, 768, 1024, 1536, 1769, 2048, 3008]
+FULL_VCPU_MB = 1769
+# Memory used by the Lambda Python runtime itself, on top of what the handler allocates
+RUNTIME_OVERHEAD_MB = 30
+RSS_HEADROOM = 1.5
+TIMEOUT_FACTOR = 3
+PRICE_PER_GB_SECOND = 0.0000166667  # x86, us-east-2
+PRICE_PER_REQUEST = 0.0000002
+
+sys.path.insert(0, str(BENCHMARKS_DIR))
+from harness import (FakeContext, LatencyModel, build_event, install_workload, invoke, load_handler,  # noqa: E402
+                     load_workload, peak_rss_mb, percentile, sample_pdf_base64, simulate_sleeps)
+
+
+def measure(function_name, invocations, workload_path, seed):
+    """Replay the workload for one function in this process and print the measurements as JSON"""
+    workload = load_workload(workload_path)
+    spec = workload['requests'][function_name]
+    latency = LatencyModel(workload.get('latency'), time_scale=0, seed=seed)
+    fakes = install_workload(workload, latency)
+    usage_table = fakes.dynamodb.Table('ApiUsageLimits')
+    pdf_base64 = sample_pdf_base64(workload)
+    rss_before = peak_rss_mb()
+
+    module = load_handler(function_name)
+    simulate_sleeps(module, latency)
+
+    samples = []
+    statuses = {}
+    for i in range(invocations + 1):
+        # Tune for the full request path, not for rate-limited rejections
+        usage_table.items.clear()
+        event = build_event(spec['events'][i % len(spec['events'])], pdf_base64)
+        response, timing = invoke(module, event, FakeContext(function_name), latency)
+        status = response.get('statusCode')
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+        if i > 0:  # the first invocation pays the cold start
+            samples.append(timing)
+
+    print(json.dumps({
+        'cpu_ms': [s['cpu_ms'] for s in samples],
+        'io_ms': [s['io_ms'] for s in samples],
+        'baseline_rss_mb': rss_before,
+        'peak_rss_mb': peak_rss_mb(),
+        'statuses': statuses
+    }))
+
+
+def run_measurement(function_name, invocations, workload_path, seed):
+    """Measure in a fresh interpreter so peak RSS belongs to one handler only"""
+    env = dict(os.environ)
+    env.setdefault('AWS_DEFAULT_REGION', 'us-east-2')
+    proc = subprocess.run(
+        [sys.executable, __file__, '--measure', function_name, '--invocations', str(invocations),
+         '--workload', str(workload_path), '--seed', str(seed)],
+        env=env, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{function_name} measurement failed:\n{proc.stderr.strip()}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def model_tier(measurement, memory_mb):
+    """Modelled p95/p99 duration and cost per invocation at a memory tier"""
+    cpu_factor = max(1.0, FULL_VCPU_MB / memory_mb)
+    durations = [io + cpu * cpu_factor for cpu, io in zip(measurement['cpu_ms'], measurement['io_ms'])]
+    mean_ms = sum(durations) / len(durations)
+    billed_gb_s = (memory_mb / 1024) * (math.ceil(mean_ms) / 1000)
+    return {
+        'memory': memory_mb,
+        'p95_ms': percentile(durations, 95),
+        'p99_ms': percentile(durations, 99),
+        'cost_per_million': (billed_gb_s * PRICE_PER_GB_SECOND + PRICE_PER_REQUEST) * 1_000_000
+    }
+
+
+def recommend(measurement, latency_target_ms, current):
+    """Pick the cheapest tier meeting the latency target with RSS headroom"""
+    required_mb = (measurement['peak_rss_mb'] + RUNTIME_OVERHEAD_MB) * RSS_HEADROOM
+    tiers = [model_tier(measurement, memory) for memory in MEMORY_TIERS]
+    eligible = [t for t in tiers if t['memory'] >= required_mb and t['p95_ms'] <= latency_target_ms]
+    if eligible:
+        choice = min(eligible, key=lambda t: (t['cost_per_million'], t['memory']))
+        meets_target = True
+    else:
+        # Nothing meets the target - take the fastest tier that fits in memory
+        fitting = [t for t in tiers if t['memory'] >= required_mb] or tiers[-1:]
+        choice = min(fitting, key=lambda t: (t['p95_ms'], t['memory']))
+        meets_target = False
+
+    timeout = max(current['timeout'], math.ceil(choice['p99_ms'] * TIMEOUT_FACTOR / 1000))
+    return {
+        'memory': choice['memory'],
+        'timeout': min(timeout, 900),
+        'p95_ms': choice['p95_ms'],
+        'p99_ms': choice['p99_ms'],
+        'cost_per_million': choice['cost_per_million'],
+        'current_cost_per_million': model_tier(measurement, current['memory'])['cost_per_million'],
+        'required_mb': required_mb,
+        'meets_target': meets_target
+    }
+
+
+def current_configuration():
+    sys.path.insert(0, str(BACKEND_DIR))
+    from deploy import LambdaDeployer
+    deployer = LambdaDeployer(region=os.environ.get('AWS_DEFAULT_REGION', 'us-east-2'))
+    return {name: {'memory': c['memory'], 'timeout': c['timeout']} for name, c in deployer.lambda_functions.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Recommend Lambda memory and timeout from a recorded workload')
+    parser.add_argument('--invocations', type=int, default=50, help='Warm invocations replayed per function')
+    parser.add_argument('--functions', nargs='+', help='Only tune these functions')
+    parser.add_argument('--workload', default=str(BENCHMARKS_DIR / 'workloads' / 'recorded.json'),
+                        help='Recorded workload to replay')
+    parser.add_argument('--latency-target-ms', type=float,
+                        help='p95 latency target for every function (default: per-function target from the workload)')
+    parser.add_argument('--seed', type=int, default=7, help='Seed for the latency distributions')
+    parser.add_argument('--write', action='store_true', help='Write recommendations to backend/lambda_tuning.json')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    parser.add_argument('--measure', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(args.measure, args.invocations, args.workload, args.seed)
+        return
+
+    with open(args.workload) as f:
+        requests = json.load(f)['requests']
+    current = current_configuration()
+    functions = args.functions or [name for name in current if name in requests]
+
+    results = {}
+    for function_name in functions:
+        if function_name not in requests:
+            print(f"⚠️  No recorded traffic for {function_name}, skipping", file=sys.stderr)
+            continue
+        measurement = run_measurement(function_name, args.invocations, args.workload, args.seed)
+        target = args.latency_target_ms or requests[function_name].get('latency_target_ms', 10000)
+        result = recommend(measurement, target, current[function_name])
+        result.update({
+            'latency_target_ms': target,
+            'current_memory': current[function_name]['memory'],
+            'current_timeout': current[function_name]['timeout'],
+            'peak_rss_mb': measurement['peak_rss_mb'],
+            'cpu_p95_ms': percentile(measurement['cpu_ms'], 95),
+            'io_p95_ms': percentile(measurement['io_ms'], 95),
+            'statuses': measurement['statuses']
+        })
+        results[function_name] = result
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'function':<24} {'cpu p95':>8} {'io p95':>8} {'rss MB':>7} {'memory':>13} {'timeout':>9} "
+              f"{'p95 ms':>8} {'target':>7} {'$/1M now':>9} {'$/1M new':>9}")
+        for name, r in results.items():
+            flag = '' if r['meets_target'] else '  ⚠️  target not met'
+            print(f"{name:<24} {r['cpu_p95_ms']:>8.1f} {r['io_p95_ms']:>8.0f} {r['peak_rss_mb']:>7.0f} "
+                  f"{r['current_memory']:>5} → {r['memory']:<5} {r['current_timeout']:>3} → {r['timeout']:<3} "
+                  f"{r['p95_ms']:>8.0f} {r['latency_target_ms']:>7.0f} {r['current_cost_per_million']:>9.2f} "
+                  f"{r['cost_per_million']:>9.2f}{flag}")
+
+    if args.write:
+        tuning_file = BACKEND_DIR / 'lambda_tuning.json'
+        tuning = {}
+        if tuning_file.exists():
+            with open(tuning_file) as f:
+                tuning = json.load(f)
+        for name, r in results.items():
+            tuning[name] = {'memory': r['memory'], 'timeout': r['timeout']}
+        with open(tuning_file, 'w') as f:
+            json.dump(tuning, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"\n✅ Wrote {len(results)} recommendations to {tuning_file.relative_to(BACKEND_DIR)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,29 +1,151 @@
 #!/usr/bin/env python3
 """
 AWS Lambda Deployment Script for Resume Tailor Application
-Deploys all Lambda functions with rate limiting capabilities.
+Deploys the shared resume_tailor_core layer and all Lambda functions with
+rate limiting capabilities.
 
 Usage:
     python deploy.py [--region us-east-2] [--bucket-name your-bucket] [--profile default]
+    python deploy.py --build-only   # build artifacts and report sizes/import times
 """
 
 import os
+import re
+import ast
 import sys
 import json
+import time
+import base64
+import hashlib
 import zipfile
 import argparse
 import boto3
 import tempfile
-import shutil
+import py_compile
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from botocore.exceptions import ClientError
+from botocore.exceptions import BotoCoreError, ClientError
+
+CORE_PACKAGE = 'resume_tailor_core'
+CORE_LAYER_NAME = 'resume-tailor-core'
+
+_print_lock = threading.Lock()
+
+
+def log(message):
+    """Print from worker threads without interleaving lines."""
+    with _print_lock:
+        print(message)
+
+
+# Fixed timestamp for every zip entry so identical sources give identical zips
+ZIP_TIMESTAMP = (1980, 1, 1, 0, 0, 0)
+
+# Where Lambda extracts function code and layers
+TASK_ROOT = '/var/task'
+LAYER_ROOT = '/opt/python'
+
+# Memory/timeout overrides written by benchmarks/tune_memory.py --write
+TUNING_FILE = Path(__file__).resolve().parent / 'lambda_tuning.json'
+
+IMPORT_TIME_SNIPPET = """
+import time, json
+start = time.perf_counter()
+import lambda_function
+print(json.dumps({'import_ms': (time.perf_counter() - start) * 1000}))
+"""
+
+
+def discover_modules(root, package=None):
+    """Map importable module names under root to their source files."""
+    modules = {}
+    base = Path(root) / package if package else Path(root)
+    for py_file in sorted(base.glob('*.py')):
+        if package:
+            name = package if py_file.stem == '__init__' else f"{package}.{py_file.stem}"
+        else:
+            name = py_file.stem
+        modules[name] = py_file
+    return modules
+
+
+def find_imports(source_path, module_name):
+    """Names of all modules imported by a source file, including imports inside functions."""
+    tree = ast.parse(Path(source_path).read_text(), str(source_path))
+    is_package = Path(source_path).stem == '__init__'
+    package = module_name if is_package else module_name.rpartition('.')[0]
+    
+    imported = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imported.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                base_parts = package.split('.') if package else []
+                base_parts = base_parts[:len(base_parts) - (node.level - 1)]
+                base = '.'.join(base_parts + ([node.module] if node.module else []))
+            else:
+                base = node.module
+            imported.add(base)
+            # `from package import module` imports a submodule
+            imported.update(f"{base}.{alias.name}" for alias in node.names)
+    
+    # Importing a.b.c also imports the packages a and a.b
+    for name in list(imported):
+        parts = name.split('.')
+        imported.update('.'.join(parts[:i]) for i in range(1, len(parts)))
+    return imported
+
+
+def import_closure(entry_module, available):
+    """Modules from `available` reachable by following imports from entry_module."""
+    reachable = set()
+    pending = [entry_module]
+    while pending:
+        name = pending.pop()
+        if name in reachable or name not in available:
+            continue
+        reachable.add(name)
+        pending.extend(find_imports(available[name], name))
+    return reachable
+
+
+def compile_bytecode(source_path, runtime_path):
+    """Compile a source file to hash-based .pyc bytes (no embedded mtime)."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cfile = Path(temp_dir) / 'module.pyc'
+        py_compile.compile(
+            str(source_path),
+            cfile=str(cfile),
+            dfile=runtime_path,
+            doraise=True,
+            invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH
+        )
+        return cfile.read_bytes()
+
+
+def write_deterministic_zip(zip_path, entries):
+    """Write (arcname, bytes) entries sorted, with fixed timestamps and permissions."""
+    Path(zip_path).parent.mkdir(exist_ok=True)
+    with zipfile.ZipFile(zip_path, 'w') as zip_file:
+        for arcname, data in sorted(entries):
+            info = zipfile.ZipInfo(arcname, date_time=ZIP_TIMESTAMP)
+            info.external_attr = 0o644 << 16
+            info.create_system = 3  # unix, regardless of the build host
+            info.compress_type = zipfile.ZIP_DEFLATED
+            zip_file.writestr(info, data, compresslevel=9)
+
 
 class LambdaDeployer:
-    def __init__(self, region='us-east-2', profile=None, bucket_name=None, role_arn=None):
+    def __init__(self, region='us-east-2', profile=None, bucket_name=None, role_arn=None, max_workers=4, runtime='python3.9'):
         self.region = region
         self.profile = profile
         self.bucket_name = bucket_name
         self.role_arn = role_arn
+        self.runtime = runtime
+        self.max_workers = max_workers
         
         # Initialize AWS session
         if profile:
@@ -62,6 +184,18 @@ class LambdaDeployer:
                     'BUCKET_NAME': bucket_name or ''
                 }
             },
+            'tailor_batch': {
+                'description': 'Tailor master resume against a batch of job descriptions in the background',
+                'timeout': 900,
+                'memory': 256,
+                'environment': {}
+            },
+            'get_tailor_batch': {
+                'description': 'Get batch tailoring status and results',
+                'timeout': 30,
+                'memory': 256,
+                'environment': {}
+            },
             'upload_resume': {
                 'description': 'Upload resume for authenticated users',
                 'timeout': 60,
@@ -101,10 +235,30 @@ class LambdaDeployer:
                 'timeout': 30,
                 'memory': 256,
                 'environment': {}
+            },
+            'get_dashboard': {
+                'description': 'Get master resume, tailored resumes and usage for the dashboard in one request',
+                'timeout': 30,
+                'memory': 256,
+                'environment': {}
             }
         }
+        self.apply_tuning()
 
 
+    def apply_tuning(self):
+        """Override memory/timeout with the values recommended by benchmarks/tune_memory.py."""
+        if not TUNING_FILE.exists():
+            return
+        with open(TUNING_FILE) as f:
+            tuning = json.load(f)
+        for function_name, settings in tuning.items():
+            if function_name not in self.lambda_functions:
+                log(f"   ⚠️  {TUNING_FILE.name}: unknown function {function_name}, ignoring")
+                continue
+            for setting in ('memory', 'timeout'):
+                if setting in settings:
+                    self.lambda_functions[function_name][setting] = int(settings[setting])
 
     def get_existing_lambda_role(self):
         """Get the ARN of an existing Lambda execution role."""
@@ -143,36 +297,275 @@ class LambdaDeployer:
         
         return role_arn
 
+    def configure_bucket_lifecycle(self):
+        """Ensure guest uploads expire a day after their last access, and debug payloads after a week.
+
+        Guest objects are content-addressed, so the same key is reused across
+        uploads. upload_resume_guest rewrites an object's access timestamp when
+        it is re-uploaded, which restarts the lifecycle age of the object.
+        Payloads captured for debugging (see PAYLOAD_CAPTURE_RATE) live under debug/.
+        """
+        managed_rules = [
+            {
+                'ID': 'guest-uploads-expiry',
+                'Filter': {'Prefix': 'guest/'},
+                'Status': 'Enabled',
+                'Expiration': {'Days': 1}
+            },
+            {
+                'ID': 'debug-payloads-expiry',
+                'Filter': {'Prefix': 'debug/'},
+                'Status': 'Enabled',
+                'Expiration': {'Days': 7}
+            }
+        ]
+        managed_ids = {rule['ID'] for rule in managed_rules}
+        
+        try:
+            existing = self.s3.get_bucket_lifecycle_configuration(Bucket=self.bucket_name)
+            rules = [rule for rule in existing.get('Rules', []) if rule.get('ID') not in managed_ids]
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'NoSuchLifecycleConfiguration':
+                raise
+            rules = []
+        
+        rules.extend(managed_rules)
+        self.s3.put_bucket_lifecycle_configuration(
+            Bucket=self.bucket_name,
+            LifecycleConfiguration={'Rules': rules}
+        )
+        print(f"🗑️  Guest upload and debug payload lifecycle rules applied to bucket '{self.bucket_name}'")
+
+    def bytecode_supported(self):
+        """Whether .pyc files built here can be loaded by the target runtime."""
+        match = re.fullmatch(r'python(\d+)\.(\d+)', self.runtime)
+        return bool(match) and tuple(map(int, match.groups())) == sys.version_info[:2]
+
+    def artifact_entries(self, modules, root, runtime_root):
+        """Zip entries for the given modules: sources plus bytecode when supported."""
+        entries = []
+        for name in sorted(modules):
+            source_path = Path(modules[name])
+            arcname = source_path.relative_to(root).as_posix()
+            entries.append((arcname, source_path.read_bytes()))
+            
+            if self.bytecode_supported():
+                pyc_name = f"{source_path.stem}.{sys.implementation.cache_tag}.pyc"
+                pyc_arcname = (Path(arcname).parent / '__pycache__' / pyc_name).as_posix()
+                entries.append((pyc_arcname, compile_bytecode(source_path, f"{runtime_root}/{arcname}")))
+        return entries
+
+    def function_modules(self, function_name):
+        """Local and shared modules reachable from a function's handler."""
+        lambda_dir = Path('lambdas') / function_name
+        
+        if not (lambda_dir / 'lambda_function.py').exists():
+            raise FileNotFoundError(f"Lambda handler not found: {lambda_dir / 'lambda_function.py'}")
+        
+        local_modules = discover_modules(lambda_dir)
+        core_modules = discover_modules('lambdas', CORE_PACKAGE)
+        reachable = import_closure('lambda_function', {**core_modules, **local_modules})
+        return (
+            {name: path for name, path in local_modules.items() if name in reachable},
+            {name: path for name, path in core_modules.items() if name in reachable}
+        )
+
+    def build_core_layer(self):
+        """Package the shared package as a layer zip, keeping only modules some handler imports."""
+        package_dir = Path('lambdas') / CORE_PACKAGE
+        
+        if not package_dir.exists():
+            raise FileNotFoundError(f"Shared package not found: {package_dir}")
+        
+        used_modules = {}
+        for function_name in self.lambda_functions:
+            used_modules.update(self.function_modules(function_name)[1])
+        
+        # Python layers are extracted to /opt, and /opt/python is on sys.path
+        entries = [
+            (f"python/{arcname}", data)
+            for arcname, data in self.artifact_entries(used_modules, Path('lambdas'), LAYER_ROOT)
+        ]
+        
+        zip_path = Path('deployments') / f'{CORE_PACKAGE}_layer.zip'
+        write_deterministic_zip(zip_path, entries)
+        
+        unused = sorted(set(discover_modules('lambdas', CORE_PACKAGE)) - set(used_modules))
+        log(f"📦 Packaged {CORE_PACKAGE} layer -> {zip_path} ({zip_path.stat().st_size / 1024:.1f} KB)")
+        if unused:
+            log(f"   Excluded unused modules: {', '.join(unused)}")
+        return zip_path
+
+    def get_latest_layer_version(self):
+        """Return (LayerVersionArn, CodeSha256) of the newest layer version, or (None, None)."""
+        try:
+            versions = self.lambda_client.list_layer_versions(LayerName=CORE_LAYER_NAME).get('LayerVersions', [])
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ResourceNotFoundException':
+                return None, None
+            raise
+        
+        if not versions:
+            return None, None
+        
+        latest = max(versions, key=lambda version: version['Version'])
+        details = self.lambda_client.get_layer_version(
+            LayerName=CORE_LAYER_NAME,
+            VersionNumber=latest['Version']
+        )
+        return latest['LayerVersionArn'], details['Content']['CodeSha256']
+
+    def publish_core_layer(self):
+        """Publish the shared layer if its content changed and return the ARN to reference."""
+        zip_path = self.build_core_layer()
+        
+        with open(zip_path, 'rb') as zip_file:
+            zip_content = zip_file.read()
+        
+        latest_arn, latest_sha = self.get_latest_layer_version()
+        if latest_arn and latest_sha == code_sha256(zip_content):
+            print(f"⏭️  Layer '{CORE_LAYER_NAME}' unchanged, reusing {latest_arn}")
+            return latest_arn
+        
+        print(f"📚 Publishing layer '{CORE_LAYER_NAME}'...")
+        response = self.lambda_client.publish_layer_version(
+            LayerName=CORE_LAYER_NAME,
+            Description='Shared clients, logging, rate limiting and parsing for Resume Tailor',
+            Content={'ZipFile': zip_content},
+            CompatibleRuntimes=[self.runtime]
+        )
+        
+        layer_arn = response['LayerVersionArn']
+        print(f"✅ Layer published: {layer_arn}")
+        return layer_arn
+
     def package_lambda_function(self, function_name):
-        """Package a Lambda function into a zip file."""
+        """Package a Lambda function into a deterministic zip file."""
         lambda_dir = Path('lambdas') / function_name
+        local_modules, _ = self.function_modules(function_name)
         
-        if not lambda_dir.exists():
-            raise FileNotFoundError(f"Lambda directory not found: {lambda_dir}")
+        zip_path = Path('deployments') / f'{function_name}.zip'
+        write_deterministic_zip(zip_path, self.artifact_entries(local_modules, lambda_dir, TASK_ROOT))
         
-        # Create a temporary directory for packaging
+        log(f"📦 Packaged {function_name} -> {zip_path} ({zip_path.stat().st_size / 1024:.1f} KB)")
+        return zip_path
+
+    def measure_import_time(self, function_zip, layer_zip):
+        """Import a handler from its built artifacts in a fresh interpreter, in milliseconds."""
         with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            
-            # Copy all Python files to temp directory
-            for py_file in lambda_dir.glob('*.py'):
-                shutil.copy2(py_file, temp_path / py_file.name)
-            
-            # Create zip file
-            zip_path = Path('deployments') / f'{function_name}.zip'
-            zip_path.parent.mkdir(exist_ok=True)
+            task_dir = Path(temp_dir) / 'task'
+            opt_dir = Path(temp_dir) / 'opt'
+            zipfile.ZipFile(function_zip).extractall(task_dir)
+            zipfile.ZipFile(layer_zip).extractall(opt_dir)
             
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                for file_path in temp_path.rglob('*'):
-                    if file_path.is_file():
-                        arcname = file_path.relative_to(temp_path)
-                        zip_file.write(file_path, arcname)
+            env = dict(os.environ)
+            env.setdefault('AWS_DEFAULT_REGION', self.region)
+            env['PYTHONPATH'] = str(opt_dir / 'python')
+            env['PYTHONDONTWRITEBYTECODE'] = '1'
             
-            print(f"📦 Packaged {function_name} -> {zip_path}")
-            return zip_path
+            proc = subprocess.run(
+                [sys.executable, '-c', IMPORT_TIME_SNIPPET],
+                cwd=task_dir, env=env, capture_output=True, text=True
+            )
+            if proc.returncode != 0:
+                raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+            return json.loads(proc.stdout.strip().splitlines()[-1])['import_ms']
+
+    def build_report(self):
+        """Build every artifact and report its size, hash and handler import time."""
+        if self.bytecode_supported():
+            print(f"🧱 Precompiling bytecode for {self.runtime}")
+        else:
+            print(f"⚠️  Local Python {sys.version_info[0]}.{sys.version_info[1]} does not match "
+                  f"{self.runtime}; shipping sources without bytecode")
+        
+        layer_zip = self.build_core_layer()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            function_zips = dict(zip(
+                self.lambda_functions,
+                executor.map(self.package_lambda_function, self.lambda_functions)
+            ))
+        print()
+        
+        print(f"{'artifact':<28} {'files':>5} {'size KB':>8} {'import ms':>10}  sha256")
+        rows = [(f"{CORE_LAYER_NAME} (layer)", layer_zip, None)]
+        rows += [(name, path, path) for name, path in function_zips.items()]
+        for name, zip_path, function_zip in rows:
+            content = zip_path.read_bytes()
+            files = len(zipfile.ZipFile(zip_path).namelist())
+            import_ms = ''
+            if function_zip:
+                try:
+                    import_ms = f"{self.measure_import_time(function_zip, layer_zip):.1f}"
+                except RuntimeError as e:
+                    import_ms = 'error'
+                    log(f"   ⚠️  {name} failed to import: {e}")
+            print(f"{name:<28} {files:>5} {len(content) / 1024:>8.1f} {import_ms:>10}  {code_sha256(content)[:16]}")
+
+    def get_deployed_configuration(self, function_name):
+        """Return the deployed function configuration, or None if the function does not exist."""
+        try:
+            return self.lambda_client.get_function_configuration(FunctionName=function_name)
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ResourceNotFoundException':
+                return None
+            raise
+
+    def desired_configuration(self, function_name, role_arn, layer_arn):
+        """Configuration fields deploy_lambda_function manages, in API parameter form."""
+        config = self.lambda_functions[function_name]
+        desired = {
+            'Description': config['description'],
+            'Timeout': config['timeout'],
+            'MemorySize': config['memory'],
+            'Environment': {'Variables': config['environment']},
+            'Layers': [layer_arn]
+        }
+        if role_arn:
+            desired['Role'] = role_arn
+        return desired
+
+    def diff_function(self, function_name, zip_content, role_arn, layer_arn):
+        """
+        Compare the local build against the deployed function.
+        Returns dict: exists, code_changed, config_changes {field: (deployed, desired)}
+        """
+        deployed = self.get_deployed_configuration(function_name)
+        desired = self.desired_configuration(function_name, role_arn, layer_arn)
+        
+        if deployed is None:
+            return {'exists': False, 'code_changed': True, 'config_changes': {}, 'deployed': None}
+        
+        current = {
+            'Description': deployed.get('Description', ''),
+            'Timeout': deployed.get('Timeout'),
+            'MemorySize': deployed.get('MemorySize'),
+            'Environment': {'Variables': deployed.get('Environment', {}).get('Variables', {})},
+            'Layers': [layer['Arn'] for layer in deployed.get('Layers', [])],
+            'Role': deployed.get('Role')
+        }
+        config_changes = {
+            field: (current[field], value)
+            for field, value in desired.items()
+            if current[field] != value
+        }
+        
+        return {
+            'exists': True,
+            'code_changed': deployed.get('CodeSha256') != code_sha256(zip_content),
+            'config_changes': config_changes,
+            'deployed': deployed
+        }
+
+    def wait_until_updated(self, function_name):
+        """Block until the function's LastUpdateStatus is no longer InProgress."""
+        self.lambda_client.get_waiter('function_updated_v2').wait(FunctionName=function_name)
 
-    def deploy_lambda_function(self, function_name, role_arn):
-        """Deploy or update a Lambda function."""
+    def deploy_lambda_function(self, function_name, role_arn, layer_arn):
+        """
+        Deploy or update a Lambda function, skipping API calls for parts that are unchanged.
+        Returns one of 'created', 'updated', 'unchanged'.
+        """
         config = self.lambda_functions[function_name]
         zip_path = self.package_lambda_function(function_name)
         
@@ -180,53 +573,60 @@ class LambdaDeployer:
         with open(zip_path, 'rb') as zip_file:
             zip_content = zip_file.read()
         
-        try:
-            # Try to update existing function
-            print(f"🔄 Updating function '{function_name}'...")
+        diff = self.diff_function(function_name, zip_content, role_arn, layer_arn)
+        
+        if not diff['exists']:
+            # Create new function
+            log(f"🔨 Creating function '{function_name}'...")
             
-            # Update function code
-            self.lambda_client.update_function_code(
-                FunctionName=function_name,
-                ZipFile=zip_content
-            )
-            
-            # Update function configuration
-            self.lambda_client.update_function_configuration(
+            response = self.lambda_client.create_function(
                 FunctionName=function_name,
+                Runtime=self.runtime,
+                Role=role_arn,
+                Handler='lambda_function.lambda_handler',
+                Code={'ZipFile': zip_content},
                 Description=config['description'],
                 Timeout=config['timeout'],
                 MemorySize=config['memory'],
                 Environment={'Variables': config['environment']},
-                Role=role_arn
+                Layers=[layer_arn],
+                Tags={
+                    'Application': 'Resume Tailor',
+                    'Environment': 'Production'
+                }
             )
+            self.lambda_client.get_waiter('function_active_v2').wait(FunctionName=function_name)
             
-            print(f"✅ Function '{function_name}' updated successfully!")
-            
-        except ClientError as e:
-            if e.response['Error']['Code'] == 'ResourceNotFoundException':
-                # Create new function
-                print(f"🔨 Creating function '{function_name}'...")
-                
-                response = self.lambda_client.create_function(
-                    FunctionName=function_name,
-                    Runtime='python3.9',
-                    Role=role_arn,
-                    Handler='lambda_function.lambda_handler',
-                    Code={'ZipFile': zip_content},
-                    Description=config['description'],
-                    Timeout=config['timeout'],
-                    MemorySize=config['memory'],
-                    Environment={'Variables': config['environment']},
-                    Tags={
-                        'Application': 'Resume Tailor',
-                        'Environment': 'Production'
-                    }
-                )
-                
-                print(f"✅ Function '{function_name}' created successfully!")
-                print(f"   Function ARN: {response['FunctionArn']}")
-            else:
-                raise
+            log(f"✅ Function '{function_name}' created successfully!")
+            log(f"   Function ARN: {response['FunctionArn']}")
+            return 'created'
+        
+        if not diff['code_changed'] and not diff['config_changes']:
+            log(f"⏭️  Function '{function_name}' unchanged, skipping")
+            return 'unchanged'
+        
+        # A previous update may still be in progress
+        if diff['deployed'].get('LastUpdateStatus') == 'InProgress':
+            self.wait_until_updated(function_name)
+        
+        if diff['code_changed']:
+            log(f"🔄 Updating code for '{function_name}'...")
+            self.lambda_client.update_function_code(
+                FunctionName=function_name,
+                ZipFile=zip_content
+            )
+            self.wait_until_updated(function_name)
+        
+        if diff['config_changes']:
+            log(f"🔧 Updating configuration for '{function_name}' ({', '.join(diff['config_changes'])})...")
+            self.lambda_client.update_function_configuration(
+                FunctionName=function_name,
+                **self.desired_configuration(function_name, role_arn, layer_arn)
+            )
+            self.wait_until_updated(function_name)
+        
+        log(f"✅ Function '{function_name}' updated successfully!")
+        return 'updated'
 
     def deploy_all(self):
         """Deploy all components."""
@@ -236,6 +636,7 @@ class LambdaDeployer:
         print(f"   Bucket: {self.bucket_name or 'not specified'}")
         print()
         
+        start_time = time.time()
         try:
             # Step 1: Get IAM role
             if self.role_arn:
@@ -246,23 +647,37 @@ class LambdaDeployer:
                 role_arn = self.get_existing_lambda_role()
             print()
             
-            # Step 2: Deploy Lambda functions
-            print("⚡ Deploying Lambda functions...")
-            successful_deployments = 0
+            if self.bucket_name:
+                self.configure_bucket_lifecycle()
+                print()
+            
+            # Step 2: Publish the shared layer every function references
+            layer_arn = self.publish_core_layer()
+            print()
+            
+            # Step 3: Deploy Lambda functions concurrently
+            print(f"⚡ Deploying Lambda functions ({self.max_workers} in parallel)...")
+            results = {'created': 0, 'updated': 0, 'unchanged': 0}
             failed_deployments = 0
             
-            for function_name in self.lambda_functions.keys():
-                try:
-                    self.deploy_lambda_function(function_name, role_arn)
-                    successful_deployments += 1
-                except Exception as e:
-                    print(f"❌ Failed to deploy {function_name}: {e}")
-                    failed_deployments += 1
-                    continue
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {
+                    executor.submit(self.deploy_lambda_function, function_name, role_arn, layer_arn): function_name
+                    for function_name in self.lambda_functions
+                }
+                for future in as_completed(futures):
+                    function_name = futures[future]
+                    try:
+                        results[future.result()] += 1
+                    except Exception as e:
+                        log(f"❌ Failed to deploy {function_name}: {e}")
+                        failed_deployments += 1
             print()
             
-            print("🎉 Lambda deployment completed!")
-            print(f"   ✅ Successful: {successful_deployments}")
+            print(f"🎉 Lambda deployment completed in {time.time() - start_time:.1f}s!")
+            print(f"   🔨 Created: {results['created']}")
+            print(f"   ✅ Updated: {results['updated']}")
+            print(f"   ⏭️  Unchanged: {results['unchanged']}")
             print(f"   ❌ Failed: {failed_deployments}")
             print()
             print("📋 Next steps:")
@@ -274,35 +689,86 @@ class LambdaDeployer:
             print(f"💥 Deployment failed: {e}")
             sys.exit(1)
 
+    def dry_run(self):
+        """Build every artifact and print how it differs from what is deployed."""
+        layer_zip = self.build_core_layer()
+        with open(layer_zip, 'rb') as zip_file:
+            layer_sha = code_sha256(zip_file.read())
+        
+        try:
+            latest_arn, latest_sha = self.get_latest_layer_version()
+        except (ClientError, BotoCoreError) as e:
+            print(f"⚠️  Cannot compare against deployed functions: {e}")
+            return
+        
+        if latest_arn and latest_sha == layer_sha:
+            print(f"  = layer {CORE_LAYER_NAME}: unchanged ({latest_arn})")
+            layer_arn = latest_arn
+        else:
+            print(f"  ~ layer {CORE_LAYER_NAME}: new version would be published")
+            layer_arn = '<new layer version>'
+        
+        def describe(function_name):
+            zip_path = self.package_lambda_function(function_name)
+            with open(zip_path, 'rb') as zip_file:
+                return function_name, self.diff_function(function_name, zip_file.read(), self.role_arn, layer_arn)
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            diffs = list(executor.map(describe, self.lambda_functions))
+        
+        for function_name, diff in diffs:
+            if not diff['exists']:
+                print(f"  + {function_name}: would be created")
+            elif not diff['code_changed'] and not diff['config_changes']:
+                print(f"  = {function_name}: unchanged")
+            else:
+                print(f"  ~ {function_name}:")
+                if diff['code_changed']:
+                    print(f"      code: {diff['deployed'].get('CodeSha256')} -> new build")
+                for field, (deployed, desired) in diff['config_changes'].items():
+                    print(f"      {field}: {json.dumps(deployed)} -> {json.dumps(desired)}")
+
+
+def code_sha256(zip_content):
+    """Hash a deployment package the way Lambda reports CodeSha256."""
+    return base64.b64encode(hashlib.sha256(zip_content).digest()).decode('ascii')
+
+
 def main():
     parser = argparse.ArgumentParser(description='Deploy Resume Tailor Lambda functions')
     parser.add_argument('--region', default='us-east-2', help='AWS region (default: us-east-2)')
     parser.add_argument('--profile', help='AWS profile to use (default: default profile)')
     parser.add_argument('--bucket-name', help='S3 bucket name for file storage')
     parser.add_argument('--role-arn', help='Lambda execution role ARN (will auto-detect if not provided)')
+    parser.add_argument('--max-workers', type=int, default=4, help='Functions to deploy in parallel (default: 4)')
+    parser.add_argument('--runtime', default='python3.9', help='Lambda Python runtime (default: python3.9)')
+    parser.add_argument('--build-only', action='store_true', help='Build artifacts and report sizes and import times without deploying')
     parser.add_argument('--dry-run', action='store_true', help='Show what would be deployed without actually deploying')
     
     args = parser.parse_args()
     
+    # Change to backend directory
+    script_dir = Path(__file__).parent
+    os.chdir(script_dir)
+    
+    deployer = LambdaDeployer(args.region, args.profile, args.bucket_name, args.role_arn, args.max_workers, args.runtime)
+    
+    if args.build_only:
+        deployer.build_report()
+        return
+    
     if args.dry_run:
         print("🔍 Dry run mode - showing what would be deployed:")
-        deployer = LambdaDeployer(args.region, args.profile, args.bucket_name, args.role_arn)
         print(f"Region: {args.region}")
         print(f"Profile: {args.profile or 'default'}")
         print(f"Bucket: {args.bucket_name or 'not specified'}")
         print(f"Role ARN: {args.role_arn or 'auto-detect'}")
-        print("Lambda functions to deploy:")
-        for name, config in deployer.lambda_functions.items():
-            print(f"  - {name}: {config['description']}")
+        print("Changes against deployed functions:")
+        deployer.dry_run()
         return
     
-    # Change to backend directory
-    script_dir = Path(__file__).parent
-    os.chdir(script_dir)
-    
     # Run deployment
-    deployer = LambdaDeployer(args.region, args.profile, args.bucket_name, args.role_arn)
     deployer.deploy_all()
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
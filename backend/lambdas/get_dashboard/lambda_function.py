@@ -0,0 +1,184 @@
+import contextvars
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add parent directory to path so resume_tailor_core resolves outside the Lambda layer
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from resume_tailor_core.logger import create_logger, log_invocation
+from resume_tailor_core.tracing import span
+from resume_tailor_core.rate_limiter import create_rate_limiter
+from resume_tailor_core.clients import get_client
+from resume_tailor_core.resume_store import TABLE_NAME, load_master
+from resume_tailor_core.http_cache import presigned_pdf_url
+
+BUCKET_NAME = 'resume-tailor-bucket.kp'
+USAGE_SERVICES = ('bedrock_requests', 'textract_requests')
+
+# Everything the dashboard needs on load, in one request. The master resume
+# read, the tailored resume listing and the usage counters are independent,
+# so they run concurrently and the response takes as long as the slowest of
+# them rather than their sum. A section that fails is returned as null and
+# named in `errors`; the others are still returned.
+
+
+def fetch_master(user_id, logger):
+    """The master resume's entries and PDF URL, or None if the user has none yet"""
+    with span('dynamodb.get_item', table=TABLE_NAME):
+        dynamodb_start = time.time()
+        item = load_master(user_id, ('entries', 'updatedAt'))
+        dynamodb_duration = (time.time() - dynamodb_start) * 1000
+    logger.put_metric('ServiceLatency', dynamodb_duration, service='dynamodb', operation='get_item')
+
+    if not item:
+        logger.info("Master resume metadata not found", {
+            'user_id': user_id,
+            'duration_ms': round(dynamodb_duration, 2)
+        })
+        return None
+
+    with span('s3.generate_presigned_url'):
+        url = presigned_pdf_url(BUCKET_NAME, f'users/master/{user_id}.pdf')
+
+    entries = item.get('entries') or []
+    logger.info("Master resume metadata retrieved", {
+        'duration_ms': round(dynamodb_duration, 2),
+        'entries_count': len(entries)
+    })
+    return {'url': url, 'entries': entries, 'version': item.get('updatedAt')}
+
+
+def fetch_tailored(user_id, logger):
+    """Name and URL of each of the user's tailored resume PDFs"""
+    prefix = f"users/tailored/{user_id}/"
+    with span('s3.list_objects_v2'):
+        s3_list_start = time.time()
+        keys = []
+        for page in get_client('s3').get_paginator('list_objects_v2').paginate(Bucket=BUCKET_NAME, Prefix=prefix):
+            keys.extend(obj['Key'] for obj in page.get('Contents', []))
+        s3_list_duration = (time.time() - s3_list_start) * 1000
+    logger.put_metric('ServiceLatency', s3_list_duration, service='s3', operation='list_objects_v2')
+
+    with span('s3.generate_presigned_url', count=len(keys)):
+        files = [{'name': key.split('/')[3], 'url': presigned_pdf_url(BUCKET_NAME, key)} for key in keys]
+
+    logger.info("Tailored resumes listed", {
+        'duration_ms': round(s3_list_duration, 2),
+        'files_found': len(files)
+    })
+    return files
+
+
+def fetch_usage(rate_limiter, identifier, service_name, logger):
+    """(current_usage, daily_limit) of one rate-limited service"""
+    with span('dynamodb.get_item', table='ApiUsageLimits', service=service_name):
+        usage_start = time.time()
+        count, limit, _ = rate_limiter.get_usage_stats(identifier, service_name)
+        usage_duration = (time.time() - usage_start) * 1000
+    logger.put_metric('ServiceLatency', usage_duration, service='dynamodb', operation='get_item')
+    return count, limit
+
+
+@log_invocation
+def lambda_handler(event, context):
+    # Initialize logger
+    logger = create_logger('get_dashboard')
+    logger.log_function_start(event, context)
+
+    try:
+        logger.info("Extracting user claims from request context")
+        claims = event.get('requestContext', {}).get('authorizer', {}).get('jwt', {}).get('claims', {})
+        user_id = claims.get('sub')
+
+        if not user_id:
+            logger.error("Missing user ID in claims", {
+                'has_claims': bool(claims),
+                'claims_keys': list(claims.keys()) if claims else []
+            })
+            return {
+                'statusCode': 401,
+                'body': json.dumps({'error': 'Unauthorized: User ID not found in request context'})
+            }
+
+        rate_limiter = create_rate_limiter()
+        identifier, user_type = rate_limiter.get_user_identifier(event, claims)
+        logger.set_metric_dimensions(user_type=user_type)
+        logger.info("User authenticated successfully", {
+            'user_id': user_id
+        })
+
+        tasks = {
+            'master': (fetch_master, user_id, logger),
+            'tailored': (fetch_tailored, user_id, logger)
+        }
+        for service_name in USAGE_SERVICES:
+            tasks[service_name] = (fetch_usage, rate_limiter, identifier, service_name, logger)
+
+        logger.info("Loading dashboard sections concurrently", {
+            'sections': list(tasks)
+        })
+        fetch_start = time.time()
+        # Each task runs in a copy of this context so its spans join the request's trace
+        # and current_logger() is the request's logger, which is safe to share
+        with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+            futures = {
+                name: executor.submit(contextvars.copy_context().run, *task)
+                for name, task in tasks.items()
+            }
+        results = {}
+        errors = {}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                errors[name] = str(e)
+                logger.error("Failed to load dashboard section", {
+                    'section': name,
+                    'error': str(e)
+                })
+        fetch_duration = (time.time() - fetch_start) * 1000
+
+        usage = None
+        if all(service_name in results for service_name in USAGE_SERVICES):
+            usage = {'user_type': user_type, 'reset_time': int(time.time()) + (24 * 3600)}
+            for service_name in USAGE_SERVICES:
+                count, limit = results[service_name]
+                usage[service_name.split('_')[0]] = {
+                    'current_usage': count,
+                    'daily_limit': limit,
+                    'remaining': limit - count
+                }
+        elif any(service_name in errors for service_name in USAGE_SERVICES):
+            errors['usage'] = '; '.join(errors.pop(s) for s in USAGE_SERVICES if s in errors)
+
+        response_data = {
+            'master': results.get('master'),
+            'tailored': {'files': results['tailored']} if 'tailored' in results else None,
+            'usage': usage
+        }
+        if errors:
+            response_data['errors'] = errors
+
+        logger.info("Dashboard loaded", {
+            'duration_ms': round(fetch_duration, 2),
+            'has_master': response_data['master'] is not None,
+            'tailored_count': len(results.get('tailored') or []),
+            'failed_sections': list(errors)
+        })
+
+        return {
+            'statusCode': 200,
+            'headers': {
+                'Content-Type': 'application/json'
+            },
+            'body': json.dumps(response_data)
+        }
+
+    except Exception as e:
+        logger.error("Unexpected error loading dashboard", {'error': str(e)})
+        return {
+            'statusCode': 500,
+            'body': json.dumps({'error': f'Internal Server Error: {str(e)}'})
+        }
@@ -1,19 +1,21 @@
 import json
 import os
-import boto3
 import sys
 import time
 
-# Add parent directory to path for imports
+# Add parent directory to path so resume_tailor_core resolves outside the Lambda layer
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from logger_utils import create_logger
+from resume_tailor_core.logger import create_logger, log_invocation
+from resume_tailor_core.tracing import span
+from resume_tailor_core.clients import get_table
+from resume_tailor_core.resume_store import TABLE_NAME, load_master
+from resume_tailor_core.http_cache import (REVALIDATE, if_none_match, is_not_modified, not_modified,
+                                           presigned_pdf_url, url_entity_tag)
 
 BUCKET_NAME = 'resume-tailor-bucket.kp'
-s3 = boto3.client('s3')
-dynamodb = boto3.resource("dynamodb")
-table = dynamodb.Table("ResumeMetadata")
 
 
+@log_invocation
 def lambda_handler(event, context):
     # Initialize logger
     logger = create_logger('get_master_resume')
@@ -46,30 +48,29 @@ def lambda_handler(event, context):
         }  
         
     try:
-        # Generate presigned URL for master resume PDF
-        logger.info("Generating presigned URL for master resume", {
-            'bucket': BUCKET_NAME,
-            'file_key': f'users/master/{user_id}.pdf'
-        })
-        
-        s3_start = time.time()
-        url = s3.generate_presigned_url(
-            ClientMethod='get_object',
-            Params={
-                'Bucket': BUCKET_NAME,
-                'Key': f'users/master/{user_id}.pdf',
-                'ResponseContentDisposition': 'inline',
-                'ResponseContentType': 'application/pdf'
+        table = get_table(TABLE_NAME)
 
-            },
-            ExpiresIn=3600
-        )
-        s3_duration = (time.time() - s3_start) * 1000
-        
-        logger.info("Presigned URL generated successfully", {
-            'duration_ms': round(s3_duration, 2),
-            'expires_in_seconds': 3600
-        })
+        # A client revalidating its copy only needs the version compared
+        if if_none_match(event):
+            with span('dynamodb.get_item', projection='updatedAt'):
+                dynamodb_start = time.time()
+                version_item = table.get_item(
+                    Key={'resume_id': user_id},
+                    ProjectionExpression='updatedAt'
+                ).get('Item')
+                dynamodb_duration = (time.time() - dynamodb_start) * 1000
+            logger.put_metric('ServiceLatency', dynamodb_duration, service='dynamodb', operation='get_item')
+
+            if version_item and version_item.get('updatedAt'):
+                etag = url_entity_tag(user_id, version_item['updatedAt'])
+                if is_not_modified(event, etag):
+                    logger.info("Master resume not modified", {
+                        'duration_ms': round(dynamodb_duration, 2),
+                        'version': version_item['updatedAt']
+                    })
+                    logger.put_metric('ConditionalGet', 1, unit='Count', outcome='not_modified')
+                    return not_modified(etag, {'Vary': 'Authorization'})
+            logger.put_metric('ConditionalGet', 1, unit='Count', outcome='modified')
 
         # Get master resume metadata from DynamoDB
         logger.info("Retrieving master resume metadata from DynamoDB", {
@@ -77,11 +78,11 @@ def lambda_handler(event, context):
             'user_id': user_id
         })
         
-        dynamodb_start = time.time()
-        response = table.get_item(Key={'resume_id': user_id})
-        dynamodb_duration = (time.time() - dynamodb_start) * 1000
-        
-        item = response.get('Item')
+        with span('dynamodb.get_item', projection='entries,updatedAt'):
+            dynamodb_start = time.time()
+            item = load_master(user_id, ('entries', 'updatedAt'), table=table)
+            dynamodb_duration = (time.time() - dynamodb_start) * 1000
+        logger.put_metric('ServiceLatency', dynamodb_duration, service='dynamodb', operation='get_item')
 
         if not item:
             logger.warning("Master resume metadata not found", {
@@ -98,10 +99,19 @@ def lambda_handler(event, context):
             'has_entries': 'entries' in item,
             'entries_count': len(item.get('entries', [])) if item.get('entries') else 0
         })
+
+        # Presigned URL for the master resume PDF, reused until close to expiry
+        with span('s3.generate_presigned_url'):
+            s3_start = time.time()
+            url = presigned_pdf_url(BUCKET_NAME, f'users/master/{user_id}.pdf')
+            s3_duration = (time.time() - s3_start) * 1000
+        logger.put_metric('ServiceLatency', s3_duration, service='s3', operation='generate_presigned_url')
         
+        version = item.get('updatedAt')
         response_data = {
             'fileUrl': url,
-            'resumeData': item.get('entries', [])
+            'resumeData': item.get('entries', []),
+            'version': version
         }
         
         logger.info("Master resume retrieval completed successfully", {
@@ -110,8 +120,17 @@ def lambda_handler(event, context):
             'entries_returned': len(item.get('entries', []))
         })
 
+        headers = {'Content-Type': 'application/json'}
+        if version:
+            headers.update({
+                'ETag': url_entity_tag(user_id, version),
+                'Cache-Control': REVALIDATE,
+                'Vary': 'Authorization'
+            })
+
         return {
             'statusCode': 200,
+            'headers': headers,
             'body': json.dumps(response_data),
         }
 
@@ -1,22 +1,20 @@
 import json
-import boto3
-from boto3.dynamodb.conditions import Key
 import os
-import base64
 import sys
 import time
 
-# Add parent directory to path for imports
+# Add parent directory to path so resume_tailor_core resolves outside the Lambda layer
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from logger_utils import create_logger
-
-dynamodb = boto3.resource("dynamodb")
-table = dynamodb.Table("ResumeAnalysisResults")
-s3 = boto3.client('s3')
+from resume_tailor_core.logger import create_logger, log_invocation
+from resume_tailor_core.tracing import span
+from resume_tailor_core.result_store import load_result
+from resume_tailor_core.jd_store import load_job_description
+from resume_tailor_core.http_cache import REVALIDATE, is_not_modified, not_modified, presigned_pdf_url, url_entity_tag
 
 BUCKET_NAME = 'resume-tailor-bucket.kp'
 
 
+@log_invocation
 def lambda_handler(event, context):
     # Initialize logger
     logger = create_logger('get_score')
@@ -39,6 +37,15 @@ def lambda_handler(event, context):
         logger.info("Query parameters extracted successfully", {
             'result_id': result_id
         })
+
+        # Results are written once and never updated, so the ID is the version
+        etag = url_entity_tag(result_id)
+        if is_not_modified(event, etag):
+            logger.info("Analysis result not modified", {
+                'result_id': result_id
+            })
+            logger.put_metric('ConditionalGet', 1, unit='Count', outcome='not_modified')
+            return not_modified(etag)
         
         # Get result from DynamoDB
         logger.info("Retrieving analysis result from DynamoDB", {
@@ -46,11 +53,12 @@ def lambda_handler(event, context):
             'result_id': result_id
         })
         
-        dynamodb_start = time.time()
-        response = table.get_item(Key={'resultId': result_id})
-        dynamodb_duration = (time.time() - dynamodb_start) * 1000
-        
-        item = response.get('Item')
+        with span('dynamodb.get_item'):
+            dynamodb_start = time.time()
+            # Large attributes stay compressed until the response reads them
+            item = load_result(result_id)
+            dynamodb_duration = (time.time() - dynamodb_start) * 1000
+        logger.put_metric('ServiceLatency', dynamodb_duration, service='dynamodb', operation='get_item')
 
         if not item:
             logger.warning("Analysis result not found", {
@@ -71,6 +79,7 @@ def lambda_handler(event, context):
             'has_feedback': 'feedback' in item,
             'has_resume_id': 'resumeId' in item,
             'has_resume_text': 'resumeText' in item,
+            'offloaded_to_s3': item.offloaded,
             'input_mode': input_mode
         })
 
@@ -89,18 +98,10 @@ def lambda_handler(event, context):
             
             s3_start = time.time()
             try:
-                file_content = s3.generate_presigned_url(
-                    ClientMethod='get_object',
-                    Params={
-                        'Bucket': BUCKET_NAME,
-                        'Key': item['resumeId'],
-                        'ResponseContentDisposition': 'inline',
-                        'ResponseContentType': 'application/pdf'
-
-                    },
-                    ExpiresIn=3600
-                )
+                with span('s3.generate_presigned_url'):
+                    file_content = presigned_pdf_url(BUCKET_NAME, item['resumeId'])
                 s3_duration = (time.time() - s3_start) * 1000
+                logger.put_metric('ServiceLatency', s3_duration, service='s3', operation='generate_presigned_url')
                 
                 logger.info("Presigned URL generated successfully", {
                     'duration_ms': round(s3_duration, 2),
@@ -109,6 +110,7 @@ def lambda_handler(event, context):
 
             except Exception as e:
                 s3_duration = (time.time() - s3_start) * 1000
+                logger.put_metric('ServiceLatency', s3_duration, service='s3', operation='generate_presigned_url')
                 logger.error("Failed to generate presigned URL for resume file", {
                     'duration_ms': round(s3_duration, 2),
                     'error': str(e),
@@ -120,11 +122,25 @@ def lambda_handler(event, context):
                     'body': json.dumps({'error': f'Error retrieving file from S3: {str(e)}'}),
                 }
 
+        # Newer results reference the job description by hash instead of holding it
+        job_description = item.get('jobDescription', '')
+        if 'jobDescription' not in item and item.get('jdHash'):
+            with span('dynamodb.load_job_description'):
+                jd_start = time.time()
+                jd_record = load_job_description(item['jdHash'])
+                jd_duration = (time.time() - jd_start) * 1000
+            logger.put_metric('ServiceLatency', jd_duration, service='dynamodb', operation='load_job_description')
+            if jd_record is None:
+                logger.warning("Job description not found", {'jd_hash': item['jdHash']})
+            else:
+                job_description = jd_record['text']
+
         # Prepare response
         response_data = {
             'resultId': result_id,
             'fileContent': file_content,
-            'jobDescription': item.get('jobDescription', ''),
+            'jobDescription': job_description,
+            'jdHash': item.get('jdHash'),
             'score': str(item['score']),
             'feedback': item['feedback']
         }
@@ -138,6 +154,11 @@ def lambda_handler(event, context):
 
         return {
             'statusCode': 200,
+            'headers': {
+                'Content-Type': 'application/json',
+                'ETag': etag,
+                'Cache-Control': REVALIDATE
+            },
             'body': json.dumps(response_data),
         }
 
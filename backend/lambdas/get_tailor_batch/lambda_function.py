@@ -0,0 +1,148 @@
+import json
+import os
+import sys
+import time
+
+# Add parent directory to path so resume_tailor_core resolves outside the Lambda layer
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from resume_tailor_core.logger import create_logger, log_invocation
+from resume_tailor_core.tracing import span
+from resume_tailor_core.tailor_store import (FAILED, TIMED_OUT, batch_result_key, is_stalled, load_batch,
+                                             load_tailored)
+from resume_tailor_core.http_cache import REVALIDATE, entity_tag, is_not_modified, not_modified
+
+
+def batch_view(batch):
+    """The status item as the dashboard shows it: each job with its outcome so far"""
+    outcomes = {int(outcome['index']): outcome for outcome in batch.get('outcomes', [])}
+    # Jobs of a failed batch that never ran will not run
+    unfinished = 'failed' if batch['status'] == FAILED else 'pending'
+    jobs = []
+    for job in batch['jobs']:
+        index = int(job['index'])
+        outcome = outcomes.get(index, {})
+        jobs.append({
+            'index': index,
+            'jdHash': job['jdHash'],
+            'title': job['title'],
+            'state': outcome.get('state', unfinished),
+            'changes': int(outcome['changes']) if 'changes' in outcome else None,
+            'error': outcome.get('error', batch.get('error') if unfinished == 'failed' else None)
+        })
+    return {
+        'batchId': batch['batchId'],
+        'status': batch['status'],
+        'total': int(batch['total']),
+        'completed': int(batch['completed']),
+        'failed': int(batch['failed']),
+        'jobs': jobs,
+        'error': batch.get('error'),
+        'createdAt': batch['createdAt'],
+        'updatedAt': batch['updatedAt']
+    }
+
+
+@log_invocation
+def lambda_handler(event, context):
+    # Initialize logger
+    logger = create_logger('get_tailor_batch')
+    logger.log_function_start(event, context)
+
+    try:
+        claims = event.get('requestContext', {}).get('authorizer', {}).get('jwt', {}).get('claims', {})
+        user_id = claims.get('sub')
+        if not user_id:
+            logger.error("Missing user ID in claims", {'has_claims': bool(claims)})
+            return {
+                "statusCode": 401,
+                "body": json.dumps({"error": "Unauthorized: User ID not found"}),
+            }
+
+        query_parameters = event.get('queryStringParameters') or {}
+        batch_id = query_parameters.get('batchId')
+        if not batch_id:
+            return {
+                'statusCode': 400,
+                'body': json.dumps({'error': 'batchId is required in query parameters'})
+            }
+
+        # ?index=N: one tailored result, which never changes once written
+        if query_parameters.get('index') is not None:
+            try:
+                index = int(query_parameters['index'])
+            except ValueError:
+                return {
+                    'statusCode': 400,
+                    'body': json.dumps({'error': 'index must be an integer'})
+                }
+            tailor_id = batch_result_key(batch_id, index)
+            etag = entity_tag(user_id, tailor_id)
+            if is_not_modified(event, etag):
+                logger.put_metric('ConditionalGet', 1, unit='Count', outcome='not_modified')
+                return not_modified(etag)
+
+            with span('dynamodb.get_item', kind='result'):
+                dynamodb_start = time.time()
+                result = load_tailored(user_id, tailor_id)
+                dynamodb_duration = (time.time() - dynamodb_start) * 1000
+            logger.put_metric('ServiceLatency', dynamodb_duration, service='dynamodb', operation='get_item')
+            if result is None:
+                return {
+                    'statusCode': 404,
+                    'body': json.dumps({'error': 'Tailored resume not found'})
+                }
+            logger.info("Tailored result retrieved", {'batch_id': batch_id, 'index': index})
+            return {
+                'statusCode': 200,
+                'headers': {'Content-Type': 'application/json', 'ETag': etag, 'Cache-Control': REVALIDATE},
+                'body': json.dumps({
+                    'batchId': batch_id,
+                    'index': index,
+                    'resumeItems': result['resumeItems'],
+                    'jdHash': result.get('jdHash'),
+                    'changes': int(result.get('changes', 0))
+                })
+            }
+
+        # The status item is small; polling it is one read, and a bodyless 304 until it changes
+        with span('dynamodb.get_item', kind='status'):
+            dynamodb_start = time.time()
+            batch = load_batch(user_id, batch_id)
+            dynamodb_duration = (time.time() - dynamodb_start) * 1000
+        logger.put_metric('ServiceLatency', dynamodb_duration, service='dynamodb', operation='get_item')
+        if batch is None:
+            return {
+                'statusCode': 404,
+                'body': json.dumps({'error': f'Batch not found: {batch_id}'})
+            }
+
+        if is_stalled(batch):
+            # The worker timed out or never ran; polling would otherwise wait forever
+            logger.warning("Batch stalled, reporting it as failed", {'batch_id': batch_id, 'status': batch['status']})
+            batch = dict(batch, status=FAILED, error=batch.get('error') or TIMED_OUT)
+
+        etag = entity_tag(user_id, batch_id, batch['updatedAt'], batch['status'])
+        if is_not_modified(event, etag):
+            logger.put_metric('ConditionalGet', 1, unit='Count', outcome='not_modified')
+            return not_modified(etag)
+
+        view = batch_view(batch)
+        logger.info("Batch status retrieved", {
+            'batch_id': batch_id,
+            'status': view['status'],
+            'completed': view['completed'],
+            'failed': view['failed'],
+            'total': view['total']
+        })
+        return {
+            'statusCode': 200,
+            'headers': {'Content-Type': 'application/json', 'ETag': etag, 'Cache-Control': REVALIDATE},
+            'body': json.dumps(view)
+        }
+
+    except Exception as e:
+        logger.error("Unexpected error retrieving batch", {'error': str(e)})
+        return {
+            'statusCode': 500,
+            'body': json.dumps({'error': f'Internal Server Error: {str(e)}'}),
+        }
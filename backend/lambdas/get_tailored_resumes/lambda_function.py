@@ -1,17 +1,19 @@
-import boto3
 import json
 import os
 import sys
 import time
 
-# Add parent directory to path for imports
+# Add parent directory to path so resume_tailor_core resolves outside the Lambda layer
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from logger_utils import create_logger
+from resume_tailor_core.logger import create_logger, log_invocation
+from resume_tailor_core.tracing import span
+from resume_tailor_core.clients import get_client
+from resume_tailor_core.http_cache import presigned_pdf_url
 
-s3 = boto3.client("s3")
 BUCKET_NAME = 'resume-tailor-bucket.kp'
 
 
+@log_invocation
 def lambda_handler(event, context):
     # Initialize logger
     logger = create_logger('get_tailored_resumes')
@@ -46,27 +48,31 @@ def lambda_handler(event, context):
         # List files in S3
         fileKeys = []
         files = []
-        s3_list_start = time.time()
+        with span('s3.list_objects_v2'):
+            s3_list_start = time.time()
         
-        paginator = s3.get_paginator("list_objects_v2")
-        page_count = 0
-        total_objects = 0
+            s3 = get_client("s3")
+            paginator = s3.get_paginator("list_objects_v2")
+            page_count = 0
+            total_objects = 0
         
-        for page in paginator.paginate(Bucket=BUCKET_NAME, Prefix=prefix):
-            page_count += 1
-            objects_in_page = len(page.get("Contents", []))
-            total_objects += objects_in_page
+            for page in paginator.paginate(Bucket=BUCKET_NAME, Prefix=prefix):
+                page_count += 1
+                objects_in_page = len(page.get("Contents", []))
+                total_objects += objects_in_page
             
-            logger.debug(f"Processing S3 page {page_count}", {
-                'objects_in_page': objects_in_page,
-                'bucket': BUCKET_NAME,
-                'prefix': prefix
-            })
+                logger.debug(f"Processing S3 page {page_count}", {
+                    'objects_in_page': objects_in_page,
+                    'bucket': BUCKET_NAME,
+                    'prefix': prefix
+                })
             
-            for obj in page.get("Contents", []):
-                fileKeys.append(obj["Key"])
+                for obj in page.get("Contents", []):
+                    fileKeys.append(obj["Key"])
+        
+            s3_list_duration = (time.time() - s3_list_start) * 1000
         
-        s3_list_duration = (time.time() - s3_list_start) * 1000
+        logger.put_metric('ServiceLatency', s3_list_duration, service='s3', operation='list_objects_v2')
         
         logger.info("S3 file listing completed", {
             'duration_ms': round(s3_list_duration, 2),
@@ -77,35 +83,28 @@ def lambda_handler(event, context):
         
         # Generate presigned URLs for each file
         logger.info("Generating presigned URLs for tailored resumes")
-        url_generation_start = time.time()
-        successful_urls = 0
-        failed_urls = 0
+        with span('s3.generate_presigned_url'):
+            url_generation_start = time.time()
+            successful_urls = 0
+            failed_urls = 0
         
-        for key in fileKeys:
-            try:
-                url = s3.generate_presigned_url(
-                    ClientMethod='get_object',
-                    Params={
-                        'Bucket': BUCKET_NAME,
-                        'Key': key,
-                        'ResponseContentDisposition': 'inline',
-                        'ResponseContentType': 'application/pdf'
+            for key in fileKeys:
+                try:
+                    url = presigned_pdf_url(BUCKET_NAME, key)
 
-                    },
-                    ExpiresIn=3600
-                )
-
-                files.append({"name": key.split("/")[3], "url": url})
-                successful_urls += 1
+                    files.append({"name": key.split("/")[3], "url": url})
+                    successful_urls += 1
                 
-            except Exception as e:
-                failed_urls += 1
-                logger.warning("Failed to generate presigned URL for file", {
-                    'file_key': key,
-                    'error': str(e)
-                })
+                except Exception as e:
+                    failed_urls += 1
+                    logger.warning("Failed to generate presigned URL for file", {
+                        'file_key': key,
+                        'error': str(e)
+                    })
+        
+            url_generation_duration = (time.time() - url_generation_start) * 1000
         
-        url_generation_duration = (time.time() - url_generation_start) * 1000
+        logger.put_metric('ServiceLatency', url_generation_duration, service='s3', operation='generate_presigned_url')
         
         logger.info("Presigned URL generation completed", {
             'duration_ms': round(url_generation_duration, 2),
@@ -3,12 +3,14 @@ import sys
 import os
 import time
 
-# Add parent directory to path for imports
+# Add parent directory to path so resume_tailor_core resolves outside the Lambda layer
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from logger_utils import create_logger
-from rate_limiter import create_rate_limiter
+from resume_tailor_core.logger import create_logger, log_invocation
+from resume_tailor_core.tracing import span
+from resume_tailor_core.rate_limiter import create_rate_limiter
 
 
+@log_invocation
 def lambda_handler(event, context):
     # Initialize logger
     logger = create_logger('get_usage_stats')
@@ -24,6 +26,7 @@ def lambda_handler(event, context):
         if claims and claims.get('sub'):
             # Authenticated user
             identifier, user_type = rate_limiter.get_user_identifier(event, claims)
+            logger.set_metric_dimensions(user_type=user_type)
             logger.info("Authenticated user identified", {
                 'user_type': user_type,
                 'user_id': claims.get('sub'),
@@ -32,6 +35,7 @@ def lambda_handler(event, context):
         else:
             # Guest user
             identifier, user_type = rate_limiter.get_user_identifier(event)
+            logger.set_metric_dimensions(user_type=user_type)
             logger.info("Guest user identified", {
                 'user_type': user_type,
                 'identifier': 'guest_***',
@@ -41,13 +45,17 @@ def lambda_handler(event, context):
         # Get usage stats for both services
         logger.info("Retrieving usage statistics for all services")
         
-        bedrock_start = time.time()
-        bedrock_count, bedrock_limit, _ = rate_limiter.get_usage_stats(identifier, 'bedrock_requests')
-        bedrock_duration = (time.time() - bedrock_start) * 1000
+        with span('dynamodb.get_item'):
+            bedrock_start = time.time()
+            bedrock_count, bedrock_limit, _ = rate_limiter.get_usage_stats(identifier, 'bedrock_requests')
+            bedrock_duration = (time.time() - bedrock_start) * 1000
+        logger.put_metric('ServiceLatency', bedrock_duration, service='dynamodb', operation='get_item')
         
-        textract_start = time.time()
-        textract_count, textract_limit, _ = rate_limiter.get_usage_stats(identifier, 'textract_requests')
-        textract_duration = (time.time() - textract_start) * 1000
+        with span('dynamodb.get_item'):
+            textract_start = time.time()
+            textract_count, textract_limit, _ = rate_limiter.get_usage_stats(identifier, 'textract_requests')
+            textract_duration = (time.time() - textract_start) * 1000
+        logger.put_metric('ServiceLatency', textract_duration, service='dynamodb', operation='get_item')
         
         logger.info("Usage statistics retrieved successfully", {
             'bedrock_current_usage': bedrock_count,
@@ -1,35 +1,26 @@
 import json
-import base64
-import boto3
 import os
 import sys
-import re
 from datetime import datetime
 import time
 
-# Add parent directory to path for imports
+# Add parent directory to path so resume_tailor_core resolves outside the Lambda layer
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from logger_utils import create_logger
-from rate_limiter import create_rate_limiter
-
-s3 = boto3.client("s3")
-textract = boto3.client("textract")
-bedrock = boto3.client("bedrock-runtime", region_name="us-east-2")
-dynamodb = boto3.resource("dynamodb")
-table = dynamodb.Table("ResumeMetadata")
+from resume_tailor_core.logger import create_logger, log_invocation
+from resume_tailor_core.tracing import span
+from resume_tailor_core.rate_limiter import create_rate_limiter
+from resume_tailor_core.validation import decode_and_validate_pdf, UploadValidationError
+from resume_tailor_core.clients import get_client, get_table
+from resume_tailor_core.json_parser import load_model_json
+from resume_tailor_core.resume_store import TABLE_NAME, master_item
+from resume_tailor_core.http_cache import presigned_pdf_url, url_entity_tag
 
+BEDROCK_REGION = "us-east-2"
 MODEL_ID = 'arn:aws:bedrock:us-east-2:429744659578:inference-profile/us.anthropic.claude-3-haiku-20240307-v1:0'
 BUCKET_NAME = 'resume-tailor-bucket.kp'
 
 
-def clean_json_string(text):
-    """Clean control characters from text that might break JSON parsing"""
-    # Remove or replace common control characters that break JSON parsing
-    # Keep newlines and tabs as they're valid in JSON strings when properly escaped
-    cleaned = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', '', text)
-    return cleaned
-
-
+@log_invocation
 def lambda_handler(event, context):
     # Initialize logger
     logger = create_logger('process_master_resume')
@@ -37,14 +28,18 @@ def lambda_handler(event, context):
     
     try:
         logger.info("Parsing request body")
-        body = json.loads(event["body"])
-        claims = event.get('requestContext', {}).get('authorizer', {}).get('jwt', {}).get('claims', {})
-        user_id = claims.get('sub')
-        base64_file = body["file"]
+        with span('parse'):
+            body = json.loads(event["body"])
+            claims = event.get('requestContext', {}).get('authorizer', {}).get('jwt', {}).get('claims', {})
+            user_id = claims.get('sub')
+        
+            # Reject invalid uploads before they cost a rate limit increment
+            file_data, page_count = decode_and_validate_pdf(body["file"])
         
         logger.info("Request parsed successfully", {
             'user_id': user_id,
-            'file_size_bytes': len(base64_file) if base64_file else 0,
+            'file_size_bytes': len(file_data),
+            'page_count': page_count,
             'has_claims': bool(claims)
         })
         
@@ -52,6 +47,7 @@ def lambda_handler(event, context):
         logger.info("Initializing rate limiter")
         rate_limiter = create_rate_limiter()
         identifier, user_type = rate_limiter.get_user_identifier(event, claims)
+        logger.set_metric_dimensions(user_type=user_type)
         
         logger.info("User identified", {
             'user_type': user_type,
@@ -120,15 +116,17 @@ def lambda_handler(event, context):
         # Step 1: Upload PDF to S3
         logger.info("Uploading PDF to S3")
         s3_key = f"users/master/{user_id}.pdf"
-        s3_start = time.time()
-        s3.put_object(
-            Bucket=BUCKET_NAME,
-            Key=s3_key,
-            Body=base64.b64decode(base64_file),
-            ContentType="application/pdf",
-            ContentDisposition="inline"
-        )
-        s3_upload_duration = (time.time() - s3_start) * 1000
+        with span('s3.put_object'):
+            s3_start = time.time()
+            get_client("s3").put_object(
+                Bucket=BUCKET_NAME,
+                Key=s3_key,
+                Body=file_data,
+                ContentType="application/pdf",
+                ContentDisposition="inline"
+            )
+            s3_upload_duration = (time.time() - s3_start) * 1000
+        logger.put_metric('ServiceLatency', s3_upload_duration, service='s3', operation='put_object')
         
         logger.info("PDF uploaded to S3 successfully", {
             'duration_ms': round(s3_upload_duration, 2),
@@ -138,55 +136,59 @@ def lambda_handler(event, context):
 
         # Step 2: Start Textract job
         logger.info("Starting Textract document analysis job")
-        textract_start = time.time()
-        response = textract.start_document_text_detection(
-            DocumentLocation={"S3Object": {"Bucket": BUCKET_NAME, "Name": s3_key}}
-        )
-        job_id = response["JobId"]
-        
-        logger.info("Textract job started", {
-            'job_id': job_id,
-            'bucket': BUCKET_NAME,
-            's3_key': s3_key
-        })
-
-        # Poll for job completion
-        max_retries = 20
-        delay = 1  # seconds
-        logger.info("Polling for Textract job completion", {
-            'max_retries': max_retries,
-            'delay_seconds': delay
-        })
+        with span('textract.document_text_detection_job'):
+            textract_start = time.time()
+            textract = get_client("textract")
+            response = textract.start_document_text_detection(
+                DocumentLocation={"S3Object": {"Bucket": BUCKET_NAME, "Name": s3_key}}
+            )
+            job_id = response["JobId"]
         
-        for j in range(max_retries):
-            result = textract.get_document_text_detection(JobId=job_id)
-            status = result["JobStatus"]
-            
-            logger.info(f"Textract job status check {j+1}/{max_retries}", {
+            logger.info("Textract job started", {
                 'job_id': job_id,
-                'status': status,
-                'attempt': j+1
+                'bucket': BUCKET_NAME,
+                's3_key': s3_key
             })
 
-            if status == "SUCCEEDED":
-                break
-            elif status in ("FAILED", "PARTIAL_SUCCESS"):
-                logger.error("Textract job failed", {
+            # Poll for job completion
+            max_retries = 20
+            delay = 1  # seconds
+            logger.info("Polling for Textract job completion", {
+                'max_retries': max_retries,
+                'delay_seconds': delay
+            })
+        
+            for j in range(max_retries):
+                result = textract.get_document_text_detection(JobId=job_id)
+                status = result["JobStatus"]
+            
+                logger.info(f"Textract job status check {j+1}/{max_retries}", {
                     'job_id': job_id,
                     'status': status,
-                    'attempts': j+1
+                    'attempt': j+1
+                }, sample_key='textract_poll', sample_every=5)
+
+                if status == "SUCCEEDED":
+                    break
+                elif status in ("FAILED", "PARTIAL_SUCCESS"):
+                    logger.error("Textract job failed", {
+                        'job_id': job_id,
+                        'status': status,
+                        'attempts': j+1
+                    })
+                    raise Exception(f"Textract job failed with status: {status}")
+                time.sleep(delay)
+            else:
+                logger.error("Textract job timeout", {
+                    'job_id': job_id,
+                    'max_retries': max_retries,
+                    'total_wait_time_seconds': max_retries * delay
                 })
-                raise Exception(f"Textract job failed with status: {status}")
-            time.sleep(delay)
-        else:
-            logger.error("Textract job timeout", {
-                'job_id': job_id,
-                'max_retries': max_retries,
-                'total_wait_time_seconds': max_retries * delay
-            })
-            raise TimeoutError("Textract job did not finish in time.")
+                raise TimeoutError("Textract job did not finish in time.")
     
-        textract_job_duration = (time.time() - textract_start) * 1000
+            textract_job_duration = (time.time() - textract_start) * 1000
+    
+        logger.put_metric('ServiceLatency', textract_job_duration, service='textract', operation='document_text_detection_job')
         logger.info("Textract job completed successfully", {
             'job_id': job_id,
             'duration_ms': round(textract_job_duration, 2),
@@ -231,7 +233,8 @@ def lambda_handler(event, context):
 
         # Step 3: Send to Claude to extract structured items
         logger.info("Preparing prompt for Bedrock AI analysis")
-        prompt = f"""
+        with span('prompt_build'):
+            prompt = f"""
 Extract the following resume into structured JSON format.
 
 Return a list of items like:
@@ -262,24 +265,26 @@ Do not return anything but the JSON list of items.
             'resume_text_length': len(resume_text)
         })
 
-        bedrock_start = time.time()
-        bedrock_response = bedrock.invoke_model(
-            modelId=MODEL_ID,
-            body=json.dumps({
-                "anthropic_version": "bedrock-2023-05-31",
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                "max_tokens": 2048,
-                "temperature": 0.3
-            }),
-            contentType="application/json",
-            accept="application/json",
-        )
-        bedrock_duration = (time.time() - bedrock_start) * 1000
+        with span('bedrock.invoke_model'):
+            bedrock_start = time.time()
+            bedrock_response = get_client("bedrock-runtime", region_name=BEDROCK_REGION).invoke_model(
+                modelId=MODEL_ID,
+                body=json.dumps({
+                    "anthropic_version": "bedrock-2023-05-31",
+                    "messages": [
+                        {
+                            "role": "user",
+                            "content": prompt
+                        }
+                    ],
+                    "max_tokens": 2048,
+                    "temperature": 0.3
+                }),
+                contentType="application/json",
+                accept="application/json",
+            )
+            bedrock_duration = (time.time() - bedrock_start) * 1000
+        logger.put_metric('ServiceLatency', bedrock_duration, service='bedrock', operation='invoke_model')
 
         logger.info("Bedrock AI analysis completed", {
             'duration_ms': round(bedrock_duration, 2)
@@ -287,10 +292,10 @@ Do not return anything but the JSON list of items.
 
         output = json.loads(bedrock_response['body'].read())
         
-        # Clean control characters before parsing JSON
+        # Extract the JSON array from the response text
         raw_text = output['content'][0]['text']
-        cleaned_text = clean_json_string(raw_text)
-        content = json.loads(cleaned_text)
+        logger.capture_payload('model_response', raw_text)
+        content = load_model_json(raw_text, expect=list)
         
         logger.info("AI analysis results processed", {
             'extracted_items_count': len(content) if isinstance(content, list) else 0,
@@ -299,17 +304,13 @@ Do not return anything but the JSON list of items.
 
         # Step 4: Save to DynamoDB
         logger.info("Saving processed resume to DynamoDB")
+        updated_at = datetime.now().isoformat()
         dynamodb_start = time.time()
         try:
-            table.put_item(
-                Item={
-                    "resume_id": user_id,
-                    "s3_key": s3_key,
-                    "entries": content,
-                    "updatedAt": datetime.now().isoformat()
-                }
-            )
+            with span('dynamodb.put_item'):
+                get_table(TABLE_NAME).put_item(Item=master_item(user_id, s3_key, content, updated_at))
             dynamodb_duration = (time.time() - dynamodb_start) * 1000
+            logger.put_metric('ServiceLatency', dynamodb_duration, service='dynamodb', operation='put_item')
             logger.info("Resume saved to DynamoDB successfully", {
                 'duration_ms': round(dynamodb_duration, 2),
                 'table_name': 'ResumeMetadata',
@@ -317,6 +318,7 @@ Do not return anything but the JSON list of items.
             })
         except Exception as e:
             dynamodb_duration = (time.time() - dynamodb_start) * 1000
+            logger.put_metric('ServiceLatency', dynamodb_duration, service='dynamodb', operation='put_item')
             logger.error("Failed to save resume to DynamoDB", {
                 'duration_ms': round(dynamodb_duration, 2),
                 'error': str(e),
@@ -328,6 +330,10 @@ Do not return anything but the JSON list of items.
                 "body": json.dumps({"error": "Failed to save to DynamoDB", "details": str(e)})
             }
 
+        # Return what the client would otherwise refetch from get_master_resume
+        with span('s3.generate_presigned_url'):
+            url = presigned_pdf_url(BUCKET_NAME, s3_key)
+
         logger.info("Master resume processing completed successfully", {
             'total_s3_duration_ms': round(s3_upload_duration, 2),
             'total_textract_duration_ms': round(textract_job_duration, 2),
@@ -344,10 +350,14 @@ Do not return anything but the JSON list of items.
                 "X-RateLimit-Textract-Remaining": str(textract_limit - textract_count),
                 "X-RateLimit-Bedrock-Limit": str(bedrock_limit),
                 "X-RateLimit-Bedrock-Remaining": str(bedrock_limit - bedrock_count),
-                "X-RateLimit-Reset": str(int(time.time()) + (24 * 3600))
+                "X-RateLimit-Reset": str(int(time.time()) + (24 * 3600)),
+                "ETag": url_entity_tag(user_id, updated_at)
             },
             "body": json.dumps({
-                "s3Key": s3_key
+                "s3Key": s3_key,
+                "url": url,
+                "entries": content,
+                "version": updated_at
             })
         }
 
@@ -357,6 +367,15 @@ Do not return anything but the JSON list of items.
             "statusCode": 400,
             "body": json.dumps({"error": "Invalid JSON in request body"})
         }
+    except UploadValidationError as e:
+        logger.warning("Master resume upload rejected by validation", {
+            'error': e.message,
+            'status_code': e.status_code
+        })
+        return {
+            "statusCode": e.status_code,
+            "body": json.dumps({"error": e.message})
+        }
     except KeyError as e:
         logger.error("Missing required field in request", {'missing_field': str(e)})
         return {
@@ -0,0 +1,12 @@
+"""
+Shared code for the Resume Tailor Lambda functions.
+
+Deployed once as a Lambda layer (see LambdaDeployer.build_core_layer) and
+imported by every function:
+
+    clients       lazily constructed, cached boto3 clients
+    logger        structured JSON logging
+    rate_limiter  daily per-user/per-IP API quotas
+    json_parser   cleaning and parsing of model responses
+    validation    upload validation
+"""
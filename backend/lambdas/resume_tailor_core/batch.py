@@ -0,0 +1,43 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Helpers for running many independent model calls and writing their results.
+#
+# map_bounded runs at most `concurrency` calls at a time, so one large batch
+# cannot use up the account's Bedrock concurrency, and copies the caller's
+# context into each worker, so spans join the caller's trace and
+# current_logger() is the invocation's logger (both are context variables).
+# write_items uses the table's batch writer: 25 items per BatchWriteItem
+# call, with unprocessed items retried by boto3.
+
+DEFAULT_CONCURRENCY = 4
+
+
+def map_bounded(function: Callable[[Any], Any], items: Sequence[Any],
+                concurrency: int = DEFAULT_CONCURRENCY) -> List[Tuple[Any, Optional[Exception]]]:
+    """
+    function applied to each item, at most concurrency at a time. Returns
+    (result, None) or (None, exception) per item, in the order of items.
+    """
+    def call(item):
+        try:
+            return function(item), None
+        except Exception as e:
+            return None, e
+
+    if not items:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(items)))) as executor:
+        futures = [executor.submit(contextvars.copy_context().run, call, item) for item in items]
+        return [future.result() for future in futures]
+
+
+def write_items(table, items: Iterable[Dict[str, Any]]) -> int:
+    """Put items with BatchWriteItem; returns how many were written"""
+    count = 0
+    with table.batch_writer() as batch:
+        for item in items:
+            batch.put_item(Item=item)
+            count += 1
+    return count
@@ -0,0 +1,195 @@
+import json
+import uuid
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .batch import DEFAULT_CONCURRENCY, map_bounded, write_items
+from .clients import get_client, get_table
+from .jd_store import clean_text, jd_hash, save_job_description
+from .prescore import INVALID_FEEDBACK, check_job_description, keyword_overlap
+from .result_store import BUCKET_NAME, TABLE_NAME, encode_result, new_result
+from .scoring import BEDROCK_REGION, MODEL_ID, format_prompt, model_request, parse_score
+
+# Scoring one resume against many job descriptions, with the resume extracted
+# once. A batch is a list of jobs, one per distinct job description after
+# cleaning; duplicates in the input share a job. Each job is a dict that the
+# stages below fill in:
+#
+#     plan_jobs        recordId, jdHash, jobDescription (cleaned), inputs
+#                      (positions in the input list) and `invalid`, the
+#                      pre-scorer's reason when the text cannot be scored
+#     prepare_jobs     stores the job descriptions; adds prompt and coverage,
+#                      and storeError when the JobDescriptions write failed
+#     score_jobs       score and feedback, or error, from invoke_model calls
+#                      made at most `concurrency` at a time
+#     store_results    resultId, after writing the results with BatchWriteItem
+#
+# For runs too large to wait on, batch_inference_records writes the same
+# requests in the Bedrock batch inference JSONL format ({recordId,
+# modelInput}), and apply_batch_output reads the job's output back in place
+# of score_jobs.
+
+MAX_TITLE_LENGTH = 80
+
+
+def extract_text(document: Dict[str, Any]) -> str:
+    """Resume text from Textract, for a Document of S3Object or Bytes"""
+    response = get_client('textract').detect_document_text(Document=document)
+    return '\n'.join(block['Text'] for block in response['Blocks'] if block['BlockType'] == 'LINE')
+
+
+def resume_document(s3_key: str) -> Dict[str, Any]:
+    """The Textract Document for a resume uploaded to the app's bucket"""
+    return {'S3Object': {'Bucket': BUCKET_NAME, 'Name': s3_key}}
+
+
+def plan_jobs(job_descriptions: Iterable[str]) -> List[Dict[str, Any]]:
+    """One job per distinct cleaned job description, checked by the pre-scorer"""
+    jobs = {}
+    for position, text in enumerate(job_descriptions):
+        cleaned = clean_text(text)
+        digest = jd_hash(cleaned)
+        if digest not in jobs:
+            jobs[digest] = {
+                'recordId': f'{len(jobs):05d}',
+                'jdHash': digest,
+                'jobDescription': cleaned,
+                'inputs': [],
+                'invalid': check_job_description(cleaned)
+            }
+        jobs[digest]['inputs'].append(position)
+    return list(jobs.values())
+
+
+def model_jobs(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """The jobs that need a model call"""
+    return [job for job in jobs if not job['invalid']]
+
+
+def prepare_jobs(jobs: List[Dict[str, Any]], resume_text: str, guest: bool = False,
+                 concurrency: int = DEFAULT_CONCURRENCY) -> None:
+    """Store each valid job description and build its prompt with the keyword overlap"""
+    def prepare(job):
+        keywords = None
+        try:
+            record = save_job_description(job['jobDescription'], guest=guest)
+            keywords = record['keywords']
+            job['stored'] = True
+        except Exception as e:
+            # The result keeps the text itself instead of its hash
+            job['stored'] = False
+            job['storeError'] = str(e)
+        overlap = keyword_overlap(resume_text, keywords, job['jobDescription'])
+        job['coverage'] = overlap['coverage']
+        job['prompt'] = format_prompt(resume_text, job['jobDescription'], overlap)
+
+    map_bounded(prepare, model_jobs(jobs), concurrency)
+
+
+def _finish_invalid(jobs: List[Dict[str, Any]]) -> None:
+    for job in jobs:
+        if job['invalid']:
+            job['score'], job['feedback'] = 0, [INVALID_FEEDBACK[job['invalid']]]
+
+
+def score_jobs(jobs: List[Dict[str, Any]], concurrency: int = DEFAULT_CONCURRENCY) -> None:
+    """Score the prepared jobs with invoke_model, at most concurrency calls at a time"""
+    bedrock = get_client('bedrock-runtime', region_name=BEDROCK_REGION)
+
+    def score(job):
+        response = bedrock.invoke_model(
+            modelId=MODEL_ID,
+            body=json.dumps(model_request(job['prompt'])),
+            contentType='application/json',
+            accept='application/json'
+        )
+        output = json.loads(response['body'].read())
+        return parse_score(output['content'][0]['text'])
+
+    pending = model_jobs(jobs)
+    for job, (result, error) in zip(pending, map_bounded(score, pending, concurrency)):
+        if error is not None:
+            job['error'] = str(error)
+        else:
+            job['score'], job['feedback'] = result
+    _finish_invalid(jobs)
+
+
+def batch_inference_records(jobs: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """The prepared jobs as Bedrock batch inference input records"""
+    for job in model_jobs(jobs):
+        yield {'recordId': job['recordId'], 'modelInput': model_request(job['prompt'])}
+
+
+def apply_batch_output(jobs: List[Dict[str, Any]], lines: Iterable[str]) -> None:
+    """Fill in scores from a batch inference job's output records, in place of score_jobs"""
+    by_record = {job['recordId']: job for job in model_jobs(jobs)}
+    for line in lines:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        job = by_record.get(record.get('recordId'))
+        if job is None:
+            continue
+        if record.get('error') or 'modelOutput' not in record:
+            job['error'] = json.dumps(record.get('error')) if record.get('error') else 'No model output'
+            continue
+        try:
+            job['score'], job['feedback'] = parse_score(record['modelOutput']['content'][0]['text'])
+        except Exception as e:
+            job['error'] = str(e)
+    for job in by_record.values():
+        if 'score' not in job and 'error' not in job:
+            job['error'] = 'Missing from batch output'
+    _finish_invalid(jobs)
+
+
+def store_results(jobs: List[Dict[str, Any]], s3_key: Optional[str] = None, resume_text: Optional[str] = None,
+                  user_id: Optional[str] = None, table=None) -> int:
+    """Write a ResumeAnalysisResults item per scored job with BatchWriteItem; returns how many"""
+    items = []
+    for job in jobs:
+        if 'score' not in job:
+            continue
+        job['resultId'] = str(uuid.uuid4())
+        item = new_result(job['resultId'], job['score'], job['feedback'], s3_key, resume_text, user_id=user_id)
+        if job.get('stored'):
+            item['jdHash'] = job['jdHash']
+        else:
+            item['jobDescription'] = job['jobDescription']
+        if job['invalid']:
+            item['prescoreReason'] = job['invalid']
+        items.append(encode_result(item))
+    return write_items(table or get_table(TABLE_NAME), items)
+
+
+def ranking(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Scored jobs best first, then jobs that failed"""
+    scored = sorted((job for job in jobs if 'score' in job), key=lambda job: (-job['score'], job['recordId']))
+    failed = [job for job in jobs if 'score' not in job]
+    ranked = []
+    for rank, job in enumerate(scored + failed, start=1):
+        entry = {
+            'rank': rank if 'score' in job else None,
+            'score': job.get('score'),
+            'title': job['jobDescription'].split('\n', 1)[0][:MAX_TITLE_LENGTH],
+            'jdHash': job['jdHash'],
+            'resultId': job.get('resultId'),
+            'coverage': job.get('coverage'),
+            'inputs': job['inputs']
+        }
+        if job['invalid']:
+            entry['invalid'] = job['invalid']
+        if 'error' in job:
+            entry['error'] = job['error']
+        ranked.append(entry)
+    return ranked
+
+
+def score_batch(resume_text: str, job_descriptions: Iterable[str], s3_key: Optional[str] = None,
+                user_id: Optional[str] = None, concurrency: int = DEFAULT_CONCURRENCY) -> List[Dict[str, Any]]:
+    """Score one resume against job descriptions with on-demand model calls and store the results; returns the jobs"""
+    jobs = plan_jobs(job_descriptions)
+    prepare_jobs(jobs, resume_text, concurrency=concurrency)
+    score_jobs(jobs, concurrency)
+    store_results(jobs, s3_key, None if s3_key else resume_text, user_id)
+    return jobs
@@ -0,0 +1,69 @@
+import threading
+
+# Lazily constructed boto3 clients shared by every module in a function.
+# Importing boto3 and building clients is the bulk of a cold start, so nothing
+# is created until a code path actually needs it. Clients are cached for the
+# lifetime of the execution environment and reused across invocations.
+_clients = {}
+_lock = threading.Lock()
+
+
+def _get_or_create(key, factory):
+    instance = _clients.get(key)
+    if instance is None:
+        with _lock:
+            instance = _clients.get(key)
+            if instance is None:
+                instance = factory()
+                _clients[key] = instance
+    return instance
+
+
+def get_client(service_name, region_name=None):
+    """Get a cached boto3 client, creating it on first use"""
+    def factory():
+        import boto3
+        return boto3.client(service_name, region_name=region_name)
+
+    return _get_or_create(('client', service_name, region_name), factory)
+
+
+def get_resource(service_name, region_name=None):
+    """Get a cached boto3 resource, creating it on first use"""
+    def factory():
+        import boto3
+        return boto3.resource(service_name, region_name=region_name)
+
+    return _get_or_create(('resource', service_name, region_name), factory)
+
+
+def get_table(table_name, region_name=None):
+    """Get a cached DynamoDB Table resource"""
+    return _get_or_create(
+        ('table', table_name, region_name),
+        lambda: get_resource('dynamodb', region_name).Table(table_name)
+    )
+
+
+def set_client(service_name, client, region_name=None):
+    """Install a client instance (e.g. a local fake) in place of the boto3 one"""
+    with _lock:
+        _clients[('client', service_name, region_name)] = client
+
+
+def set_resource(service_name, resource, region_name=None):
+    """Install a resource instance (e.g. a local fake) in place of the boto3 one"""
+    with _lock:
+        _clients[('resource', service_name, region_name)] = resource
+
+
+def set_table(table_name, table, region_name=None):
+    """Install a Table instance (e.g. a local fake) in place of the boto3 one"""
+    with _lock:
+        _clients[('table', table_name, region_name)] = table
+
+
+def reset():
+    """Drop all cached clients"""
+    with _lock:
+        _clients.clear()
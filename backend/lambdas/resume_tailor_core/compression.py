@@ -0,0 +1,35 @@
+import json
+import zlib
+from decimal import Decimal
+from typing import Any
+
+# Compact encodings for values stored as DynamoDB Binary attributes. A nested
+# list of maps costs a type descriptor per value on the wire and a
+# TypeDeserializer call per value on every read; one compressed JSON blob is
+# smaller and decodes in a single json.loads.
+
+JSON_ZLIB = 'json+zlib'
+COMPRESSION_LEVEL = 6
+
+
+def _json_default(value):
+    # Values read back from DynamoDB come as Decimal
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def binary_value(value: Any) -> bytes:
+    """Bytes of a Binary attribute as boto3 returns it (a Binary wrapper) or as bytes"""
+    return bytes(getattr(value, 'value', value))
+
+
+def pack_json(value: Any) -> bytes:
+    """value as compact, compressed JSON"""
+    encoded = json.dumps(value, separators=(',', ':'), ensure_ascii=False, default=_json_default)
+    return zlib.compress(encoded.encode('utf-8'), COMPRESSION_LEVEL)
+
+
+def unpack_json(blob: Any) -> Any:
+    """Inverse of pack_json"""
+    return json.loads(zlib.decompress(binary_value(blob)).decode('utf-8'))
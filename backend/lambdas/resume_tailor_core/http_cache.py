@@ -0,0 +1,93 @@
+import hashlib
+import time
+from typing import Any, Dict, Optional
+
+from .clients import get_client
+
+# HTTP caching helpers. Handlers that return a versioned resource (the master
+# resume, whose version is its `updatedAt`; a score result, which never
+# changes) send an ETag, and answer a matching If-None-Match with a bodyless
+# 304 before doing the work of building the response.
+#
+# Those responses also embed presigned S3 URLs, which expire. Presigning is
+# bucketed into windows of URL_REUSE_SECONDS: within a window the same URL is
+# reused, and the window is part of the ETag, so a client's cached copy stops
+# matching when the window ends - at least URL_EXPIRES_SECONDS -
+# URL_REUSE_SECONDS before any URL it holds expires.
+
+URL_EXPIRES_SECONDS = 3600
+URL_REUSE_SECONDS = 3000      # reuse a presigned URL until 10 minutes before it expires
+MAX_CACHED_URLS = 1024
+
+# Cache-Control for per-user JSON: browsers keep a private copy and revalidate
+# it with If-None-Match on every request
+REVALIDATE = 'private, no-cache'
+
+_presigned_urls = {}  # (bucket, key) -> (window, url)
+
+
+def entity_tag(*version_parts: Any) -> str:
+    """Strong ETag (quoted) for a resource identified by version_parts"""
+    digest = hashlib.sha256('\x1f'.join(str(part) for part in version_parts).encode('utf-8')).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def url_window(now: Optional[float] = None) -> int:
+    """Index of the presigned URL reuse window containing now"""
+    return int((time.time() if now is None else now) // URL_REUSE_SECONDS)
+
+
+def url_entity_tag(*version_parts: Any) -> str:
+    """ETag for a response embedding presigned URLs: also changes when the URLs are rotated"""
+    return entity_tag(*version_parts, url_window())
+
+
+def presigned_pdf_url(bucket: str, key: str) -> str:
+    """Presigned GET URL for a PDF, shown inline, reused for the rest of its window"""
+    window = url_window()
+    cached = _presigned_urls.get((bucket, key))
+    if cached is not None and cached[0] == window:
+        return cached[1]
+    url = get_client('s3').generate_presigned_url(
+        ClientMethod='get_object',
+        Params={
+            'Bucket': bucket,
+            'Key': key,
+            'ResponseContentDisposition': 'inline',
+            'ResponseContentType': 'application/pdf'
+        },
+        ExpiresIn=URL_EXPIRES_SECONDS
+    )
+    if len(_presigned_urls) >= MAX_CACHED_URLS:
+        _presigned_urls.clear()
+    _presigned_urls[(bucket, key)] = (window, url)
+    return url
+
+
+def if_none_match(event: Any) -> Optional[str]:
+    """The request's If-None-Match header, if any"""
+    headers = event.get('headers') if isinstance(event, dict) else None
+    if not headers:
+        return None
+    for name, value in headers.items():
+        if name.lower() == 'if-none-match':
+            return value
+    return None
+
+
+def is_not_modified(event: Any, etag: str) -> bool:
+    """Whether the client already holds the representation tagged etag"""
+    header = if_none_match(event)
+    if not header:
+        return False
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    candidates = {tag.strip().removeprefix('W/') for tag in header.split(',')}
+    return '*' in candidates or etag.removeprefix('W/') in candidates
+
+
+def not_modified(etag: str, headers: Optional[Dict[str, str]] = None) -> Dict:
+    """A 304 response for etag"""
+    return {
+        'statusCode': 304,
+        'headers': dict(headers or {}, ETag=etag, **{'Cache-Control': REVALIDATE})
+    }
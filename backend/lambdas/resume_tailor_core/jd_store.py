@@ -0,0 +1,184 @@
+import re
+import time
+import hashlib
+import unicodedata
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from botocore.exceptions import ClientError
+
+from .clients import get_client, get_table
+from .compression import JSON_ZLIB, pack_json, unpack_json
+from .json_parser import strip_invisible_characters
+
+# Job descriptions in the JobDescriptions table, stored once per distinct text
+# and referenced by hash from score results and tailoring calls:
+#
+#     jdHash            sha256 of the cleaned text (partition key)
+#     contentBlob       pack_json({'text': cleaned text, 'keywords': {keyword: count}})
+#     contentEncoding   encoding of contentBlob, currently 'json+zlib'
+#     contentS3Key      instead of contentBlob, when it would not fit in an item;
+#                       never for guest text (see save_job_description)
+#     tokenCount        estimated model tokens of the cleaned text
+#     keywordCount      distinct keywords in the cleaned text
+#     createdAt         ISO timestamp of the first save
+#     ttl               set while only guests have used the text; removed on
+#                       the first authenticated save, so the item outlives
+#                       every result that references it
+#
+# Cleaning strips invisible characters, applies NFKC and collapses runs of
+# whitespace, so copies of the same posting pasted from different sources
+# hash the same. Case is kept: the cleaned text is what the model sees.
+
+TABLE_NAME = 'JobDescriptions'
+BUCKET_NAME = 'resume-tailor-bucket.kp'
+GUEST_TTL_SECONDS = 24 * 3600     # matches the guest/ S3 expiry
+GUEST_MIN_REMAINING_SECONDS = 2 * 3600  # guest results expire after an hour
+MAX_BLOB_BYTES = 350 * 1024       # headroom under DynamoDB's 400 KB item limit
+MAX_KEYWORDS = 200
+CHARS_PER_TOKEN = 4               # rough average for English prose
+
+# Words that carry no signal about the role
+STOPWORDS = frozenset('''
+a about above after all also an and any are as at be been being both but by can could do does
+each for from had has have having he her here how i if in into is it its just may more most
+must no not of on or other our out over own per same she should so some such than that the
+their them then there these they this those through to too under up very was we were what
+when where which while who will with within would you your yours etc e g ie eg us
+'''.split())
+
+# Words, keeping the punctuation of technical terms: c++, c#, node.js, ci/cd
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9+#./-]*[a-z0-9+#]|[a-z0-9]")
+_SPACES_RE = re.compile(r'[^\S\n]+')
+_BLANK_LINES_RE = re.compile(r'\n{3,}')
+
+
+def clean_text(text: str) -> str:
+    """text with invisible characters removed and whitespace collapsed"""
+    text = unicodedata.normalize('NFKC', strip_invisible_characters(text))
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    lines = (_SPACES_RE.sub(' ', line).strip() for line in text.split('\n'))
+    return _BLANK_LINES_RE.sub('\n\n', '\n'.join(lines)).strip()
+
+
+def jd_hash(cleaned: str) -> str:
+    return hashlib.sha256(cleaned.encode('utf-8')).hexdigest()
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase words of text, in order, stopwords and bare numbers removed"""
+    return [
+        word for word in _WORD_RE.findall(text.lower())
+        if word not in STOPWORDS and not word.isdigit()
+    ]
+
+
+def keyword_counts(text: str) -> Dict[str, int]:
+    """The MAX_KEYWORDS most frequent words of text, with their counts"""
+    return dict(Counter(tokenize(text)).most_common(MAX_KEYWORDS))
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _record(item: Dict[str, Any], content: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'jdHash': item['jdHash'],
+        'text': content['text'],
+        'keywords': content['keywords'],
+        'tokenCount': int(item['tokenCount'])
+    }
+
+
+def _content(item: Dict[str, Any], s3=None) -> Dict[str, Any]:
+    encoding = item.get('contentEncoding', JSON_ZLIB)
+    if encoding != JSON_ZLIB:
+        raise ValueError(f'Unknown job description encoding: {encoding}')
+    if 'contentS3Key' in item:
+        obj = (s3 or get_client('s3')).get_object(Bucket=BUCKET_NAME, Key=item['contentS3Key'])
+        return unpack_json(obj['Body'].read())
+    return unpack_json(item['contentBlob'])
+
+
+def _extend(table, digest: str, guest: bool, now: int) -> None:
+    """
+    Make a stored item outlive a new reference to it: drop its ttl for an
+    authenticated save; for a guest save, push it out when less than
+    GUEST_MIN_REMAINING_SECONDS remain. A failed condition means there was
+    nothing to do.
+    """
+    if guest:
+        update = {
+            'UpdateExpression': 'SET #ttl = :ttl',
+            'ConditionExpression': 'attribute_exists(#ttl) AND #ttl < :min',
+            'ExpressionAttributeValues': {':ttl': now + GUEST_TTL_SECONDS, ':min': now + GUEST_MIN_REMAINING_SECONDS}
+        }
+    else:
+        update = {
+            'UpdateExpression': 'REMOVE #ttl',
+            'ConditionExpression': 'attribute_exists(#ttl)'
+        }
+    try:
+        table.update_item(Key={'jdHash': digest}, ExpressionAttributeNames={'#ttl': 'ttl'}, **update)
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+
+
+def save_job_description(text: str, guest: bool = False, table=None, s3=None) -> Dict[str, Any]:
+    """
+    Store a job description unless its cleaned text is already stored, and
+    return its record: jdHash, cleaned text, keywords and token count.
+    Derived data is computed only for text not seen before.
+    Raises ValueError for new guest text too large to store in the item.
+    """
+    table = table or get_table(TABLE_NAME)
+    cleaned = clean_text(text)
+    digest = jd_hash(cleaned)
+    now = int(time.time())
+
+    item = table.get_item(Key={'jdHash': digest}).get('Item')
+    if item is not None:
+        if 'ttl' in item and (not guest or item['ttl'] < now + GUEST_MIN_REMAINING_SECONDS):
+            _extend(table, digest, guest, now)
+        return _record(item, _content(item, s3))
+
+    content = {'text': cleaned, 'keywords': keyword_counts(cleaned)}
+    item = {
+        'jdHash': digest,
+        'tokenCount': estimate_tokens(cleaned),
+        'keywordCount': len(content['keywords']),
+        'contentEncoding': JSON_ZLIB,
+        'createdAt': datetime.now().isoformat()
+    }
+    blob = pack_json(content)
+    if len(blob) > MAX_BLOB_BYTES:
+        # Offloads sit outside guest/, since a signed-in user may later save the same
+        # text, so no lifecycle rule expires them; guests cannot create them
+        if guest:
+            raise ValueError('Job description too large to store for a guest')
+        item['contentS3Key'] = f'job-descriptions/{digest}.json.z'
+        (s3 or get_client('s3')).put_object(Bucket=BUCKET_NAME, Key=item['contentS3Key'], Body=blob)
+    else:
+        item['contentBlob'] = blob
+    if guest:
+        item['ttl'] = now + GUEST_TTL_SECONDS
+
+    try:
+        table.put_item(
+            Item=item,
+            ConditionExpression='attribute_not_exists(jdHash)'
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+        _extend(table, digest, guest, now)  # saved concurrently by another request
+    return _record(item, content)
+
+
+def load_job_description(digest: str, table=None, s3=None) -> Optional[Dict[str, Any]]:
+    """A stored job description's record, or None if there is none"""
+    item = (table or get_table(TABLE_NAME)).get_item(Key={'jdHash': digest}).get('Item')
+    return _record(item, _content(item, s3)) if item is not None else None
@@ -0,0 +1,126 @@
+import json
+import re
+import sys
+import unicodedata
+
+from .tracing import span
+
+# Characters that can open a JSON container
+_JSON_START_RE = re.compile(r'[\[{]')
+
+# Control (Cc) and format (Cf) code points, excluding tab, newline and CR,
+# which are valid whitespace between JSON tokens. Precomputed from
+# unicodedata so stripping is one regex pass instead of a category lookup
+# per character: Unicode 13.0 (python3.9, the default runtime, and python3.10)
+# plus what later versions added. An interpreter with any other version
+# derives the table from its own unicodedata at import, a ~0.2 s scan;
+# benchmarks/strip_invisible.py checks the result code point by code point.
+_INVISIBLE_RANGES = [
+    (0x0000, 0x0008), (0x000B, 0x000C), (0x000E, 0x001F), (0x007F, 0x009F),
+    (0x00AD, 0x00AD), (0x0600, 0x0605), (0x061C, 0x061C), (0x06DD, 0x06DD),
+    (0x070F, 0x070F), (0x08E2, 0x08E2), (0x180E, 0x180E), (0x200B, 0x200F),
+    (0x202A, 0x202E), (0x2060, 0x2064), (0x2066, 0x206F), (0xFEFF, 0xFEFF),
+    (0xFFF9, 0xFFFB), (0x110BD, 0x110BD), (0x110CD, 0x110CD), (0x13430, 0x13438),
+    (0x1BCA0, 0x1BCA3), (0x1D173, 0x1D17A), (0xE0001, 0xE0001), (0xE0020, 0xE007F),
+]
+_INVISIBLE_RANGES_ADDED = {
+    '13.0.0': [],
+    '14.0.0': [(0x0890, 0x0891)],  # python3.11
+}
+
+
+def _invisible_ranges():
+    """Ranges of Cc/Cf code points other than tab, newline and CR, from unicodedata"""
+    ranges = []
+    for code_point in range(sys.maxunicode + 1):
+        if chr(code_point) in '\t\n\r' or unicodedata.category(chr(code_point)) not in ('Cc', 'Cf'):
+            continue
+        if ranges and ranges[-1][1] == code_point - 1:
+            ranges[-1] = (ranges[-1][0], code_point)
+        else:
+            ranges.append((code_point, code_point))
+    return ranges
+
+
+if unicodedata.unidata_version in _INVISIBLE_RANGES_ADDED:
+    _INVISIBLE_RANGES = sorted(_INVISIBLE_RANGES + _INVISIBLE_RANGES_ADDED[unicodedata.unidata_version])
+else:
+    _INVISIBLE_RANGES = _invisible_ranges()
+
+_INVISIBLE_RE = re.compile('[%s]+' % ''.join(
+    re.escape(chr(start)) if start == end else f'{re.escape(chr(start))}-{re.escape(chr(end))}'
+    for start, end in _INVISIBLE_RANGES
+))
+# ASCII text can only contain the C0 controls and DEL
+_ASCII_INVISIBLE_RE = re.compile(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]+')
+
+
+def strip_invisible_characters(text):
+    """Remove control (Cc) characters other than tab/newline/CR, and format (Cf) characters"""
+    if text.isascii():
+        return _ASCII_INVISIBLE_RE.sub('', text)
+    return _INVISIBLE_RE.sub('', text)
+
+
+def load_model_json(raw_text, expect=None):
+    """
+    Parse the JSON value in a model response, tolerating markdown fences,
+    prose before or after the JSON, stray control/format characters and
+    literal newlines inside strings.
+    Pass expect=dict or expect=list to only accept that top-level type.
+    Raises json.JSONDecodeError if no JSON value can be found.
+    """
+    with span('json_parse', response_length=len(raw_text)):
+        return _decode_first_value(strip_invisible_characters(raw_text), expect)
+
+
+def _decode_first_value(text, expect):
+    openers = {dict: '{', list: '['}.get(expect, '{[')
+    decoder = json.JSONDecoder(strict=False)
+    first_error = None
+    resume_at = 0
+
+    # Try each opening bracket in turn; raw_decode ignores whatever follows the value
+    for match in _JSON_START_RE.finditer(text):
+        if match.start() < resume_at or match.group() not in openers:
+            continue
+        try:
+            value, _ = decoder.raw_decode(text, match.start())
+            return value
+        except json.JSONDecodeError as e:
+            first_error = first_error or e
+            # Brackets inside a failed candidate are nested values of broken
+            # (e.g. truncated) JSON, not the start of the real value
+            resume_at = max(e.pos, match.start() + 1)
+
+    raise first_error or json.JSONDecodeError('No JSON value found', text, 0)
+
+
+def parse_model_json(raw_text, logger=None):
+    """
+    Parse a JSON object from a model response.
+    Raises Exception if the response contains no JSON object.
+    """
+    try:
+        return load_model_json(raw_text, expect=dict)
+    except json.JSONDecodeError as e:
+        error = e
+
+    if logger:
+        # The full response goes to S3 with the invocation, not into the log line
+        logger.capture_payload('model_response', raw_text, always=True)
+        error_pos = error.pos
+        start_pos = max(0, error_pos - 10)
+        end_pos = min(len(error.doc), error_pos + 10)
+        chars_around_error = error.doc[start_pos:end_pos]
+
+        logger.error("Failed to parse AI response as JSON", {
+            'error': str(error),
+            'raw_text_length': len(raw_text),
+            'cleaned_text_length': len(error.doc),
+            'error_position': error_pos,
+            'characters_around_error': chars_around_error,
+            'character_codes_around_error': [ord(c) for c in chars_around_error],
+            'bytes_around_error': chars_around_error.encode('unicode_escape').decode('ascii')
+        })
+    raise Exception(f"Could not parse AI response as JSON: {str(error)}")
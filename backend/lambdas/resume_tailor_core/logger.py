@@ -0,0 +1,458 @@
+import functools
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import traceback
+import uuid
+from contextvars import ContextVar
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from .clients import get_client
+from .tracing import Trace, end_trace, request_id, start_trace
+
+# Set LOG_LEVEL=DEBUG on a function to see debug lines, WARNING to drop INFO
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+
+SENSITIVE_KEY_PARTS = ('password', 'secret', 'token', 'key', 'auth')
+MAX_STRING_LENGTH = 1000
+MAX_FILE_PREVIEW_LENGTH = 100
+
+# Log budget: once an invocation has written this many bytes, further DEBUG/INFO
+# lines are dropped and counted. Warnings, errors and the end-of-invocation
+# summary are always written.
+LOG_BUDGET_BYTES = int(os.environ.get('LOG_BUDGET_BYTES', '16384'))
+
+# Full payloads (model responses) are never logged; capture_payload keeps them
+# and uploads them to S3 for this share of invocations, and for every failed one
+PAYLOAD_CAPTURE_RATE = float(os.environ.get('PAYLOAD_CAPTURE_RATE', '0'))
+PAYLOAD_CAPTURE_BUCKET = os.environ.get('PAYLOAD_CAPTURE_BUCKET', 'resume-tailor-bucket.kp')
+PAYLOAD_CAPTURE_PREFIX = 'debug/payloads'
+
+# CloudWatch Embedded Metric Format: metric blocks are log lines CloudWatch turns into metrics
+METRICS_NAMESPACE = os.environ.get('METRICS_NAMESPACE', 'ResumeTailor')
+EMF_MAX_VALUES = 100  # values per metric in one EMF block
+
+# Share of invocations whose span tree is logged, within the log budget;
+# failed invocations are always logged, outside it
+TRACE_SAMPLE_RATE = float(os.environ.get('TRACE_SAMPLE_RATE', '0.05'))
+
+# Compact output; default=str keeps a stray non-JSON value from failing the log call
+_encoder = json.JSONEncoder(separators=(',', ':'), default=str)
+
+
+@lru_cache(maxsize=1024)
+def _key_kind(key: str) -> str:
+    """Classify a field name once; handlers log the same few dozen keys over and over"""
+    key_lower = key.lower()
+    if any(part in key_lower for part in SENSITIVE_KEY_PARTS):
+        return 'sensitive'
+    if key_lower == 'file':
+        return 'file'
+    return 'plain'
+
+
+@lru_cache(maxsize=64)
+def _basename(path: str) -> str:
+    return os.path.basename(path)
+
+
+class _Clock:
+    """ISO-8601 UTC timestamps, formatting the date/time part once per second"""
+
+    def __init__(self):
+        self._second = None
+        self._prefix = ''
+
+    def timestamp(self) -> str:
+        now = time.time()
+        second = int(now)
+        if second != self._second:
+            self._prefix = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(second))
+            self._second = second
+        return '%s.%03dZ' % (self._prefix, (now - second) * 1000)
+
+
+_clock = _Clock()
+_write_lock = threading.Lock()
+# The logger and request ID of the running invocation, set by log_invocation. Context
+# variables, like the current span, so work fanned out with contextvars.copy_context()
+# logs to the invocation's logger; the logger itself is safe to share across threads.
+_current_logger: ContextVar[Optional['ResumeTailorLogger']] = ContextVar('resume_tailor_logger', default=None)
+_current_request_id: ContextVar[Optional[str]] = ContextVar('resume_tailor_request_id', default=None)
+
+
+def _configure(logger: logging.Logger):
+    """The stdlib logger only decides levels; records are written directly by ResumeTailorLogger"""
+    logger.setLevel(LOG_LEVEL)
+    logger.propagate = False
+
+
+class ResumeTailorLogger:
+    def __init__(self, function_name: str, correlation_id: Optional[str] = None):
+        self.function_name = function_name
+        self.correlation_id = correlation_id or str(uuid.uuid4())
+        self.logger = logging.getLogger(function_name)
+        _configure(self.logger)
+
+        # Fields every record carries, bound once per invocation
+        self._base = {'function_name': function_name, 'correlation_id': self.correlation_id}
+        self._sample_counts = {}
+        # Guards the counters and buffers below; fanned-out work shares the logger
+        self._lock = threading.Lock()
+
+        # Log budget accounting and captured payloads for this invocation
+        self._bytes_written = 0
+        self._budget_spent = False
+        self._lines_dropped = 0
+        self._payloads = []
+        self._capture_sampled = random.random() < PAYLOAD_CAPTURE_RATE
+
+        # Buffered metrics: {dimension items: {metric name: (unit, [values])}}
+        self._metrics = {}
+        self._metric_dimensions = {}
+
+    def _log(self, level: int, message: str, extra_data: Optional[Dict] = None, exc_info: bool = False,
+             sample_key: Optional[str] = None, sample_every: int = 1, budgeted: bool = True):
+        """
+        Internal logging method. Does no work when the level is disabled or
+        the invocation's log budget is spent; otherwise writes one JSON line
+        to stderr without going through logging.LogRecord, handlers and
+        formatters.
+        """
+        if not self.logger.isEnabledFor(level):
+            return
+        budgeted = budgeted and level < logging.WARNING
+        with self._lock:
+            if budgeted and self._budget_spent:
+                self._lines_dropped += 1
+                return
+            if sample_every > 1:
+                key = sample_key or message
+                seen = self._sample_counts.get(key, 0)
+                self._sample_counts[key] = seen + 1
+        if sample_every > 1:
+            if seen % sample_every:
+                return
+            extra_data = dict(extra_data or {}, sampled_every=sample_every)
+
+        # Report the handler line that logged, not this module
+        caller = sys._getframe(2)
+        log_data = {'timestamp': _clock.timestamp(), 'level': logging.getLevelName(level)}
+        log_data.update(self._base)
+        log_data['message'] = message
+        log_data['line_number'] = caller.f_lineno
+        log_data['file'] = _basename(caller.f_code.co_filename)
+        if extra_data:
+            log_data.update(self._sanitize_data(extra_data))
+        if exc_info:
+            exception = sys.exc_info()
+            if exception[0] is not None:
+                log_data['exception'] = ''.join(traceback.format_exception(*exception)).rstrip()
+
+        line = _encoder.encode(log_data) + '\n'
+        # The encoder escapes non-ASCII, so characters are bytes
+        with self._lock:
+            if budgeted and self._bytes_written + len(line) > LOG_BUDGET_BYTES:
+                self._budget_spent = True
+                self._lines_dropped += 1
+                return
+            self._bytes_written += len(line)
+        with _write_lock:
+            sys.stderr.write(line)
+
+    def _sanitize_data(self, data: Any) -> Any:
+        """Sanitize sensitive data for logging"""
+        if isinstance(data, dict):
+            sanitized = {}
+            for key, value in data.items():
+                kind = _key_kind(key) if isinstance(key, str) else 'plain'
+                if kind == 'sensitive':
+                    sanitized[key] = '***REDACTED***'
+                elif value is None or isinstance(value, (bool, int, float)):
+                    sanitized[key] = value
+                elif kind == 'file' and isinstance(value, str) and len(value) > MAX_FILE_PREVIEW_LENGTH:
+                    # Truncate large file contents
+                    sanitized[key] = f"<FILE_CONTENT_SIZE:{len(value)}>"
+                elif isinstance(value, str):
+                    sanitized[key] = value if len(value) <= MAX_STRING_LENGTH else f"<TRUNCATED_STRING_SIZE:{len(value)}>"
+                else:
+                    sanitized[key] = self._sanitize_data(value)
+            return sanitized
+        elif isinstance(data, str):
+            return data if len(data) <= MAX_STRING_LENGTH else f"<TRUNCATED_STRING_SIZE:{len(data)}>"
+        elif isinstance(data, list):
+            return [self._sanitize_data(item) for item in data]
+        elif isinstance(data, Decimal):
+            # Convert Decimal to int if it's a whole number, otherwise float
+            if data % 1 == 0:
+                return int(data)
+            else:
+                return float(data)
+        else:
+            return data
+
+    def info(self, message: str, extra_data: Optional[Dict] = None,
+             sample_key: Optional[str] = None, sample_every: int = 1):
+        """
+        Log info message.
+        With sample_every=N only the 1st, N+1th, ... call per sample_key
+        (default: the message) in this invocation is written.
+        """
+        self._log(logging.INFO, message, extra_data, sample_key=sample_key, sample_every=sample_every)
+
+    def debug(self, message: str, extra_data: Optional[Dict] = None):
+        """Log debug message"""
+        self._log(logging.DEBUG, message, extra_data)
+
+    def warning(self, message: str, extra_data: Optional[Dict] = None):
+        """Log warning message"""
+        self._log(logging.WARNING, message, extra_data)
+
+    def error(self, message: str, extra_data: Optional[Dict] = None, exc_info: bool = True):
+        """Log error message with exception info"""
+        self._log(logging.ERROR, message, extra_data, exc_info=exc_info)
+
+    def log_function_start(self, event: Dict, context: Any):
+        """
+        Log function start with the request fields worth keeping. Fields are
+        read straight from the event; the event (and its possibly large
+        base64 body) is never copied or sanitized as a whole.
+        """
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        if not isinstance(event, dict):
+            event = {}
+        request_context = event.get('requestContext') or {}
+        identity = request_context.get('identity') or {}
+        body = event.get('body')
+        self.info("Function execution started", {
+            'aws_request_id': context.aws_request_id,
+            'function_version': context.function_version,
+            'memory_limit': context.memory_limit_in_mb,
+            'remaining_time_ms': context.get_remaining_time_in_millis(),
+            'event_source': request_context.get('requestId'),
+            'user_agent': identity.get('userAgent'),
+            'source_ip': identity.get('sourceIp'),
+            'http_method': event.get('httpMethod'),
+            'path': event.get('path'),
+            'body_length': len(body) if isinstance(body, str) else None
+        })
+
+    def log_function_end(self, duration_ms: float, status_code: Optional[int] = None):
+        """Log function end with execution metrics; written even when the log budget is spent"""
+        self._log(logging.INFO, "Function execution completed", {
+            'execution_duration_ms': round(duration_ms, 2),
+            'status_code': status_code,
+            'performance_category': self._get_performance_category(duration_ms),
+            'log_bytes': self._bytes_written,
+            'log_lines_dropped': self._lines_dropped
+        }, budgeted=False)
+
+    def _get_performance_category(self, duration_ms: float) -> str:
+        """Categorize performance for monitoring"""
+        if duration_ms < 1000:
+            return 'fast'
+        elif duration_ms < 5000:
+            return 'normal'
+        elif duration_ms < 15000:
+            return 'slow'
+        else:
+            return 'very_slow'
+
+    def log_aws_service_call(self, service: str, operation: str, params: Optional[Dict] = None):
+        """Log AWS service calls"""
+        self.info(f"AWS {service} call started", {
+            'service': service,
+            'operation': operation,
+            'params_keys': list(params.keys()) if params else []
+        })
+
+    def log_aws_service_result(self, service: str, operation: str, duration_ms: float, success: bool, error: Optional[str] = None):
+        """Log AWS service call results"""
+        level = 'info' if success else 'error'
+        message = f"AWS {service} call {'completed' if success else 'failed'}"
+        extra_data = {
+            'service': service,
+            'operation': operation,
+            'duration_ms': round(duration_ms, 2),
+            'success': success
+        }
+        if error:
+            extra_data['error'] = error
+
+        getattr(self, level)(message, extra_data)
+
+    def log_rate_limit_check(self, identifier: str, user_type: str, service_name: str, success: bool, current_count: int, limit: int):
+        """Log rate limiting decisions"""
+        level = logging.INFO if success else logging.WARNING
+        message = f"Rate limit check {'passed' if success else 'failed'}"
+        self._log(level, message, {
+            'identifier': identifier if not identifier.startswith('guest_') else 'guest_***',
+            'user_type': user_type,
+            'service_name': service_name,
+            'current_count': current_count,
+            'limit': limit,
+            'usage_percentage': round((current_count / limit) * 100, 1) if limit > 0 else 0
+        })
+
+    def log_trace(self, trace: Trace, budgeted: bool = True):
+        """Write the finished span tree of this invocation as one log line"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        self._log(logging.INFO, "Request trace", trace.export(), budgeted=budgeted)
+
+    def capture_payload(self, name: str, payload: Any, always: bool = False):
+        """
+        Keep a full payload (e.g. a raw model response) for debugging instead
+        of logging it. Uploaded to S3 at the end of the invocation if the
+        invocation is sampled (PAYLOAD_CAPTURE_RATE) or fails, or always=True.
+        """
+        with self._lock:
+            self._payloads.append((name, payload, always))
+
+    def flush_payloads(self, failed: bool = False):
+        """Upload the captured payloads that are due, logging where each went"""
+        with self._lock:
+            payloads, self._payloads = self._payloads, []
+        due = [(name, payload) for name, payload, always in payloads
+               if always or failed or self._capture_sampled]
+        if not due:
+            return
+        prefix = f"{PAYLOAD_CAPTURE_PREFIX}/{self.function_name}/{time.strftime('%Y-%m-%d')}/{self.correlation_id}"
+        for name, payload in due:
+            body = payload if isinstance(payload, str) else json.dumps(payload, default=str)
+            location = f"s3://{PAYLOAD_CAPTURE_BUCKET}/{prefix}/{name}.json"
+            try:
+                get_client('s3').put_object(
+                    Bucket=PAYLOAD_CAPTURE_BUCKET,
+                    Key=f"{prefix}/{name}.json",
+                    Body=body.encode('utf-8'),
+                    ContentType='application/json'
+                )
+            except Exception as e:
+                self._log(logging.WARNING, "Payload capture failed", {'payload': name, 'error': str(e)})
+                continue
+            self._log(logging.INFO, "Payload captured", {
+                'payload': name,
+                'location': location,
+                'size_bytes': len(body)
+            }, budgeted=False)
+
+    def set_metric_dimensions(self, **dimensions):
+        """Dimensions added to every metric of this invocation, e.g. user_type once it is known"""
+        with self._lock:
+            self._metric_dimensions.update(dimensions)
+
+    def put_metric(self, name: str, value: float, unit: str = 'Milliseconds', **dimensions):
+        """
+        Buffer a metric value. Nothing is written until flush_metrics(), which
+        emits one EMF block per dimension set with every value recorded for it.
+        """
+        key = tuple(sorted((k, v) for k, v in dimensions.items() if v is not None))
+        with self._lock:
+            metrics = self._metrics.setdefault(key, {})
+            if name in metrics:
+                metrics[name][1].append(value)
+            else:
+                metrics[name] = (unit, [value])
+
+    def flush_metrics(self):
+        """Write buffered metrics to stdout as CloudWatch EMF and clear the buffer"""
+        with self._lock:
+            buffered, self._metrics = self._metrics, {}
+            metric_dimensions = dict(self._metric_dimensions)
+        if not buffered:
+            return
+        timestamp = int(time.time() * 1000)
+        lines = []
+        for key, metrics in buffered.items():
+            dimensions = {'function': self.function_name}
+            dimensions.update((k, v) for k, v in metric_dimensions.items() if v is not None)
+            dimensions.update(key)
+            dimensions = {k: str(v) for k, v in dimensions.items()}
+            # EMF caps the values per metric, so long series are split across blocks
+            longest = max(len(values) for _, values in metrics.values())
+            for offset in range(0, longest, EMF_MAX_VALUES):
+                chunk = {name: (unit, values[offset:offset + EMF_MAX_VALUES])
+                         for name, (unit, values) in metrics.items() if len(values) > offset}
+                block = {
+                    '_aws': {
+                        'Timestamp': timestamp,
+                        'CloudWatchMetrics': [{
+                            'Namespace': METRICS_NAMESPACE,
+                            'Dimensions': [list(dimensions)],
+                            'Metrics': [{'Name': name, 'Unit': unit} for name, (unit, _) in chunk.items()]
+                        }]
+                    },
+                    'correlation_id': self.correlation_id
+                }
+                block.update(dimensions)
+                for name, (_, values) in chunk.items():
+                    block[name] = values[0] if len(values) == 1 else values
+                lines.append(_encoder.encode(block) + '\n')
+        with _write_lock:
+            sys.stdout.write(''.join(lines))
+
+
+def create_logger(function_name: str, correlation_id: Optional[str] = None) -> ResumeTailorLogger:
+    """
+    Factory function to create logger instances. Inside log_invocation the
+    correlation ID defaults to the API Gateway request ID.
+    """
+    logger = ResumeTailorLogger(function_name, correlation_id or _current_request_id.get())
+    _current_logger.set(logger)
+    return logger
+
+
+def current_logger() -> Optional[ResumeTailorLogger]:
+    """The logger the running invocation created, if any"""
+    return _current_logger.get()
+
+
+def log_invocation(handler):
+    """
+    Decorator for lambda_handler. Traces the invocation, then records its
+    duration and status, logs the end of the invocation, uploads captured
+    payloads that are due, logs the span tree and flushes the metrics of the
+    logger the handler created - once, on every return path.
+    """
+    @functools.wraps(handler)
+    def wrapper(event, context):
+        logger_token = _current_logger.set(None)
+        request_token = _current_request_id.set(request_id(event))
+        trace = start_trace(getattr(context, 'function_name', handler.__name__), event)
+        start = time.perf_counter()
+        status_code = None
+        error = None
+        try:
+            response = handler(event, context)
+            if isinstance(response, dict):
+                status_code = response.get('statusCode')
+            return response
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            end_trace(trace, error)
+            logger = _current_logger.get()
+            _current_logger.reset(logger_token)
+            _current_request_id.reset(request_token)
+            if logger is not None:
+                duration_ms = (time.perf_counter() - start) * 1000
+                status = f"{status_code // 100}xx" if isinstance(status_code, int) else 'raised'
+                logger.put_metric('Duration', duration_ms, status=status)
+                logger.log_function_end(duration_ms, status_code)
+                failed = error is not None or (isinstance(status_code, int) and status_code >= 500)
+                logger.flush_payloads(failed)
+                if failed or random.random() < TRACE_SAMPLE_RATE:
+                    trace.root.name = logger.function_name
+                    trace.root.set(status_code=status_code)
+                    logger.log_trace(trace, budgeted=not failed)
+                logger.flush_metrics()
+    return wrapper
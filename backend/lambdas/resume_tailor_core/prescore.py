@@ -0,0 +1,125 @@
+import re
+import math
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+from .jd_store import keyword_counts, tokenize
+
+# Deterministic checks run before a score request reaches Bedrock.
+#
+# check_job_description rejects text that cannot be scored - too short,
+# placeholder, keyboard mash, one word repeated - so score_resume can answer
+# it without a model call or a rate limit charge. The rules are deliberately
+# narrow: anything they let through still gets the model's own validity check.
+# They only apply to text written mostly in ASCII letters; the tokenizer does
+# not see words in other scripts, so those postings go to the model as they are.
+#
+# keyword_overlap compares the job description's keywords with the resume's
+# words, weighted TF-IDF style: term frequency is log-scaled, and terms that
+# appear in nearly every posting (GENERIC_TERMS) get a low inverse document
+# frequency. The result is summarized in the prompt.
+
+MIN_MEANINGFUL_WORDS = 10
+MIN_DISTINCT_RATIO = 0.2
+MAX_GIBBERISH_SHARE = 0.4
+GENERIC_IDF = 0.2
+MAX_LISTED_KEYWORDS = 15
+MIN_ASCII_LETTER_SHARE = 0.5
+
+# Words in nearly every job posting; they say little about the role
+GENERIC_TERMS = frozenset('''
+ability able across applicants apply based benefits best candidate candidates company competitive
+culture customers day degree environment equal experience excellent fast-paced help highly ideal
+including job join knowledge looking new opportunity paced plus preferred related required
+requirements responsibilities role skills strong successful support team teams time well work
+working world year years
+'''.split())
+
+PLACEHOLDER_WORDS = frozenset({'lorem', 'ipsum', 'placeholder', 'asdf', 'qwerty'})
+REPEATED_PLACEHOLDERS = frozenset({'test', 'sample', 'xxx'})
+_CONSONANT_RUN_RE = re.compile(r'[bcdfghjklmnpqrstvwxz]{5,}')
+_VOWEL_RE = re.compile(r'[aeiouy]')
+
+INVALID_FEEDBACK = {
+    'too_short': "The job description is too short to evaluate against. Paste the full posting, including the responsibilities and requirements, for an accurate score.",
+    'placeholder': "The job description looks like placeholder text rather than a real posting. Paste the full posting for an accurate score.",
+    'gibberish': "The job description does not read as a job posting. Paste the full posting, including the responsibilities and requirements, for an accurate score.",
+    'repetitive': "The job description repeats the same few words and has no role details. Paste the full posting for an accurate score."
+}
+
+
+def _is_gibberish(word: str) -> bool:
+    if not word.isalpha():
+        return False
+    return bool(_CONSONANT_RUN_RE.search(word)) or (len(word) >= 6 and not _VOWEL_RE.search(word))
+
+
+def _has_placeholder(tokens: List[str]) -> bool:
+    if any(token in PLACEHOLDER_WORDS for token in tokens):
+        return True
+    return any(a == b and a in REPEATED_PLACEHOLDERS for a, b in zip(tokens, tokens[1:]))
+
+
+def _mostly_ascii_letters(text: str) -> bool:
+    letters = [char for char in text if char.isalpha()]
+    return sum(char.isascii() for char in letters) >= MIN_ASCII_LETTER_SHARE * len(letters)
+
+
+def check_job_description(text: str, tokens: Optional[List[str]] = None) -> Optional[str]:
+    """The reason text is not a scorable job description (a key of INVALID_FEEDBACK), or None"""
+    if not _mostly_ascii_letters(text):
+        return None
+    tokens = tokenize(text) if tokens is None else tokens
+    meaningful = [token for token in tokens if len(token) > 2 or not token.isalpha()]
+    if len(set(meaningful)) < MIN_MEANINGFUL_WORDS:
+        return 'placeholder' if _has_placeholder(tokens) else 'too_short'
+    if len(meaningful) < 3 * MIN_MEANINGFUL_WORDS and _has_placeholder(tokens):
+        return 'placeholder'
+    if sum(map(_is_gibberish, meaningful)) > MAX_GIBBERISH_SHARE * len(meaningful):
+        return 'gibberish'
+    if len(set(meaningful)) < MIN_DISTINCT_RATIO * len(meaningful):
+        return 'repetitive'
+    return None
+
+
+def _weight(term: str, count: int) -> float:
+    return (1 + math.log(count)) * (GENERIC_IDF if term in GENERIC_TERMS else 1.0)
+
+
+def keyword_overlap(resume_text: str, jd_keywords: Optional[Dict[str, int]] = None,
+                    job_description: Optional[str] = None) -> Dict[str, Any]:
+    """
+    How much of the job description's weighted vocabulary the resume covers.
+    Pass the stored keyword counts when available, or the text to count.
+    """
+    if jd_keywords is None:
+        jd_keywords = keyword_counts(job_description or '')
+    resume_counts = Counter(tokenize(resume_text))
+    jd_weights = {term: _weight(term, count) for term, count in jd_keywords.items()}
+    resume_weights = {term: _weight(term, count) for term, count in resume_counts.items()}
+
+    total = sum(jd_weights.values())
+    matched = sum(weight for term, weight in jd_weights.items() if term in resume_counts)
+    dot = sum(weight * resume_weights[term] for term, weight in jd_weights.items() if term in resume_weights)
+    norms = math.sqrt(sum(w * w for w in jd_weights.values())) * math.sqrt(sum(w * w for w in resume_weights.values()))
+
+    def top(terms: Iterable[str]) -> List[str]:
+        return sorted(terms, key=lambda term: (-jd_weights[term], term))[:MAX_LISTED_KEYWORDS]
+
+    return {
+        'coverage': round(matched / total, 3) if total else 0.0,
+        'similarity': round(dot / norms, 3) if norms else 0.0,
+        'jd_keywords': len(jd_weights),
+        'matched': top(term for term in jd_weights if term in resume_counts and term not in GENERIC_TERMS),
+        'missing': top(term for term in jd_weights if term not in resume_counts and term not in GENERIC_TERMS)
+    }
+
+
+def format_overlap(overlap: Dict[str, Any]) -> str:
+    """Overlap statistics as a prompt section"""
+    return (
+        f"- Weighted share of job description keywords found in the resume: {overlap['coverage']:.0%}\n"
+        f"- TF-IDF cosine similarity of resume and job description: {overlap['similarity']:.2f}\n"
+        f"- Key job description terms present in the resume: {', '.join(overlap['matched']) or 'none'}\n"
+        f"- Key job description terms absent from the resume: {', '.join(overlap['missing']) or 'none'}"
+    )
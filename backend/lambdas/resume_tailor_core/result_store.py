@@ -0,0 +1,180 @@
+import json
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from .clients import get_client, get_table
+from .compression import JSON_ZLIB, binary_value, pack_json, unpack_json
+
+# Score results in the ResumeAnalysisResults table. The large text attributes
+# (resumeText in text mode, jobDescription, feedback) dominate item size, and
+# DynamoDB bills writes per started KB and caps items at 400 KB. They are
+# stored in one of three ways, smallest first:
+#
+#     plain        short values, as before
+#     compressed   values of COMPRESS_THRESHOLD_BYTES or more, as pack_json
+#                  Binary attributes named <attribute>Z (e.g. jobDescriptionZ)
+#     offloaded    if the compressed item would still exceed MAX_ITEM_BYTES,
+#                  all large attributes go to one compressed S3 object; the
+#                  item keeps its key in `payloadS3Key` and the names of the
+#                  attributes in it in `payloadAttributes`
+#
+# `largeEncoding` records the encoding of the Z attributes and the S3 object.
+# Items written before this have plain attributes only and are read as-is.
+
+TABLE_NAME = 'ResumeAnalysisResults'
+BUCKET_NAME = 'resume-tailor-bucket.kp'
+LARGE_ATTRIBUTES = ('resumeText', 'jobDescription', 'feedback')
+COMPRESSED_SUFFIX = 'Z'
+ENCODING_ATTRIBUTE = 'largeEncoding'
+PAYLOAD_KEY_ATTRIBUTE = 'payloadS3Key'
+PAYLOAD_ATTRIBUTES_ATTRIBUTE = 'payloadAttributes'
+
+GUEST_TTL_SECONDS = 3600
+COMPRESS_THRESHOLD_BYTES = 1024   # below this compression saves less than one write unit
+MAX_ITEM_BYTES = 350 * 1024       # headroom under DynamoDB's 400 KB item limit
+
+
+def new_result(result_id: str, score: int, feedback: Any, s3_key: Optional[str] = None,
+               resume_text: Optional[str] = None, guest: bool = False,
+               user_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    A result item with plain attributes, before encode_result. It holds the
+    S3 key of a PDF resume or the text of a pasted one; the caller adds the
+    job description (jdHash or jobDescription).
+    """
+    item = {
+        'resultId': result_id,
+        'score': score,
+        'feedback': feedback,
+        'createdAt': datetime.now().isoformat(),
+    }
+    if s3_key:
+        item['resumeId'] = s3_key
+        item['inputMode'] = 'pdf'
+    else:
+        item['resumeText'] = resume_text
+        item['inputMode'] = 'text'
+    if guest:
+        item['ttl'] = int(time.time()) + GUEST_TTL_SECONDS
+    elif user_id:
+        item['userId'] = user_id
+    return item
+
+
+def item_size(item: Dict[str, Any]) -> int:
+    """Approximate DynamoDB size of an item: attribute names plus values"""
+    def value_size(value):
+        if isinstance(value, str):
+            return len(value.encode('utf-8'))
+        if isinstance(value, (bytes, bytearray)) or hasattr(value, 'value'):
+            return len(binary_value(value))
+        if isinstance(value, dict):
+            return 3 + sum(len(k) + value_size(v) + 1 for k, v in value.items())
+        if isinstance(value, (list, tuple)):
+            return 3 + sum(value_size(v) + 1 for v in value)
+        return 21  # numbers and booleans: at most 21 bytes
+    return sum(len(name) + value_size(value) for name, value in item.items())
+
+
+def payload_key(result_id: str, guest: bool) -> str:
+    # Guest payloads sit under guest/ so the bucket's guest expiry rule removes them
+    return f"{'guest/' if guest else ''}results/{result_id}.json.z"
+
+
+def encode_result(item: Dict[str, Any], guest: bool = False, s3=None) -> Dict[str, Any]:
+    """
+    The item to write for a result with plain large attributes: large values
+    compressed, and moved to S3 if the item would still be too big. Returns
+    a new dict; item is not modified.
+    """
+    encoded = {name: value for name, value in item.items() if name not in LARGE_ATTRIBUTES}
+    large = {name: item[name] for name in LARGE_ATTRIBUTES if name in item}
+    compressed = False
+    for name, value in large.items():
+        raw_size = len(value.encode('utf-8')) if isinstance(value, str) else len(json.dumps(value))
+        if raw_size >= COMPRESS_THRESHOLD_BYTES:
+            encoded[name + COMPRESSED_SUFFIX] = pack_json(value)
+            compressed = True
+        else:
+            encoded[name] = value
+
+    if item_size(encoded) > MAX_ITEM_BYTES:
+        key = payload_key(item['resultId'], guest)
+        (s3 or get_client('s3')).put_object(
+            Bucket=BUCKET_NAME,
+            Key=key,
+            Body=pack_json(large)
+        )
+        for name in LARGE_ATTRIBUTES:
+            encoded.pop(name, None)
+            encoded.pop(name + COMPRESSED_SUFFIX, None)
+        encoded[PAYLOAD_KEY_ATTRIBUTE] = key
+        encoded[PAYLOAD_ATTRIBUTES_ATTRIBUTE] = list(large)
+        compressed = True
+
+    if compressed:
+        encoded[ENCODING_ATTRIBUTE] = JSON_ZLIB
+    return encoded
+
+
+class StoredResult:
+    """
+    A result item as read from the table. Large attributes are decoded (and
+    an offloaded payload fetched from S3) only when first accessed.
+    """
+
+    def __init__(self, item: Dict[str, Any], s3=None):
+        self.item = item
+        self._s3 = s3
+        self._decoded = {}
+        self._payload = None
+        encoding = item.get(ENCODING_ATTRIBUTE, JSON_ZLIB)
+        if encoding != JSON_ZLIB:
+            raise ValueError(f'Unknown result encoding: {encoding}')
+
+    @property
+    def offloaded(self) -> bool:
+        return PAYLOAD_KEY_ATTRIBUTE in self.item
+
+    def _load_payload(self) -> Dict[str, Any]:
+        if self._payload is None:
+            obj = (self._s3 or get_client('s3')).get_object(Bucket=BUCKET_NAME, Key=self.item[PAYLOAD_KEY_ATTRIBUTE])
+            self._payload = unpack_json(obj['Body'].read())
+        return self._payload
+
+    def __contains__(self, name: str) -> bool:
+        # Answered from the item alone, without decoding or fetching anything
+        if name in self.item or name + COMPRESSED_SUFFIX in self.item:
+            return True
+        return name in LARGE_ATTRIBUTES and name in self.item.get(PAYLOAD_ATTRIBUTES_ATTRIBUTE, ())
+
+    def get(self, name: str, default: Any = None) -> Any:
+        if name not in LARGE_ATTRIBUTES:
+            return self.item.get(name, default)
+        if name in self._decoded:
+            return self._decoded[name]
+        if name in self.item:
+            value = self.item[name]
+        elif name + COMPRESSED_SUFFIX in self.item:
+            value = unpack_json(self.item[name + COMPRESSED_SUFFIX])
+        elif name in self:
+            value = self._load_payload()[name]
+        else:
+            return default
+        self._decoded[name] = value
+        return value
+
+    def __getitem__(self, name: str) -> Any:
+        missing = object()
+        value = self.get(name, missing)
+        if value is missing:
+            raise KeyError(name)
+        return value
+
+
+def load_result(result_id: str, table=None, s3=None) -> Optional[StoredResult]:
+    """Read a result, or None if there is none"""
+    item = (table or get_table(TABLE_NAME)).get_item(Key={'resultId': result_id}).get('Item')
+    return StoredResult(item, s3) if item is not None else None
+
@@ -0,0 +1,114 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+from botocore.exceptions import ClientError
+
+from .clients import get_table
+from .compression import JSON_ZLIB, pack_json, unpack_json
+from .logger import current_logger
+
+# Master resume items in the ResumeMetadata table:
+#
+#     resume_id         user ID (partition key)
+#     s3_key            the master resume PDF
+#     entriesBlob       the parsed entries, as compressed JSON (pack_json)
+#     entriesEncoding   encoding of entriesBlob, currently 'json+zlib'
+#     updatedAt         ISO timestamp of the last upload; the item's version
+#
+# Items written before the compact encoding hold `entries` as a nested list
+# of maps instead. Reads accept both, and rewrite an old item in the compact
+# encoding the first time it is read.
+
+TABLE_NAME = 'ResumeMetadata'
+ENTRIES_BLOB = 'entriesBlob'
+ENTRIES_ENCODING = 'entriesEncoding'
+LEGACY_ENTRIES = 'entries'
+
+
+def master_item(user_id: str, s3_key: str, entries: List[Dict], updated_at: str) -> Dict[str, Any]:
+    """A ResumeMetadata item in the compact encoding"""
+    return {
+        'resume_id': user_id,
+        's3_key': s3_key,
+        ENTRIES_BLOB: pack_json(entries),
+        ENTRIES_ENCODING: JSON_ZLIB,
+        'updatedAt': updated_at
+    }
+
+
+def _projection(attributes: Iterable[str]):
+    """ProjectionExpression and names for the stored attributes behind attributes"""
+    stored = []
+    for attribute in attributes:
+        if attribute == 'entries':
+            stored.extend([ENTRIES_BLOB, ENTRIES_ENCODING, LEGACY_ENTRIES])
+        else:
+            stored.append(attribute)
+    names = {f'#a{i}': attribute for i, attribute in enumerate(stored)}
+    return ', '.join(names), names
+
+
+def decode_entries(item: Dict[str, Any]) -> List[Dict]:
+    """The entries of an item in either encoding"""
+    if ENTRIES_BLOB in item:
+        encoding = item.get(ENTRIES_ENCODING, JSON_ZLIB)
+        if encoding != JSON_ZLIB:
+            raise ValueError(f'Unknown entries encoding: {encoding}')
+        return unpack_json(item[ENTRIES_BLOB])
+    return item.get(LEGACY_ENTRIES) or []
+
+
+def migrate_item(user_id: str, entries: List[Dict], table=None) -> bool:
+    """Rewrite an old item's entries in the compact encoding, unless it changed since it was read"""
+    table = table or get_table(TABLE_NAME)
+    try:
+        table.update_item(
+            Key={'resume_id': user_id},
+            UpdateExpression='SET #blob = :blob, #encoding = :encoding REMOVE #entries',
+            ConditionExpression='attribute_exists(#entries) AND attribute_not_exists(#blob)',
+            ExpressionAttributeNames={'#blob': ENTRIES_BLOB, '#encoding': ENTRIES_ENCODING, '#entries': LEGACY_ENTRIES},
+            ExpressionAttributeValues={':blob': pack_json(entries), ':encoding': JSON_ZLIB}
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            return False  # already migrated, or replaced by a new upload
+        raise
+    return True
+
+
+def load_master(user_id: str, attributes: Iterable[str] = ('entries', 'updatedAt'),
+                table=None, migrate: bool = True) -> Optional[Dict[str, Any]]:
+    """
+    Read only the given attributes of a user's master resume item, or None
+    if there is none. 'entries' is returned decoded, whichever encoding the
+    item uses.
+    """
+    table = table or get_table(TABLE_NAME)
+    attributes = list(attributes)
+    projection, names = _projection(attributes)
+    item = table.get_item(
+        Key={'resume_id': user_id},
+        ProjectionExpression=projection,
+        ExpressionAttributeNames=names
+    ).get('Item')
+    if item is None:
+        return None
+    if 'entries' not in attributes:
+        return item
+
+    legacy = ENTRIES_BLOB not in item and LEGACY_ENTRIES in item
+    entries = decode_entries(item)
+    result = {key: value for key, value in item.items() if key not in (ENTRIES_BLOB, ENTRIES_ENCODING)}
+    result['entries'] = entries
+    if legacy and migrate:
+        try:
+            migrated = migrate_item(user_id, entries, table)
+        except Exception as e:
+            # The read succeeded; the item is migrated on a later read
+            logger = current_logger()
+            if logger is not None:
+                logger.warning("Failed to migrate master resume item", {'error': str(e)})
+        else:
+            logger = current_logger()
+            if logger is not None and migrated:
+                logger.info("Migrated master resume item to compact entries", {'entries_count': len(entries)})
+    return result
@@ -0,0 +1,119 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from .json_parser import parse_model_json
+from .prescore import format_overlap
+
+# The scoring prompt and model request, shared by score_resume and the
+# offline batch scoring in batch_scoring, so a score means the same thing
+# whichever way it was produced.
+
+BEDROCK_REGION = 'us-east-2'
+MODEL_ID = 'arn:aws:bedrock:us-east-2:429744659578:inference-profile/us.anthropic.claude-3-haiku-20240307-v1:0'
+MAX_TOKENS = 1024
+TEMPERATURE = 0.3
+
+
+def format_prompt(resume_text: str, job_description: str, overlap: Optional[Dict[str, Any]] = None) -> str:
+    """The scoring prompt, with the keyword overlap section when overlap is given"""
+    overlap_section = f"""
+**Keyword Overlap (computed locally from the two texts; a starting point for the Technical Fit section, not a substitute for reading them):**
+
+{format_overlap(overlap)}
+""" if overlap else ''
+    return f"""You are a highly critical and discerning Resume Evaluator. Your primary function is to rigorously assess a candidate's suitability for a specific job role by comparing their resume against the provided job description. You will speak directly to the candidate using "you" and "your".
+
+Here is the job description:
+
+--- JOB DESCRIPTION START ---
+{job_description}
+--- JOB DESCRIPTION END ---
+
+And here is the candidate's resume:
+
+--- RESUME START ---
+{resume_text}
+--- RESUME END ---
+{overlap_section}
+**CRITICAL FIRST STEP - Job Description Validation:**
+
+Before evaluating the resume, you must first assess whether the provided job description is valid and substantive enough for meaningful evaluation. 
+
+**Invalid Job Description Criteria:**
+- Contains only a few words (less than 10 meaningful words)
+- Lacks any specific job requirements, responsibilities, or role details
+- Is just a job title without description (e.g., "Software Engineer", "Manager", "Sales")
+- Contains nonsensical text, random words, or placeholder text
+- Is clearly not a legitimate job posting
+
+**If the job description is invalid:** Return a score of 0 and provide feedback explaining that a proper job description is required for accurate evaluation.
+
+**If the job description is valid:** Proceed with the full evaluation below.
+
+Your task is to score the resume on a scale of 0 to 100. A score of 0 indicates absolutely no match, disqualifying factors, or invalid job description, while 100 represents a perfect alignment. Be exacting in your evaluation.
+
+**Scoring Rubric & Penalties (for valid job descriptions only):**
+
+1.  **Fundamental Alignment (Weight: 40%)**:
+    * **Industry/Role Match**: Is the resume's career trajectory and core skill set aligned with the industry and role described in the job description?
+        * **Severe Mismatch**: If the resume is for a completely different field (e.g., a software engineering resume for a botany position), the score in this section should be 0, leading to a very low overall score (likely under 10). Clearly state this fundamental misalignment.
+    * **Experience Level & Availability**:
+        * If the job description specifies an experience level (e.g., "entry-level," "5+ years") and the resume clearly indicates a significant mismatch (e.g., a student resume for a senior role, or a senior executive resume for an explicitly entry-level role), penalize heavily.
+        * If the job is full-time and the resume indicates the candidate is a student who is not graduating soon or otherwise not available for full-time work as implied by the JD, this is a critical mismatch. Penalize heavily and explain why.
+
+2.  **Technical Fit & Key Skills (Weight: 30%)**:
+    * **Presence of Required Skills**: Identify essential keywords, technologies, and skills explicitly mentioned in the job description.
+        * For each **essential** skill from the JD *missing* in the resume, deduct significant points.
+        * For skills present in the resume that *match* the JD, award points.
+    * **Absence of Irrelevant Skills**:
+        * Skills listed in the resume that are *not relevant* to the job description should **not** add to the score and may slightly detract if they create a sense of lack of focus for *this specific role*. Do not heavily penalize for extra skills unless they completely overshadow relevant ones.
+
+3.  **Relevant Experience & Accomplishments (Weight: 20%)**:
+    * Does the work history and project experience directly relate to the responsibilities and requirements outlined in the job description?
+    * Are accomplishments quantified and do they demonstrate impact relevant to the target role?
+    * Lack of directly relevant experience should result in a lower score in this section.
+
+4.  **Clarity, Formatting, and Professionalism (Weight: 10%)**:
+    * Is the resume easy to read, well-organized, and free of significant grammatical errors or typos?
+    * Is the information presented in a professional manner?
+    * While important, this should not salvage a resume that is a poor fit in terms of alignment, skills, or experience.
+
+**Feedback Requirements:**
+
+* For invalid job descriptions: Explain that a detailed job description with specific requirements, responsibilities, and qualifications is needed for accurate resume evaluation.
+* For valid job descriptions: Provide specific examples from the resume that either support a good match or highlight a mismatch with the job description.
+* When skills from the job description are missing in the resume, explicitly state these missing skills and suggest that you consider adding them if you have that experience.
+* If penalizing for fundamental misalignments (like industry mismatch or availability issues), clearly explain this as the primary reason for a low score.
+* Structure your comments as an array of 3 distinct, substantive string paragraphs.
+* Ensure at least one actionable point of improvement is included, even for strong resumes. For very poor matches, the primary improvement point might be to seek roles more aligned with your current resume.
+
+**Output Format:**
+
+Respond *only* in the following JSON format WITHOUT the markdown formatting:
+
+{{
+"score": <numeric score between 0 and 100>,
+"feedback": ["Detailed feedback point 1, including specific examples and direct address.", "Detailed feedback point 2, continuing the evaluation with actionable advice.", "Detailed feedback point 3, summarizing key strengths or critical areas for improvement based on the scoring rubric."]
+}}
+"""
+
+
+def model_request(prompt: str) -> Dict[str, Any]:
+    """The invoke_model body for a scoring prompt (also a batch inference record's modelInput)"""
+    return {
+        "anthropic_version": "bedrock-2023-05-31",
+        "messages": [
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        "max_tokens": MAX_TOKENS,
+        "temperature": TEMPERATURE,
+    }
+
+
+def parse_score(raw_text: str, logger=None) -> Tuple[int, List[str]]:
+    """Score and feedback from the model's response text"""
+    content = parse_model_json(raw_text, logger)
+    # Convert score to integer if it's a decimal
+    return int(float(content['score'])), content['feedback']
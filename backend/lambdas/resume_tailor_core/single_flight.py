@@ -0,0 +1,205 @@
+import functools
+import hashlib
+import json
+import os
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+from botocore.exceptions import ClientError
+
+from .clients import get_table
+from .logger import create_logger, current_logger
+
+# Single-flight for expensive handlers. Concurrent identical requests (double
+# submits, client retries) share one execution: the first request to claim
+# the request's fingerprint becomes the leader and runs the handler; the
+# others wait for the leader's response instead of charging quota and calling
+# the model again. Claims are short-lived items in the ApiUsageLimits table,
+# which already expires items through its `ttl` attribute:
+#
+#     identifier     'flight#<function>#<fingerprint>'
+#     date_service   'single_flight'
+#     status         'running' | 'done'
+#     leader         request ID of the leader
+#     expires_at     end of the leader's lease, or of the shared result
+#     response       the leader's response (JSON), once done
+
+SINGLE_FLIGHT_ENABLED = os.environ.get('SINGLE_FLIGHT_ENABLED', '1') != '0'
+SINGLE_FLIGHT_TABLE = os.environ.get('SINGLE_FLIGHT_TABLE', 'ApiUsageLimits')
+FLIGHT_PREFIX = 'flight#'
+FLIGHT_SORT_KEY = 'single_flight'
+
+MAX_LEASE_SECONDS = 300       # a leader holds its claim at most this long (or until its timeout)
+RESULT_SECONDS = 60           # how long a finished response is shared with late duplicates
+MAX_WAIT_SECONDS = 20         # followers give up before API Gateway's 30 s limit
+POLL_SECONDS = 0.5
+MAX_SHARED_RESPONSE_BYTES = 350 * 1024  # DynamoDB items are capped at 400 KB
+RETRY_AFTER_SECONDS = 2
+
+
+def request_fingerprint(*parts: Any) -> str:
+    """Stable hash of the inputs that make two requests identical"""
+    canonical = json.dumps(parts, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class Flight:
+    """One request's participation in a single-flight group"""
+
+    def __init__(self, function_name: str, fingerprint: str, request_id: Optional[str] = None, table=None):
+        self.function_name = function_name
+        self.key = {'identifier': f"{FLIGHT_PREFIX}{function_name}#{fingerprint}", 'date_service': FLIGHT_SORT_KEY}
+        self.request_id = request_id or str(uuid.uuid4())
+        self.table = table or get_table(SINGLE_FLIGHT_TABLE)
+        self.is_leader = False
+
+    def _claim(self, lease_seconds: float) -> bool:
+        now = time.time()
+        try:
+            self.table.put_item(
+                Item=dict(self.key, status='running', leader=self.request_id,
+                          expires_at=int(now + lease_seconds), ttl=int(now + lease_seconds + 3600)),
+                ConditionExpression="attribute_not_exists(identifier) OR expires_at < :now",
+                ExpressionAttributeValues={':now': int(now)}
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                return False
+            raise
+        self.is_leader = True
+        return True
+
+    def join(self, lease_seconds: float = MAX_LEASE_SECONDS, max_wait_seconds: float = MAX_WAIT_SECONDS) -> Optional[Dict]:
+        """
+        Become the leader (returns None; run the handler, then call finish)
+        or wait for the leader and return its response. A follower that
+        outwaits max_wait_seconds gets a 409 asking it to retry, by which
+        time the leader's response is usually stored.
+        """
+        deadline = time.time() + max_wait_seconds
+        while True:
+            if self._claim(lease_seconds):
+                return None
+            while True:
+                item = self.table.get_item(Key=self.key, ConsistentRead=True).get('Item')
+                if item is None or int(item['expires_at']) < time.time():
+                    break  # the leader failed or its claim lapsed; try to take over
+                if item['status'] == 'done':
+                    return self._shared(json.loads(item['response']), item['leader'])
+                if time.time() + POLL_SECONDS > deadline:
+                    return self._pending(item['leader'])
+                time.sleep(POLL_SECONDS)
+
+    def finish(self, response: Optional[Dict]):
+        """Share a successful response with duplicates; otherwise release the claim"""
+        if not self.is_leader:
+            return
+        condition = {'ConditionExpression': "leader = :me", 'ExpressionAttributeValues': {':me': self.request_id}}
+        try:
+            encoded = json.dumps(response) if isinstance(response, dict) and response.get('statusCode') == 200 else None
+            if encoded is not None and len(encoded) <= MAX_SHARED_RESPONSE_BYTES:
+                now = time.time()
+                self.table.update_item(
+                    Key=self.key,
+                    UpdateExpression="SET #status = :done, #response = :response, expires_at = :expires",
+                    ExpressionAttributeNames={'#status': 'status', '#response': 'response'},
+                    ConditionExpression=condition['ConditionExpression'],
+                    ExpressionAttributeValues=dict(condition['ExpressionAttributeValues'], **{
+                        ':done': 'done',
+                        ':response': encoded,
+                        ':expires': int(now + RESULT_SECONDS)
+                    })
+                )
+            else:
+                self.table.delete_item(Key=self.key, **condition)
+        except ClientError as e:
+            # Our lease lapsed and another request took over; its result stands
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+
+    def _shared(self, response: Dict, leader: str) -> Dict:
+        headers = dict(response.get('headers') or {})
+        headers['X-Single-Flight'] = f"follower; leader={leader}"
+        return dict(response, headers=headers)
+
+    def _pending(self, leader: str) -> Dict:
+        return {
+            'statusCode': 409,
+            'headers': {
+                'Content-Type': 'application/json',
+                'Retry-After': str(RETRY_AFTER_SECONDS),
+                'X-Single-Flight': f"pending; leader={leader}"
+            },
+            'body': json.dumps({
+                'error': 'An identical request is already being processed',
+                'pending': True,
+                'retryAfter': RETRY_AFTER_SECONDS
+            })
+        }
+
+
+def single_flight(function_name: str, fingerprint: Callable[[Dict], Optional[str]]):
+    """
+    Decorator for lambda_handler (below log_invocation). fingerprint(event)
+    returns the request's fingerprint, or None to run the handler without
+    deduplication (e.g. a body the handler will reject anyway).
+    """
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(event, context):
+            if not SINGLE_FLIGHT_ENABLED:
+                return handler(event, context)
+            try:
+                key = fingerprint(event)
+            except Exception:
+                key = None
+            if key is None:
+                return handler(event, context)
+
+            request_id = (event.get('requestContext') or {}).get('requestId')
+            lease_seconds = MAX_LEASE_SECONDS
+            if hasattr(context, 'get_remaining_time_in_millis'):
+                lease_seconds = min(lease_seconds, context.get_remaining_time_in_millis() / 1000)
+            wait_start = time.time()
+            try:
+                flight = Flight(function_name, key, request_id)
+                shared = flight.join(lease_seconds=lease_seconds)
+            except Exception as e:
+                # Deduplication is an optimisation; a claim that cannot be made never fails the request.
+                # Recorded on the handler's logger, the one log_invocation flushes
+                try:
+                    return handler(event, context)
+                finally:
+                    logger = current_logger()
+                    if logger is not None:
+                        logger.warning("Single-flight unavailable, ran without deduplication", {'error': str(e)})
+                        logger.put_metric('SingleFlight', 1, unit='Count', role='bypass')
+            if shared is not None:
+                logger = create_logger(function_name)
+                logger.info("Request served by single-flight leader", {
+                    'status_code': shared.get('statusCode'),
+                    'wait_ms': round((time.time() - wait_start) * 1000, 2),
+                    'fingerprint': key[:16]
+                })
+                logger.put_metric('SingleFlight', 1, unit='Count', role='follower',
+                                  outcome='shared' if shared.get('statusCode') != 409 else 'pending')
+                return shared
+
+            response = None
+            try:
+                response = handler(event, context)
+                return response
+            finally:
+                try:
+                    flight.finish(response)
+                except Exception as e:
+                    logger = current_logger()
+                    if logger is not None:
+                        logger.warning("Failed to finish single-flight claim", {'error': str(e)})
+                else:
+                    logger = current_logger()
+                    if logger is not None:
+                        logger.put_metric('SingleFlight', 1, unit='Count', role='leader')
+        return wrapper
+    return decorator
@@ -0,0 +1,215 @@
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from botocore.exceptions import ClientError
+
+from .clients import get_table
+from .compression import JSON_ZLIB, pack_json, unpack_json
+from .tailoring import PROMPT_VERSION
+
+# Tailored resumes and batch tailoring jobs in the TailoredResumes table,
+# keyed by user so one user's items can never be read with another's ID:
+#
+#     userId            Cognito sub (partition key)
+#     tailorId          'batch#<batchId>' for a batch status item,
+#                       'batch#<batchId>#<index>' for one of its results,
+#                       'tailor#<master version>#<jdHash>#v<prompt version>'
+#                       for a cached tailoring (sort key)
+#
+# A batch status item is what the dashboard polls, so it stays small and is
+# only ever updated in place:
+#
+#     status            queued -> running -> complete (or failed)
+#     total             job descriptions in the batch
+#     completed/failed  counters, incremented as each tailoring finishes
+#     jobs              [{index, jdHash, title}], written once
+#     outcomes          [{index, state, tailorId, changes} or {index, state, error}],
+#                       appended in completion order
+#     concurrency, createdAt, startedAt, updatedAt, error
+#
+# A worker that hits the Lambda timeout, or an asynchronous event that is never
+# delivered, leaves a batch running or queued; is_stalled tells readers to
+# report such a batch as failed.
+#
+# A result item holds the tailored entries as compressed JSON (itemsBlob,
+# itemsEncoding), with jdHash, changes and createdAt. Every kind expires
+# after TTL_SECONDS.
+#
+# A cached tailoring is the answer to tailoring one master resume version to
+# one job description with one prompt version, so repeating the request is a
+# read instead of a model call. The master version is its updatedAt, which
+# process_master_resume sets on every upload: entries for an older version are
+# never looked up again and expire, with nothing to delete.
+
+TABLE_NAME = 'TailoredResumes'
+TTL_SECONDS = 30 * 24 * 3600
+BATCH_PREFIX = 'batch#'
+CACHE_PREFIX = 'tailor#'
+
+WORKER_TIMEOUT_SECONDS = 900    # tailor_batch's timeout in deploy.py
+MAX_QUEUED_SECONDS = 6 * 3600   # Lambda's maximum age of an asynchronous event
+TIMED_OUT = 'timed out'
+
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETE = 'complete'
+FAILED = 'failed'
+
+
+def batch_key(batch_id: str) -> str:
+    return f'{BATCH_PREFIX}{batch_id}'
+
+
+def batch_result_key(batch_id: str, index: int) -> str:
+    return f'{BATCH_PREFIX}{batch_id}#{int(index):03d}'
+
+
+def cache_key(master_version: str, jd_hash: str) -> str:
+    return f'{CACHE_PREFIX}{master_version}#{jd_hash}#v{PROMPT_VERSION}'
+
+
+def _now() -> str:
+    return datetime.now().isoformat()
+
+
+def new_batch(user_id: str, batch_id: str, jobs: List[Dict[str, Any]], concurrency: int, table=None) -> Dict[str, Any]:
+    """Write the status item of a queued batch"""
+    now = _now()
+    item = {
+        'userId': user_id,
+        'tailorId': batch_key(batch_id),
+        'batchId': batch_id,
+        'status': QUEUED,
+        'total': len(jobs),
+        'completed': 0,
+        'failed': 0,
+        'concurrency': concurrency,
+        'jobs': jobs,
+        'outcomes': [],
+        'createdAt': now,
+        'updatedAt': now,
+        'ttl': int(time.time()) + TTL_SECONDS
+    }
+    (table or get_table(TABLE_NAME)).put_item(Item=item, ConditionExpression='attribute_not_exists(tailorId)')
+    return item
+
+
+def _set_status(user_id: str, batch_id: str, status: str, expected: Optional[str] = None,
+                error: Optional[str] = None, table=None, **attributes: Any) -> bool:
+    names = {'#status': 'status', '#updatedAt': 'updatedAt'}
+    values = {':status': status, ':now': _now()}
+    update = 'SET #status = :status, #updatedAt = :now'
+    if error is not None:
+        attributes['error'] = error
+    for name, value in attributes.items():
+        names[f'#{name}'] = name
+        values[f':{name}'] = value
+        update += f', #{name} = :{name}'
+    condition = 'attribute_exists(tailorId)'
+    if expected is not None:
+        values[':expected'] = expected
+        condition += ' AND #status = :expected'
+    try:
+        (table or get_table(TABLE_NAME)).update_item(
+            Key={'userId': user_id, 'tailorId': batch_key(batch_id)},
+            UpdateExpression=update,
+            ConditionExpression=condition,
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            return False
+        raise
+    return True
+
+
+def start_batch(user_id: str, batch_id: str, table=None) -> bool:
+    """Move a queued batch to running; False if it is not queued (a repeated delivery of the job)"""
+    return _set_status(user_id, batch_id, RUNNING, expected=QUEUED, table=table, startedAt=_now())
+
+
+def finish_batch(user_id: str, batch_id: str, error: Optional[str] = None, table=None) -> None:
+    """Mark a batch complete, or failed with error"""
+    _set_status(user_id, batch_id, FAILED if error else COMPLETE, error=error, table=table)
+
+
+def record_outcome(user_id: str, batch_id: str, outcome: Dict[str, Any], table=None) -> None:
+    """Append one job's outcome to the status item and count it"""
+    (table or get_table(TABLE_NAME)).update_item(
+        Key={'userId': user_id, 'tailorId': batch_key(batch_id)},
+        UpdateExpression='SET #outcomes = list_append(#outcomes, :outcome), #updatedAt = :now ADD #counter :one',
+        ExpressionAttributeNames={
+            '#outcomes': 'outcomes',
+            '#updatedAt': 'updatedAt',
+            '#counter': 'failed' if outcome.get('error') else 'completed'
+        },
+        ExpressionAttributeValues={':outcome': [outcome], ':now': _now(), ':one': 1}
+    )
+
+
+def is_stalled(batch: Dict[str, Any]) -> bool:
+    """Whether an unfinished batch can no longer finish: its worker outlived the timeout, or its event expired"""
+    if batch['status'] == RUNNING:
+        since, limit = batch.get('startedAt') or batch['updatedAt'], WORKER_TIMEOUT_SECONDS
+    elif batch['status'] == QUEUED:
+        since, limit = batch['createdAt'], MAX_QUEUED_SECONDS
+    else:
+        return False
+    return (datetime.now() - datetime.fromisoformat(since)).total_seconds() > limit
+
+
+def load_batch(user_id: str, batch_id: str, table=None) -> Optional[Dict[str, Any]]:
+    return (table or get_table(TABLE_NAME)).get_item(
+        Key={'userId': user_id, 'tailorId': batch_key(batch_id)}
+    ).get('Item')
+
+
+def save_tailored(user_id: str, tailor_id: str, resume_items: Any, jd_hash: Optional[str], changes: int,
+                  table=None, **attributes: Any) -> None:
+    """Store a tailored resume; attributes are stored alongside as they are"""
+    item = {
+        'userId': user_id,
+        'tailorId': tailor_id,
+        'itemsBlob': pack_json(resume_items),
+        'itemsEncoding': JSON_ZLIB,
+        'jdHash': jd_hash,
+        'changes': changes,
+        'createdAt': _now(),
+        'ttl': int(time.time()) + TTL_SECONDS
+    }
+    item.update(attributes)
+    (table or get_table(TABLE_NAME)).put_item(Item=item)
+
+
+def load_tailored(user_id: str, tailor_id: str, table=None) -> Optional[Dict[str, Any]]:
+    """A stored tailored resume with its entries decoded as resumeItems, or None"""
+    item = (table or get_table(TABLE_NAME)).get_item(Key={'userId': user_id, 'tailorId': tailor_id}).get('Item')
+    if item is None:
+        return None
+    encoding = item.get('itemsEncoding', JSON_ZLIB)
+    if encoding != JSON_ZLIB:
+        raise ValueError(f'Unknown tailored items encoding: {encoding}')
+    result = {key: value for key, value in item.items() if key not in ('itemsBlob', 'itemsEncoding')}
+    result['resumeItems'] = unpack_json(item['itemsBlob'])
+    return result
+
+
+def is_cached(user_id: str, master_version: str, jd_hash: str, table=None) -> bool:
+    """Whether a tailoring is cached, without reading its entries"""
+    return 'Item' in (table or get_table(TABLE_NAME)).get_item(
+        Key={'userId': user_id, 'tailorId': cache_key(master_version, jd_hash)},
+        ProjectionExpression='tailorId'
+    )
+
+
+def load_cached(user_id: str, master_version: str, jd_hash: str, table=None) -> Optional[Dict[str, Any]]:
+    """The cached tailoring of this master version to this job description, or None"""
+    return load_tailored(user_id, cache_key(master_version, jd_hash), table=table)
+
+
+def save_cached(user_id: str, master_version: str, jd_hash: str, resume_items: Any, changes: int,
+                table=None) -> None:
+    save_tailored(user_id, cache_key(master_version, jd_hash), resume_items, jd_hash, changes, table=table,
+                  masterVersion=master_version, promptVersion=PROMPT_VERSION)
@@ -0,0 +1,102 @@
+import json
+from typing import Any, Dict, List
+
+from .json_parser import load_model_json
+
+# The tailoring prompt and model request, shared by tailor_master_resume and
+# the batch tailoring job, so a tailored resume is the same whichever way it
+# was requested.
+#
+# Stored tailored resumes are reused only while PROMPT_VERSION matches; bump it
+# with any change to the prompt, model or settings that should change output.
+
+BEDROCK_REGION = 'us-east-2'
+MODEL_ID = 'arn:aws:bedrock:us-east-2:429744659578:inference-profile/us.anthropic.claude-3-haiku-20240307-v1:0'
+MAX_TOKENS = 8192
+TEMPERATURE = 0.3
+PROMPT_VERSION = 1
+
+
+def format_prompt(job_description: str, resume_entries: List[Dict[str, Any]]) -> str:
+    """The tailoring prompt for a job description and the master resume entries"""
+    return f"""Given the following job description and resume items, subtly enhance the content to better match the job requirements while maintaining professional resume formatting. Make minimal, strategic changes that highlight relevant skills naturally.
+
+**Job Description:**
+{job_description}
+
+**Resume Items:**
+{json.dumps(resume_entries, indent=2)}
+
+**Instructions:**
+* Keep ALL resume items - don't remove any entries
+* NEVER modify education sections (degrees, courses, schools) - these are factual and objective
+* PRESERVE exact formatting including newlines, spacing, and line breaks - do not collapse or change whitespace
+* For skills sections: Keep as concise lists or brief phrases, NOT verbose paragraphs
+* For experience descriptions: Make subtle keyword optimizations while maintaining the original tone and style
+* AVOID adding explanatory phrases like "demonstrating strong skills in..." or "providing technical background in..."
+* Keep the professional, concise resume format - no academic or verbose descriptions
+* Only enhance what could realistically have been achieved in the original role/project
+* Maintain the exact same JSON structure and field names
+* Keep userInfo unchanged unless optimizing brief skills/summary sections
+
+**What TO DO:**
+* Subtly incorporate relevant keywords from the job description into existing descriptions
+* Highlight aspects of achievements that align with job requirements
+* Replace generic terms with more specific, relevant technical terms when appropriate
+* Optimize bullet points to emphasize job-relevant accomplishments
+* ACTIVELY ADD relevant skills, programming languages, frameworks, and tools from the job description to skills sections
+* Add technical skills that would logically fit with the person's background and the target role
+* Include relevant technologies, languages, and tools mentioned in the job posting
+
+**What NOT TO DO:**
+* Add verbose explanations or educational descriptions
+* Change factual information (dates, organizations, degrees, course names)
+* Turn concise skill lists into paragraph descriptions
+* Add phrases that explicitly state what skills are being demonstrated
+* Make changes that don't fit the original resume's style and tone
+* Modify newlines, spacing, or formatting - preserve exact whitespace structure
+
+**Output Format:**
+For each resume item, return an object with this structure:
+{{
+  "original": {{ original resume item exactly as provided }},
+  "tailored": {{ enhanced version with subtle, job-relevant optimizations }},
+  "hasChanges": true/false
+}}
+
+**Critical Requirements:**
+* Return a JSON array where each element has "original", "tailored", and "hasChanges" fields
+* Keep all field names and structure identical between original and tailored versions
+* Maintain professional resume formatting - concise, action-oriented, no verbose explanations
+* Ensure the output is valid JSON
+* RESPOND WITH ONLY THE JSON ARRAY - NO introductory text, concluding remarks, comments, or explanations
+* Your response must start with '[' and end with ']'
+* Do not add phrases like "Here is the enhanced resume" or any other text before the JSON
+"""
+
+
+def model_request(prompt: str) -> Dict[str, Any]:
+    """The invoke_model body for a tailoring prompt"""
+    return {
+        "anthropic_version": "bedrock-2023-05-31",
+        "messages": [
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        "max_tokens": MAX_TOKENS,
+        "temperature": TEMPERATURE
+    }
+
+
+def parse_tailored(raw_text: str) -> List[Dict[str, Any]]:
+    """The tailored items in a model response"""
+    return load_model_json(raw_text, expect=list)
+
+
+def count_changes(tailored_items: Any) -> int:
+    """How many tailored items the model changed"""
+    if not isinstance(tailored_items, list):
+        return 0
+    return sum(1 for item in tailored_items if item.get('hasChanges', False))
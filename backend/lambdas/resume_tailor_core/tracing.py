@@ -0,0 +1,166 @@
+import re
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Any, Dict, Optional, Tuple
+
+# Per-invocation tracing. A trace is started for each request by the
+# log_invocation decorator; code anywhere in the function opens child spans with
+#
+#     with span('bedrock.invoke_model', model_id=MODEL_ID):
+#         ...
+#
+# Spans nest through a context variable, so library code (rate limiter, JSON
+# parser) can open spans without being handed a tracer. Outside a trace span()
+# is a no-op. The finished trace is written as one log line (see
+# ResumeTailorLogger.log_trace) and turned into per-request breakdowns by
+# benchmarks/trace_report.py.
+
+# W3C trace context: version-traceid-parentid-flags
+_TRACEPARENT_RE = re.compile(r'^[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$')
+# X-Ray: Root=1-5759e988-bd862e3fe1be46a994272793;Parent=53995c3f42cd8ad8;Sampled=1
+_XRAY_ROOT_RE = re.compile(r'Root=1-([0-9a-f]{8})-([0-9a-f]{24})')
+_XRAY_PARENT_RE = re.compile(r'Parent=([0-9a-f]{16})')
+
+_current_span: ContextVar[Optional['Span']] = ContextVar('resume_tailor_span', default=None)
+
+
+def _new_span_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+class Span:
+    """One timed stage of a request; use as a context manager"""
+
+    __slots__ = ('trace', 'name', 'span_id', 'parent_id', 'attributes', 'start', 'end', 'error', '_token')
+
+    def __init__(self, trace: 'Trace', name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace = trace
+        self.name = name
+        self.span_id = _new_span_id()
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.start = None
+        self.end = None
+        self.error = None
+        self._token = None
+
+    def set(self, **attributes):
+        """Attach attributes known only once the stage has run, e.g. result sizes"""
+        self.attributes.update(attributes)
+
+    def __enter__(self) -> 'Span':
+        self.start = time.perf_counter()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end = time.perf_counter()
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        _current_span.reset(self._token)
+        self.trace.spans.append(self)
+        return False
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end or time.perf_counter()) - self.start) * 1000
+
+
+class _NoopSpan:
+    """Returned by span() outside a trace, so instrumented code runs unchanged"""
+
+    def set(self, **attributes):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Trace:
+    """The spans of one invocation, rooted at a span named after the function"""
+
+    def __init__(self, name: str, trace_id: Optional[str] = None, parent_id: Optional[str] = None,
+                 correlation_id: Optional[str] = None):
+        self.trace_id = trace_id or uuid.uuid4().hex
+        self.correlation_id = correlation_id
+        self.spans = []
+        self.root = Span(self, name, parent_id, {})
+
+    def export(self) -> Dict[str, Any]:
+        """Finished spans as plain data, offsets relative to the start of the root span"""
+        origin = self.root.start
+        spans = []
+        for s in sorted(self.spans, key=lambda s: s.start):
+            record = {
+                'name': s.name,
+                'span_id': s.span_id,
+                'parent_id': s.parent_id,
+                'start_ms': round((s.start - origin) * 1000, 3),
+                'duration_ms': round(s.duration_ms, 3)
+            }
+            if s.error:
+                record['error'] = s.error
+            if s.attributes:
+                record['attributes'] = s.attributes
+            spans.append(record)
+        return {'trace_id': self.trace_id, 'correlation_id': self.correlation_id, 'spans': spans}
+
+
+def parse_trace_context(headers: Optional[Dict[str, str]]) -> Tuple[Optional[str], Optional[str]]:
+    """(trace_id, parent span id) from a W3C traceparent or X-Ray trace header, if the caller sent one"""
+    if not headers:
+        return None, None
+    lowered = {k.lower(): v for k, v in headers.items() if isinstance(v, str)}
+    match = _TRACEPARENT_RE.match(lowered.get('traceparent', '').strip())
+    if match:
+        return match.group(1), match.group(2)
+    xray = lowered.get('x-amzn-trace-id', '')
+    root = _XRAY_ROOT_RE.search(xray)
+    if root:
+        parent = _XRAY_PARENT_RE.search(xray)
+        return root.group(1) + root.group(2), parent.group(1) if parent else None
+    return None, None
+
+
+def request_id(event: Any) -> Optional[str]:
+    """The API Gateway request ID, which is what clients and access logs see"""
+    if isinstance(event, dict):
+        return (event.get('requestContext') or {}).get('requestId')
+    return None
+
+
+def start_trace(name: str, event: Any) -> Trace:
+    """Begin the trace of one invocation and enter its root span"""
+    headers = event.get('headers') if isinstance(event, dict) else None
+    trace_id, parent_id = parse_trace_context(headers)
+    trace = Trace(name, trace_id, parent_id, request_id(event))
+    trace.root.__enter__()
+    return trace
+
+
+def end_trace(trace: Trace, error: Optional[BaseException] = None):
+    """Close the root span; the trace is complete after this"""
+    if error is not None:
+        trace.root.__exit__(type(error), error, None)
+    else:
+        trace.root.__exit__(None, None, None)
+
+
+def span(name: str, **attributes):
+    """A child span of the current one, or a no-op outside a trace"""
+    parent = _current_span.get()
+    if parent is None:
+        return _NOOP_SPAN
+    return Span(parent.trace, name, parent.span_id, attributes)
+
+
+def current_span():
+    """The innermost open span, or None outside a trace"""
+    return _current_span.get()
@@ -0,0 +1,108 @@
+import base64
+import binascii
+import re
+
+# Upload limits - resumes are short documents, anything beyond these is
+# rejected before it can cost an S3 write, a rate limit increment or a
+# Textract call
+MAX_FILE_SIZE_BYTES = 5 * 1024 * 1024
+MAX_PAGE_COUNT = 10
+
+PDF_MAGIC = b'%PDF-'
+HEADER_SCAN_BYTES = 1024   # the header may be preceded by junk bytes
+TRAILER_SCAN_BYTES = 1024  # and %%EOF may be followed by junk bytes
+
+# Linearized PDFs state the page count in their first object
+_LINEARIZED_PAGES_RE = re.compile(rb'/Linearized\b.{0,256}?/N\s+(\d+)', re.S)
+# Page tree nodes: /Type /Pages ... /Count N in either order within one dict
+_PAGE_TREE_COUNT_RE = re.compile(
+    rb'/Type\s*/Pages\b(?:(?!>>).){0,512}?/Count\s+(\d+)'
+    rb'|/Count\s+(\d+)(?:(?!>>).){0,512}?/Type\s*/Pages\b',
+    re.S
+)
+# Individual page objects
+_PAGE_OBJECT_RE = re.compile(rb'/Type\s*/Page(?![A-Za-z])')
+
+
+class UploadValidationError(ValueError):
+    """Raised when an uploaded file fails validation"""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+def estimate_page_count(data):
+    """
+    Estimate the page count of a PDF by scanning for page tree markers
+    without parsing the document.
+    Returns None when the page tree is not visible (e.g. compressed object streams).
+    """
+    match = _LINEARIZED_PAGES_RE.search(data, 0, HEADER_SCAN_BYTES)
+    if match:
+        return int(match.group(1))
+
+    counts = [int(a or b) for a, b in _PAGE_TREE_COUNT_RE.findall(data)]
+    if counts:
+        # The root of the page tree carries the largest count
+        return max(counts)
+
+    pages = len(_PAGE_OBJECT_RE.findall(data))
+    return pages or None
+
+
+def validate_pdf(data):
+    """
+    Check PDF magic bytes, size ceiling and page count.
+    Returns the estimated page count (None if unknown).
+    Raises UploadValidationError on invalid input.
+    """
+    if not data:
+        raise UploadValidationError('Uploaded file is empty')
+
+    if len(data) > MAX_FILE_SIZE_BYTES:
+        raise UploadValidationError(
+            f'File exceeds the maximum size of {MAX_FILE_SIZE_BYTES // (1024 * 1024)} MB',
+            status_code=413
+        )
+
+    if data.find(PDF_MAGIC, 0, HEADER_SCAN_BYTES) == -1:
+        raise UploadValidationError('Uploaded file is not a PDF')
+
+    if data.find(b'%%EOF', max(0, len(data) - TRAILER_SCAN_BYTES)) == -1:
+        raise UploadValidationError('Uploaded PDF is truncated or corrupt')
+
+    page_count = estimate_page_count(data)
+    if page_count is not None and page_count > MAX_PAGE_COUNT:
+        raise UploadValidationError(
+            f'PDF has {page_count} pages, the maximum is {MAX_PAGE_COUNT}'
+        )
+
+    return page_count
+
+
+def decode_and_validate_pdf(base64_file):
+    """
+    Decode a base64 upload and validate it as a PDF.
+    The encoded length is checked first so oversized payloads are rejected
+    without decoding them.
+    Returns tuple: (file_data: bytes, page_count: int or None)
+    """
+    if not isinstance(base64_file, str) or not base64_file:
+        raise UploadValidationError('File must be a non-empty base64 string')
+
+    max_encoded_length = 4 * ((MAX_FILE_SIZE_BYTES + 2) // 3)
+    if len(base64_file) > max_encoded_length:
+        raise UploadValidationError(
+            f'File exceeds the maximum size of {MAX_FILE_SIZE_BYTES // (1024 * 1024)} MB',
+            status_code=413
+        )
+
+    try:
+        file_data = base64.b64decode(base64_file, validate=True)
+    except (binascii.Error, ValueError):
+        raise UploadValidationError('File is not valid base64')
+
+    page_count = validate_pdf(file_data)
+    return file_data, page_count
@@ -0,0 +1,349 @@
+import json
+import os
+import sys
+import time
+import uuid
+
+# Add parent directory to path so resume_tailor_core resolves outside the Lambda layer
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from resume_tailor_core.logger import create_logger, log_invocation
+from resume_tailor_core.tracing import span
+from resume_tailor_core.rate_limiter import create_rate_limiter
+from resume_tailor_core.clients import get_client
+from resume_tailor_core.batch import DEFAULT_CONCURRENCY, map_bounded
+from resume_tailor_core.resume_store import load_master
+from resume_tailor_core.jd_store import load_job_description, save_job_description
+from resume_tailor_core.tailoring import (BEDROCK_REGION, MODEL_ID, count_changes, format_prompt, model_request,
+                                          parse_tailored)
+from resume_tailor_core.tailor_store import (TIMED_OUT, batch_result_key, finish_batch, is_cached, load_batch,
+                                             load_cached, new_batch, record_outcome, save_cached, save_tailored,
+                                             start_batch)
+
+# A request starts a batch: it charges the Bedrock quota per job description
+# not already tailored to the current master version, writes the status item
+# and invokes this function again asynchronously with WORKER_KEY to do the
+# tailoring, which would not fit in API Gateway's 30 s.
+# get_tailor_batch serves the status item and the results.
+WORKER_KEY = 'tailorBatch'
+MAX_BATCH_JOBS = 20
+MAX_CONCURRENCY = 8
+MAX_TITLE_LENGTH = 80
+# A job only starts with this much of the worker's time left: room for one
+# tailoring and for marking the batch finished before the Lambda timeout
+TIME_RESERVE_MS = 120 * 1000
+
+
+def job_title(text):
+    return text.strip().split('\n', 1)[0][:MAX_TITLE_LENGTH]
+
+
+def tailor_job(logger, user_id, batch_id, job, master, context, rate_limiter):
+    """Tailor the master entries to one job description, store the result and record the outcome"""
+    outcome = {'index': int(job['index'])}
+    tailor_id = batch_result_key(batch_id, job['index'])
+    master_version = master.get('updatedAt')
+    if context.get_remaining_time_in_millis() < TIME_RESERVE_MS:
+        outcome.update(state='failed', error=TIMED_OUT)
+        record_outcome(user_id, batch_id, outcome)
+        return outcome
+    try:
+        # A tailoring cached by an earlier request or batch is copied, not generated again
+        cached = load_cached(user_id, master_version, job['jdHash']) if master_version else None
+        if cached is not None:
+            changes = int(cached.get('changes', 0))
+            with span('dynamodb.put_item', index=job['index'], cached=True):
+                save_tailored(user_id, tailor_id, cached['resumeItems'], job['jdHash'], changes, batchId=batch_id)
+            outcome.update(state='done', tailorId=tailor_id, changes=changes, cached=True)
+            record_outcome(user_id, batch_id, outcome)
+            return outcome
+        if job.get('cached'):
+            # Cached when the batch was queued, so not charged then; it has expired or the master changed since
+            identifier, user_type = rate_limiter.get_user_identifier({}, {'sub': user_id})
+            success, current_count, limit = rate_limiter.check_and_increment_usage(
+                identifier, user_type, 'bedrock_requests'
+            )
+            logger.log_rate_limit_check(identifier, user_type, 'bedrock_requests', success, current_count, limit)
+            if not success:
+                raise RuntimeError('Daily API limit exceeded')
+
+        jd_record = load_job_description(job['jdHash'])
+        if jd_record is None:
+            raise LookupError('Job description not found')
+        prompt = format_prompt(jd_record['text'], master['entries'])
+        with span('bedrock.invoke_model', index=job['index']):
+            bedrock_start = time.time()
+            response = get_client("bedrock-runtime", region_name=BEDROCK_REGION).invoke_model(
+                modelId=MODEL_ID,
+                contentType="application/json",
+                accept="application/json",
+                body=json.dumps(model_request(prompt))
+            )
+            bedrock_duration = (time.time() - bedrock_start) * 1000
+        logger.put_metric('ServiceLatency', bedrock_duration, service='bedrock', operation='invoke_model')
+        raw_text = json.loads(response["body"].read())["content"][0]["text"]
+        tailored_resume = parse_tailored(raw_text)
+        changes = count_changes(tailored_resume)
+        with span('dynamodb.put_item', index=job['index']):
+            save_tailored(user_id, tailor_id, tailored_resume, job['jdHash'], changes, batchId=batch_id)
+            if master_version:
+                save_cached(user_id, master_version, job['jdHash'], tailored_resume, changes)
+        outcome.update(state='done', tailorId=tailor_id, changes=changes)
+    except Exception as e:
+        logger.warning("Tailoring failed for job description", {'index': job['index'], 'error': str(e)})
+        outcome.update(state='failed', error=str(e))
+    record_outcome(user_id, batch_id, outcome)
+    return outcome
+
+
+def worker_response(batch_id, status):
+    return {'statusCode': 200, 'body': json.dumps({'batchId': batch_id, 'status': status})}
+
+
+def run_batch(logger, payload, context):
+    """The asynchronous half: tailor every job description of a queued batch"""
+    user_id, batch_id = payload['userId'], payload['batchId']
+    if not start_batch(user_id, batch_id):
+        # Lambda may deliver an asynchronous event more than once
+        logger.warning("Batch is not queued, skipping", {'batch_id': batch_id})
+        return worker_response(batch_id, 'skipped')
+
+    batch = load_batch(user_id, batch_id)
+    # The master entries are read once for the whole batch
+    with span('dynamodb.get_item', projection='entries,updatedAt'):
+        dynamodb_start = time.time()
+        master = load_master(user_id, ('entries', 'updatedAt'))
+        dynamodb_duration = (time.time() - dynamodb_start) * 1000
+    logger.put_metric('ServiceLatency', dynamodb_duration, service='dynamodb', operation='get_item')
+    if master is None:
+        logger.warning("No master resume found for user", {'user_id': user_id})
+        finish_batch(user_id, batch_id, error='No master resume found')
+        return worker_response(batch_id, 'failed')
+
+    jobs, concurrency = batch['jobs'], int(batch['concurrency'])
+    logger.info("Tailoring batch", {'batch_id': batch_id, 'jobs': len(jobs), 'concurrency': concurrency})
+    rate_limiter = create_rate_limiter()
+    outcomes = [
+        result for result, _ in
+        map_bounded(lambda job: tailor_job(logger, user_id, batch_id, job, master, context, rate_limiter),
+                    jobs, concurrency)
+    ]
+    failed = sum(1 for outcome in outcomes if outcome is None or outcome.get('error'))
+    timed_out = sum(1 for outcome in outcomes if outcome is not None and outcome.get('error') == TIMED_OUT)
+    finish_batch(user_id, batch_id, error=TIMED_OUT if timed_out else None)
+    logger.put_metric('TailorBatchJobs', len(jobs) - failed, unit='Count', outcome='done')
+    logger.put_metric('TailorBatchJobs', failed - timed_out, unit='Count', outcome='failed')
+    logger.put_metric('TailorBatchJobs', timed_out, unit='Count', outcome='timed_out')
+    logger.info("Batch tailoring completed", {
+        'batch_id': batch_id,
+        'completed': len(jobs) - failed,
+        'failed': failed,
+        'timed_out': timed_out
+    })
+    return worker_response(batch_id, 'failed' if timed_out else 'complete')
+
+
+def resolve_job_descriptions(logger, entries):
+    """
+    Each entry as a stored job description: text is saved, {"jdHash": ...} is
+    looked up. Returns (records, None), or (None, error response) for an
+    unknown hash.
+    """
+    records = []
+    for position, entry in enumerate(entries):
+        if isinstance(entry, dict) and entry.get('jdHash'):
+            record = load_job_description(entry['jdHash'])
+            if record is None:
+                logger.warning("Job description not found", {'jd_hash': entry['jdHash']})
+                return None, {
+                    'statusCode': 404,
+                    'body': json.dumps({'error': f'Job description {position} not found. Please send its text instead.'})
+                }
+        else:
+            text = entry.get('jobDescription') if isinstance(entry, dict) else entry
+            if not isinstance(text, str) or not text.strip():
+                return None, {
+                    'statusCode': 400,
+                    'body': json.dumps({'error': f'Job description {position} is empty'})
+                }
+            record = save_job_description(text)
+        records.append(record)
+    return records, None
+
+
+@log_invocation
+def lambda_handler(event, context):
+    # Initialize logger
+    logger = create_logger('tailor_batch')
+    logger.log_function_start(event, context)
+
+    if WORKER_KEY in event:
+        try:
+            return run_batch(logger, event[WORKER_KEY], context)
+        except Exception as e:
+            logger.error("Unexpected error during batch tailoring", {'error': str(e)})
+            finish_batch(event[WORKER_KEY]['userId'], event[WORKER_KEY]['batchId'], error=str(e))
+            raise
+
+    try:
+        logger.info("Parsing request body")
+        with span('parse'):
+            body = json.loads(event["body"])
+            claims = event.get('requestContext', {}).get('authorizer', {}).get('jwt', {}).get('claims', {})
+            user_id = claims.get('sub')
+            entries = body["jobDescriptions"]
+            concurrency = body.get("concurrency", DEFAULT_CONCURRENCY)
+
+        if not user_id:
+            logger.error("Missing user ID in claims", {'has_claims': bool(claims)})
+            return {
+                "statusCode": 401,
+                "body": json.dumps({"error": "Unauthorized: User ID not found"}),
+            }
+        if not isinstance(entries, list) or not entries or len(entries) > MAX_BATCH_JOBS:
+            return {
+                "statusCode": 400,
+                "body": json.dumps({"error": f"jobDescriptions must be a list of 1 to {MAX_BATCH_JOBS} job descriptions"})
+            }
+        if not isinstance(concurrency, int) or isinstance(concurrency, bool):
+            return {
+                "statusCode": 400,
+                "body": json.dumps({"error": "concurrency must be an integer"})
+            }
+        concurrency = max(1, min(concurrency, MAX_CONCURRENCY))
+
+        logger.info("Request parsed successfully", {
+            'user_id': user_id,
+            'job_descriptions': len(entries),
+            'concurrency': concurrency
+        })
+
+        # Fail before charging the quota when there is nothing to tailor
+        with span('dynamodb.get_item', projection='updatedAt'):
+            master = load_master(user_id, ('updatedAt',))
+        if master is None:
+            logger.warning("No master resume found for user", {'user_id': user_id})
+            return {
+                'statusCode': 404,
+                'body': json.dumps({'error': 'No master resume found. Please upload a master resume first.'})
+            }
+
+        with span('dynamodb.save_job_descriptions', count=len(entries)):
+            records, error_response = resolve_job_descriptions(logger, entries)
+        if error_response:
+            return error_response
+
+        # One job per distinct job description; those tailored to this master version before are cached
+        jobs, seen = [], set()
+        master_version = master.get('updatedAt')
+        with span('dynamodb.is_cached', count=len(records)):
+            for record in records:
+                if record['jdHash'] not in seen:
+                    seen.add(record['jdHash'])
+                    jobs.append({
+                        'index': len(jobs),
+                        'jdHash': record['jdHash'],
+                        'title': job_title(record['text']),
+                        'cached': bool(master_version) and is_cached(user_id, master_version, record['jdHash'])
+                    })
+
+        # Each job that is not cached is one Bedrock request against the daily limit; jobs past it are not queued
+        rate_limiter = create_rate_limiter()
+        identifier, user_type = rate_limiter.get_user_identifier(event, claims)
+        logger.set_metric_dimensions(user_type=user_type)
+        queued, rate_limited = [], []
+        exhausted, charged = False, 0
+        for job in jobs:
+            if not job['cached']:
+                if not exhausted:
+                    success, current_count, limit = rate_limiter.check_and_increment_usage(
+                        identifier, user_type, 'bedrock_requests'
+                    )
+                    exhausted = not success
+                    charged += success
+                if exhausted:
+                    rate_limited.append(job)
+                    continue
+            queued.append(job)
+        if charged or exhausted:
+            logger.log_rate_limit_check(identifier, user_type, 'bedrock_requests', charged > 0, current_count, limit)
+        else:
+            # Every job is cached; report the quota as it stands
+            current_count, limit, _ = rate_limiter.get_usage_stats(identifier, 'bedrock_requests')
+
+        if not queued:
+            logger.warning("Bedrock rate limit exceeded", {'current_count': current_count, 'limit': limit})
+            return {
+                'statusCode': 429,
+                'headers': {
+                    'Content-Type': 'application/json',
+                    'X-RateLimit-Limit': str(limit),
+                    'X-RateLimit-Remaining': '0',
+                    'X-RateLimit-Reset': str(int(time.time()) + (24 * 3600))
+                },
+                'body': json.dumps({
+                    'error': 'Daily API limit exceeded',
+                    'message': f'You have exceeded the daily limit of {limit} requests. Please try again tomorrow.',
+                    'current_usage': current_count,
+                    'daily_limit': limit,
+                    'user_type': user_type
+                })
+            }
+
+        batch_id = str(uuid.uuid4())
+        with span('dynamodb.put_item'):
+            new_batch(user_id, batch_id, queued, concurrency)
+
+        with span('lambda.invoke'):
+            lambda_start = time.time()
+            try:
+                get_client('lambda').invoke(
+                    FunctionName=context.invoked_function_arn,
+                    InvocationType='Event',
+                    Payload=json.dumps({WORKER_KEY: {'userId': user_id, 'batchId': batch_id}}).encode('utf-8')
+                )
+            except Exception as e:
+                finish_batch(user_id, batch_id, error=f'Failed to start: {e}')
+                raise
+            lambda_duration = (time.time() - lambda_start) * 1000
+        logger.put_metric('ServiceLatency', lambda_duration, service='lambda', operation='invoke')
+
+        logger.info("Batch queued", {
+            'batch_id': batch_id,
+            'queued': len(queued),
+            'rate_limited': len(rate_limited)
+        })
+
+        return {
+            "statusCode": 202,
+            "headers": {
+                "Content-Type": "application/json",
+                "X-RateLimit-Limit": str(limit),
+                "X-RateLimit-Remaining": str(max(0, limit - current_count)),
+                "X-RateLimit-Reset": str(int(time.time()) + (24 * 3600))
+            },
+            "body": json.dumps({
+                "batchId": batch_id,
+                "status": "queued",
+                "jobs": queued,
+                "rateLimited": rate_limited
+            })
+        }
+
+    except json.JSONDecodeError as e:
+        logger.error("Invalid JSON in request body", {'error': str(e)})
+        return {
+            "statusCode": 400,
+            "body": json.dumps({"error": "Invalid JSON in request body"})
+        }
+    except KeyError as e:
+        logger.error("Missing required field in request", {'missing_field': str(e)})
+        return {
+            "statusCode": 400,
+            "body": json.dumps({"error": f"Missing required field: {str(e)}"})
+        }
+    except Exception as e:
+        logger.error("Unexpected error starting batch tailoring", {'error': str(e)})
+        return {
+            "statusCode": 500,
+            "body": json.dumps({"error": f"Internal Server Error: {str(e)}"})
+        }
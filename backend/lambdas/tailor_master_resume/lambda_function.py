@@ -1,62 +1,34 @@
 import json
-import boto3
-from boto3.dynamodb.conditions import Key
 import os
 import sys
-import re
 import time
 
-# Add parent directory to path for imports
+# Add parent directory to path so resume_tailor_core resolves outside the Lambda layer
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from logger_utils import create_logger
-from rate_limiter import create_rate_limiter
+from resume_tailor_core.logger import create_logger, log_invocation
+from resume_tailor_core.tracing import span
+from resume_tailor_core.rate_limiter import create_rate_limiter
+from resume_tailor_core.clients import get_client
+from resume_tailor_core.single_flight import request_fingerprint, single_flight
+from resume_tailor_core.resume_store import load_master
+from resume_tailor_core.jd_store import clean_text, jd_hash, load_job_description, save_job_description
+from resume_tailor_core.tailoring import (BEDROCK_REGION, MODEL_ID, count_changes, format_prompt, model_request,
+                                          parse_tailored)
+from resume_tailor_core.tailor_store import load_cached, save_cached
 
-s3 = boto3.client("s3")
-bedrock = boto3.client("bedrock-runtime", region_name="us-east-2")
-dynamodb = boto3.resource("dynamodb")
-table = dynamodb.Table("ResumeMetadata")
 
-MODEL_ID = 'arn:aws:bedrock:us-east-2:429744659578:inference-profile/us.anthropic.claude-3-haiku-20240307-v1:0'
-BUCKET_NAME = 'resume-tailor-bucket.kp'
-
-
-def clean_json_string(text):
-    """Clean control characters and introductory text that might break JSON parsing"""
-    # Remove or replace common control characters that break JSON parsing
-    # Keep newlines and tabs as they're valid in JSON strings when properly escaped
-    cleaned = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', '', text)
-    
-    # Remove common introductory phrases the AI might add
-    intro_phrases = [
-        "Here is the enhanced resume with tailored content:",
-        "Here is the tailored resume:",
-        "Here are the enhanced resume items:",
-        "The enhanced resume with tailored content:",
-        "Enhanced resume:",
-        "Tailored resume:",
-    ]
-    
-    cleaned = cleaned.strip()
-    
-    # Remove any introductory text before the JSON
-    for phrase in intro_phrases:
-        if cleaned.lower().startswith(phrase.lower()):
-            cleaned = cleaned[len(phrase):].strip()
-            break
-    
-    # Find the first '[' or '{' to start JSON
-    start_idx = -1
-    for i, char in enumerate(cleaned):
-        if char in ['[', '{']:
-            start_idx = i
-            break
-    
-    if start_idx > 0:
-        cleaned = cleaned[start_idx:]
-    
-    return cleaned.strip()
+def tailor_fingerprint(event):
+    """The same user tailoring against the same job description is a duplicate"""
+    claims = event.get('requestContext', {}).get('authorizer', {}).get('jwt', {}).get('claims', {})
+    if not claims.get('sub'):
+        return None
+    body = json.loads(event["body"])
+    # Text and its stored hash are the same job description
+    return request_fingerprint(claims['sub'], body.get("jdHash") or jd_hash(clean_text(body["jobDescription"])))
 
 
+@log_invocation
+@single_flight('tailor_master_resume', tailor_fingerprint)
 def lambda_handler(event, context):
     # Initialize logger
     logger = create_logger('tailor_master_resume')
@@ -64,28 +36,106 @@ def lambda_handler(event, context):
     
     try:
         logger.info("Parsing request body")
-        body = json.loads(event["body"])
-        claims = event.get('requestContext', {}).get('authorizer', {}).get('jwt', {}).get('claims', {})
-        user_id = claims.get('sub')
-        job_description = body["jobDescription"]
+        with span('parse'):
+            body = json.loads(event["body"])
+            claims = event.get('requestContext', {}).get('authorizer', {}).get('jwt', {}).get('claims', {})
+            user_id = claims.get('sub')
+            # A job description stored by an earlier call can be sent by hash alone
+            requested_hash = body.get("jdHash")
+            job_description = body["jobDescription"] if not requested_hash else None
         
         logger.info("Request parsed successfully", {
             'user_id': user_id,
-            'job_description_length': len(job_description),
+            'job_description_length': len(job_description) if job_description else None,
+            'jd_hash': requested_hash,
             'has_claims': bool(claims)
         })
+
+        jd_record = None
+        if requested_hash:
+            with span('dynamodb.load_job_description'):
+                jd_start = time.time()
+                jd_record = load_job_description(requested_hash)
+                jd_duration = (time.time() - jd_start) * 1000
+            logger.put_metric('ServiceLatency', jd_duration, service='dynamodb', operation='load_job_description')
+            if jd_record is None:
+                logger.warning("Job description not found", {'jd_hash': requested_hash})
+                return {
+                    'statusCode': 404,
+                    'body': json.dumps({'error': 'Job description not found. Please send jobDescription instead.'})
+                }
+        
+        # Get master resume from DynamoDB; its version keys the cached tailorings
+        logger.info("Retrieving master resume from DynamoDB", {
+            'table_name': 'ResumeMetadata',
+            'user_id': user_id
+        })
+        
+        with span('dynamodb.get_item', projection='entries,updatedAt'):
+            dynamodb_start = time.time()
+            master = load_master(user_id, ('entries', 'updatedAt'))
+            dynamodb_duration = (time.time() - dynamodb_start) * 1000
+        logger.put_metric('ServiceLatency', dynamodb_duration, service='dynamodb', operation='get_item')
+        
+        if master is None:
+            logger.warning("No master resume found for user", {
+                'user_id': user_id,
+                'duration_ms': round(dynamodb_duration, 2)
+            })
+            return {
+                'statusCode': 404,
+                'body': json.dumps({'error': 'No master resume found. Please upload a master resume first.'})
+            }
         
+        resume_entries = master['entries']
+        logger.info("Master resume retrieved successfully", {
+            'duration_ms': round(dynamodb_duration, 2),
+            'entries_count': len(resume_entries) if isinstance(resume_entries, list) else 0
+        })
+
+        # The same master version, job description and prompt were tailored before
+        master_version = master.get('updatedAt')
+        request_hash = jd_record['jdHash'] if jd_record else jd_hash(clean_text(job_description))
+        cached = None
+        if master_version:
+            with span('dynamodb.load_cached'):
+                cache_start = time.time()
+                try:
+                    cached = load_cached(user_id, master_version, request_hash)
+                except Exception as e:
+                    logger.warning("Failed to read cached tailoring", {'error': str(e)})
+                cache_duration = (time.time() - cache_start) * 1000
+            logger.put_metric('ServiceLatency', cache_duration, service='dynamodb', operation='load_cached')
+        logger.put_metric('TailorCache', 1, unit='Count', outcome='hit' if cached else 'miss')
+
+        if cached is not None:
+            logger.info("Returning cached tailoring", {
+                'master_version': master_version,
+                'jd_hash': request_hash,
+                'items_with_changes': int(cached.get('changes', 0))
+            })
+            return {
+                "statusCode": 200,
+                "headers": {"Content-Type": "application/json"},
+                "body": json.dumps({
+                    "resumeItems": cached['resumeItems'],
+                    "jdHash": request_hash,
+                    "cached": True
+                })
+            }
+
         # Initialize rate limiter and check limits
         logger.info("Initializing rate limiter")
         rate_limiter = create_rate_limiter()
         identifier, user_type = rate_limiter.get_user_identifier(event, claims)
+        logger.set_metric_dimensions(user_type=user_type)
         
         logger.info("User identified", {
             'user_type': user_type,
             'identifier': identifier if not identifier.startswith('guest_') else 'guest_***'
         })
         
-        # Check Bedrock rate limit before making the API call
+        # Check Bedrock rate limit before making the API call; cached tailorings are not charged
         logger.info("Checking Bedrock rate limits")
         success, current_count, limit = rate_limiter.check_and_increment_usage(
             identifier, user_type, 'bedrock_requests'
@@ -115,88 +165,23 @@ def lambda_handler(event, context):
                 })
             }
 
-        # Get master resume from DynamoDB
-        logger.info("Retrieving master resume from DynamoDB", {
-            'table_name': 'ResumeMetadata',
-            'user_id': user_id
-        })
-        
-        dynamodb_start = time.time()
-        response = table.get_item(Key={"resume_id": user_id})
-        dynamodb_duration = (time.time() - dynamodb_start) * 1000
-        
-        if 'Item' not in response:
-            logger.warning("No master resume found for user", {
-                'user_id': user_id,
-                'duration_ms': round(dynamodb_duration, 2)
-            })
-            return {
-                'statusCode': 404,
-                'body': json.dumps({'error': 'No master resume found. Please upload a master resume first.'})
-            }
-        
-        resume_entries = response['Item']['entries']
-        logger.info("Master resume retrieved successfully", {
-            'duration_ms': round(dynamodb_duration, 2),
-            'entries_count': len(resume_entries) if isinstance(resume_entries, list) else 0
-        })
+        if jd_record is None:
+            # Store the text so later calls can send its hash; tailor with the text if that fails
+            with span('dynamodb.save_job_description'):
+                jd_start = time.time()
+                try:
+                    jd_record = save_job_description(job_description)
+                except Exception as e:
+                    logger.warning("Failed to store job description", {'error': str(e)})
+                jd_duration = (time.time() - jd_start) * 1000
+            logger.put_metric('ServiceLatency', jd_duration, service='dynamodb', operation='save_job_description')
+        if jd_record is not None:
+            job_description = jd_record['text']
 
         # Prepare prompt for AI tailoring
         logger.info("Preparing prompt for resume tailoring")
-        prompt = f"""Given the following job description and resume items, subtly enhance the content to better match the job requirements while maintaining professional resume formatting. Make minimal, strategic changes that highlight relevant skills naturally.
-
-**Job Description:**
-{job_description}
-
-**Resume Items:**
-{json.dumps(resume_entries, indent=2)}
-
-**Instructions:**
-* Keep ALL resume items - don't remove any entries
-* NEVER modify education sections (degrees, courses, schools) - these are factual and objective
-* PRESERVE exact formatting including newlines, spacing, and line breaks - do not collapse or change whitespace
-* For skills sections: Keep as concise lists or brief phrases, NOT verbose paragraphs
-* For experience descriptions: Make subtle keyword optimizations while maintaining the original tone and style
-* AVOID adding explanatory phrases like "demonstrating strong skills in..." or "providing technical background in..."
-* Keep the professional, concise resume format - no academic or verbose descriptions
-* Only enhance what could realistically have been achieved in the original role/project
-* Maintain the exact same JSON structure and field names
-* Keep userInfo unchanged unless optimizing brief skills/summary sections
-
-**What TO DO:**
-* Subtly incorporate relevant keywords from the job description into existing descriptions
-* Highlight aspects of achievements that align with job requirements
-* Replace generic terms with more specific, relevant technical terms when appropriate
-* Optimize bullet points to emphasize job-relevant accomplishments
-* ACTIVELY ADD relevant skills, programming languages, frameworks, and tools from the job description to skills sections
-* Add technical skills that would logically fit with the person's background and the target role
-* Include relevant technologies, languages, and tools mentioned in the job posting
-
-**What NOT TO DO:**
-* Add verbose explanations or educational descriptions
-* Change factual information (dates, organizations, degrees, course names)
-* Turn concise skill lists into paragraph descriptions
-* Add phrases that explicitly state what skills are being demonstrated
-* Make changes that don't fit the original resume's style and tone
-* Modify newlines, spacing, or formatting - preserve exact whitespace structure
-
-**Output Format:**
-For each resume item, return an object with this structure:
-{{
-  "original": {{ original resume item exactly as provided }},
-  "tailored": {{ enhanced version with subtle, job-relevant optimizations }},
-  "hasChanges": true/false
-}}
-
-**Critical Requirements:**
-* Return a JSON array where each element has "original", "tailored", and "hasChanges" fields
-* Keep all field names and structure identical between original and tailored versions
-* Maintain professional resume formatting - concise, action-oriented, no verbose explanations
-* Ensure the output is valid JSON
-* RESPOND WITH ONLY THE JSON ARRAY - NO introductory text, concluding remarks, comments, or explanations
-* Your response must start with '[' and end with ']'
-* Do not add phrases like "Here is the enhanced resume" or any other text before the JSON
-"""
+        with span('prompt_build'):
+            prompt = format_prompt(job_description, resume_entries)
 
         logger.info("Starting Bedrock AI analysis for resume tailoring", {
             'model_id': MODEL_ID,
@@ -204,24 +189,16 @@ For each resume item, return an object with this structure:
             'master_resume_entries': len(resume_entries) if isinstance(resume_entries, list) else 0
         })
 
-        bedrock_start = time.time()
-        bedrock_response = bedrock.invoke_model(
-            modelId=MODEL_ID,
-            contentType="application/json",
-            accept="application/json",
-            body=json.dumps({
-                "anthropic_version": "bedrock-2023-05-31",
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                "max_tokens": 8192,
-                "temperature": 0.3
-            })
-        )
-        bedrock_duration = (time.time() - bedrock_start) * 1000
+        with span('bedrock.invoke_model'):
+            bedrock_start = time.time()
+            bedrock_response = get_client("bedrock-runtime", region_name=BEDROCK_REGION).invoke_model(
+                modelId=MODEL_ID,
+                contentType="application/json",
+                accept="application/json",
+                body=json.dumps(model_request(prompt))
+            )
+            bedrock_duration = (time.time() - bedrock_start) * 1000
+        logger.put_metric('ServiceLatency', bedrock_duration, service='bedrock', operation='invoke_model')
 
         logger.info("Bedrock AI analysis completed", {
             'duration_ms': round(bedrock_duration, 2)
@@ -229,26 +206,30 @@ For each resume item, return an object with this structure:
 
         output = json.loads(bedrock_response["body"].read())
         
-        # Clean control characters before parsing JSON
+        # Extract the JSON array from the response text
         raw_text = output["content"][0]["text"]
         logger.info("Raw AI response", {
-            'raw_text_preview': raw_text[:500] if raw_text else 'None',
             'raw_text_length': len(raw_text) if raw_text else 0,
             'raw_text_type': type(raw_text).__name__
         })
+        logger.capture_payload('model_response', raw_text)
         
-        cleaned_text = clean_json_string(raw_text)
-        logger.info("Cleaned AI response", {
-            'cleaned_text_preview': cleaned_text[:500] if cleaned_text else 'None',
-            'cleaned_text_length': len(cleaned_text) if cleaned_text else 0,
-            'cleaned_text_type': type(cleaned_text).__name__
-        })
-        
-        tailored_resume = json.loads(cleaned_text)
+        tailored_resume = parse_tailored(raw_text)
         
         # Count items with changes
-        changes_count = sum(1 for item in tailored_resume if item.get('hasChanges', False)) if isinstance(tailored_resume, list) else 0
+        changes_count = count_changes(tailored_resume)
         
+        if master_version:
+            with span('dynamodb.save_cached'):
+                cache_start = time.time()
+                try:
+                    save_cached(user_id, master_version, request_hash, tailored_resume, changes_count)
+                except Exception as e:
+                    # The tailoring still goes back; the next identical request calls the model again
+                    logger.warning("Failed to cache tailoring", {'error': str(e)})
+                cache_duration = (time.time() - cache_start) * 1000
+            logger.put_metric('ServiceLatency', cache_duration, service='dynamodb', operation='save_cached')
+
         logger.info("Resume tailoring completed successfully", {
             'original_entries': len(resume_entries) if isinstance(resume_entries, list) else 0,
             'tailored_entries': len(tailored_resume) if isinstance(tailored_resume, list) else 0,
@@ -265,7 +246,11 @@ For each resume item, return an object with this structure:
                 "X-RateLimit-Remaining": str(limit - current_count),
                 "X-RateLimit-Reset": str(int(time.time()) + (24 * 3600))
             },
-            "body": json.dumps({"resumeItems": tailored_resume})
+            "body": json.dumps({
+                "resumeItems": tailored_resume,
+                "jdHash": jd_record['jdHash'] if jd_record else None,
+                "cached": False
+            })
         }
 
     except json.JSONDecodeError as e:
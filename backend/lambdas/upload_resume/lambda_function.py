@@ -1,19 +1,20 @@
 import json
-import boto3
-import base64
 import uuid
 import os
 import sys
 import time
 
-# Add parent directory to path for imports
+# Add parent directory to path so resume_tailor_core resolves outside the Lambda layer
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from logger_utils import create_logger
+from resume_tailor_core.logger import create_logger, log_invocation
+from resume_tailor_core.tracing import span
+from resume_tailor_core.validation import decode_and_validate_pdf, UploadValidationError
+from resume_tailor_core.clients import get_client
 
-s3 = boto3.client('s3')
 BUCKET_NAME = 'resume-tailor-bucket.kp'
 
 
+@log_invocation
 def lambda_handler(event, context):
     # Initialize logger
     logger = create_logger('upload_resume')
@@ -59,8 +60,9 @@ def lambda_handler(event, context):
             }
 
         logger.info("Parsing request body")
-        body = json.loads(event['body'])
-        file_data = base64.b64decode(body['file'])
+        with span('parse'):
+            body = json.loads(event['body'])
+            file_data, page_count = decode_and_validate_pdf(body['file'])
         
         # Determine upload type and S3 key
         if 'filename' in body:
@@ -83,15 +85,18 @@ def lambda_handler(event, context):
         logger.info("File processing completed", {
             'upload_type': upload_type,
             'file_size_bytes': len(file_data),
+            'page_count': page_count,
             's3_key': s3_key,
             'bucket': BUCKET_NAME
         })
 
         # Upload to S3
         logger.info("Starting S3 upload")
-        s3_start = time.time()
-        s3.put_object(Bucket=BUCKET_NAME, Key=s3_key, Body=file_data)
-        s3_duration = (time.time() - s3_start) * 1000
+        with span('s3.put_object'):
+            s3_start = time.time()
+            get_client('s3').put_object(Bucket=BUCKET_NAME, Key=s3_key, Body=file_data)
+            s3_duration = (time.time() - s3_start) * 1000
+        logger.put_metric('ServiceLatency', s3_duration, service='s3', operation='put_object')
         
         logger.info("S3 upload completed successfully", {
             'duration_ms': round(s3_duration, 2),
@@ -119,6 +124,18 @@ def lambda_handler(event, context):
             },
             'body': json.dumps({'error': 'Invalid JSON in request body'})
         }
+    except UploadValidationError as e:
+        logger.warning("Upload rejected by validation", {
+            'error': e.message,
+            'status_code': e.status_code
+        })
+        return {
+            'statusCode': e.status_code,
+            'headers': {
+                'Content-Type': 'application/json'
+            },
+            'body': json.dumps({'error': e.message})
+        }
     except Exception as e:
         logger.error("Unexpected error during resume upload", {'error': str(e)})
         return {
@@ -1,57 +1,127 @@
 import json
-import boto3
-import base64
-import uuid
+import hashlib
 import os
 import sys
 import time
+from datetime import datetime, timezone
+from botocore.exceptions import ClientError
 
-# Add the parent directory to sys.path to import rate_limiter and logger
+# Add parent directory to path so resume_tailor_core resolves outside the Lambda layer
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from logger_utils import create_logger
-from rate_limiter import create_rate_limiter
+from resume_tailor_core.logger import create_logger, log_invocation
+from resume_tailor_core.tracing import span
+from resume_tailor_core.validation import decode_and_validate_pdf, UploadValidationError
+from resume_tailor_core.clients import get_client
 
-s3 = boto3.client('s3')
 BUCKET_NAME = 'resume-tailor-bucket.kp'
 
+# Guest objects are content-addressed and expire through the bucket lifecycle
+# rule on the guest/ prefix (see LambdaDeployer.configure_bucket_lifecycle).
+# Lifecycle age counts from LastModified, so a re-upload of an object older
+# than this window copies it onto itself to restart the expiry clock.
+ACCESS_REFRESH_SECONDS = 6 * 3600
 
+
+def get_existing_object(s3_key):
+    """
+    Return the head_object response for s3_key, or None if it does not exist.
+    S3 only answers 404 for a missing key when the caller has s3:ListBucket
+    on the bucket; without it the answer is 403, which is raised.
+    """
+    try:
+        return get_client('s3').head_object(Bucket=BUCKET_NAME, Key=s3_key)
+    except ClientError as e:
+        if e.response['Error']['Code'] in ('404', 'NoSuchKey', 'NotFound'):
+            return None
+        raise
+
+
+def refresh_access_timestamp(s3_key):
+    """Copy the object onto itself so lifecycle expiry counts from now"""
+    get_client('s3').copy_object(
+        Bucket=BUCKET_NAME,
+        Key=s3_key,
+        CopySource={'Bucket': BUCKET_NAME, 'Key': s3_key},
+        ContentType='application/pdf',
+        Metadata={'accessed-at': datetime.now(timezone.utc).isoformat()},
+        MetadataDirective='REPLACE'
+    )
+
+
+@log_invocation
 def lambda_handler(event, context):
     # Initialize logger
     logger = create_logger('upload_resume_guest')
+    logger.set_metric_dimensions(user_type='guest')
     logger.log_function_start(event, context)
     
     try:
         logger.info("Parsing guest upload request")
-        body = json.loads(event['body'])
-        file_data = base64.b64decode(body['file'])
-        file_name = f"{uuid.uuid4()}.pdf"
+        with span('parse'):
+            body = json.loads(event['body'])
+            file_data, page_count = decode_and_validate_pdf(body['file'])
+
+        # Content-addressed key: identical uploads map to the same object, so
+        # downstream caches keyed on s3_key hit for repeated uploads
+        content_hash = hashlib.sha256(file_data).hexdigest()
+        file_name = f"{content_hash}.pdf"
         s3_key = f"guest/{file_name}"
 
         logger.info("Guest upload request parsed successfully", {
             'file_size_bytes': len(file_data),
-            'generated_filename': file_name,
+            'page_count': page_count,
+            'content_sha256': content_hash,
             's3_key': s3_key,
             'bucket': BUCKET_NAME
         })
 
-        # Upload to S3
-        logger.info("Starting S3 upload for guest file")
+        logger.info("Checking for existing guest object")
         s3_start = time.time()
-        s3.put_object(Bucket=BUCKET_NAME, Key=s3_key, Body=file_data)
-        s3_duration = (time.time() - s3_start) * 1000
-        
-        logger.info("Guest file uploaded to S3 successfully", {
-            'duration_ms': round(s3_duration, 2),
-            's3_key': s3_key,
-            'bucket': BUCKET_NAME,
-            'file_size_bytes': len(file_data)
-        })
+        with span('s3.head_object'):
+            existing = get_existing_object(s3_key)
+
+        if existing:
+            last_modified = existing['LastModified']
+            age_seconds = (datetime.now(timezone.utc) - last_modified).total_seconds()
+            refreshed = age_seconds > ACCESS_REFRESH_SECONDS
+            if refreshed:
+                with span('s3.copy_object'):
+                    refresh_access_timestamp(s3_key)
+            s3_duration = (time.time() - s3_start) * 1000
+            logger.put_metric('ServiceLatency', s3_duration, service='s3', operation='head_object', cache='hit')
+
+            logger.info("Guest file already stored, skipping upload", {
+                'duration_ms': round(s3_duration, 2),
+                's3_key': s3_key,
+                'object_age_seconds': round(age_seconds),
+                'access_timestamp_refreshed': refreshed
+            })
+        else:
+            logger.info("Starting S3 upload for guest file")
+            with span('s3.put_object'):
+                get_client('s3').put_object(
+                    Bucket=BUCKET_NAME,
+                    Key=s3_key,
+                    Body=file_data,
+                    ContentType='application/pdf',
+                    Metadata={'accessed-at': datetime.now(timezone.utc).isoformat()}
+                )
+            s3_duration = (time.time() - s3_start) * 1000
+            logger.put_metric('ServiceLatency', s3_duration, service='s3', operation='put_object', cache='miss')
+
+            logger.info("Guest file uploaded to S3 successfully", {
+                'duration_ms': round(s3_duration, 2),
+                's3_key': s3_key,
+                'bucket': BUCKET_NAME,
+                'file_size_bytes': len(file_data)
+            })
 
         return {
             'statusCode': 200,
             'headers': {'Content-Type': 'application/json'},
             'body': json.dumps({
-                's3_key': s3_key
+                's3_key': s3_key,
+                'deduplicated': existing is not None
             })
         }
 
@@ -61,6 +131,16 @@ def lambda_handler(event, context):
             'statusCode': 400,
             'body': json.dumps({'error': 'Invalid JSON in request body'})
         }
+    except UploadValidationError as e:
+        logger.warning("Guest upload rejected by validation", {
+            'error': e.message,
+            'status_code': e.status_code
+        })
+        return {
+            'statusCode': e.status_code,
+            'headers': {'Content-Type': 'application/json'},
+            'body': json.dumps({'error': e.message})
+        }
     except Exception as e:
         logger.error("Unexpected error during guest resume upload", {'error': str(e)})
         return {
@@ -1,27 +1,43 @@
 const BASE_URL = process.env.NEXT_PUBLIC_API_URL; // update
 
+// An identical request is still running on the server; its result is
+// shared with this one if we ask again shortly.
+const MAX_PENDING_RETRIES = 5;
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
 export default async function fetchHTTPClient<T>(
   endpoint: string,
   request: RequestInit = {}
 ): Promise<T> {
-  const response = await fetch(`${BASE_URL}${endpoint}`, {
-    ...request,
-    headers: {
-      "Content-Type": "application/json",
-      ...request.headers,
-    },
-  });
+  for (let attempt = 0; ; attempt++) {
+    const response = await fetch(`${BASE_URL}${endpoint}`, {
+      ...request,
+      headers: {
+        "Content-Type": "application/json",
+        ...request.headers,
+      },
+    });
 
-  if (!response.ok) {
-    const errorBody = await response.json();
-    throw new Error(
-      errorBody.error || `HTTP error! Status: ${response.status}`
-    );
-  }
+    if (!response.ok) {
+      const errorBody = await response.json();
+      if (
+        response.status == 409 &&
+        errorBody.pending &&
+        attempt < MAX_PENDING_RETRIES
+      ) {
+        await sleep((errorBody.retryAfter || 2) * 1000);
+        continue;
+      }
+      throw new Error(
+        errorBody.error || `HTTP error! Status: ${response.status}`
+      );
+    }
 
-  if (response.status == 204) {
-    return null as T;
-  }
+    if (response.status == 204) {
+      return null as T;
+    }
 
-  return response.json();
+    return response.json();
+  }
 }
@@ -19,28 +19,107 @@ export interface TailoredResumeEntry {
 export interface GetMasterResumeResponseBody {
   url: string;
   entries: ResumeEntry[];
+  version?: string;
 }
 
 export interface ProcessMasterResumeBody {
   file: string;
 }
 
+// The processed resume, so the client doesn't need to refetch it
 export interface ProcessMasterResumeResponseBody {
-  s3_key: string;
+  s3Key: string;
+  url: string;
+  entries: ResumeEntry[];
+  version: string;
 }
 
 export interface TailorMasterResumeBody {
-  jobDescription: string;
+  jobDescription?: string;
+  jdHash?: string;
 }
 
+// `cached`: returned from an earlier tailoring of the same master version and job description
 export interface TailorMasterResumeResponseBody {
   resumeItems: TailoredResumeEntry[];
+  jdHash: string | null;
+  cached: boolean;
+}
+
+// Text, or the hash of a job description stored by an earlier call
+export type BatchJobDescription = string | { jdHash: string };
+
+export interface TailorBatchBody {
+  jobDescriptions: BatchJobDescription[];
+  concurrency?: number;
+}
+
+export interface TailorBatchJob {
+  index: number;
+  jdHash: string;
+  title: string;
+  cached: boolean;
+}
+
+// Jobs past the daily Bedrock limit are returned in `rateLimited`, not queued
+export interface TailorBatchResponseBody {
+  batchId: string;
+  status: "queued";
+  jobs: TailorBatchJob[];
+  rateLimited: TailorBatchJob[];
+}
+
+export interface TailorBatchJobStatus extends TailorBatchJob {
+  state: "pending" | "done" | "failed";
+  changes: number | null;
+  error: string | null;
+}
+
+export interface GetTailorBatchResponseBody {
+  batchId: string;
+  status: "queued" | "running" | "complete" | "failed";
+  total: number;
+  completed: number;
+  failed: number;
+  jobs: TailorBatchJobStatus[];
+  error: string | null;
+  createdAt: string;
+  updatedAt: string;
+}
+
+export interface GetTailorBatchResultResponseBody {
+  batchId: string;
+  index: number;
+  resumeItems: TailoredResumeEntry[];
+  jdHash: string | null;
+  changes: number;
 }
 
 export interface GetTailoredResumesResponseBody {
   files: { name: string; url: string }[];
 }
 
+export interface ServiceUsage {
+  current_usage: number;
+  daily_limit: number;
+  remaining: number;
+}
+
+export interface UsageStats {
+  user_type: string;
+  bedrock: ServiceUsage;
+  textract: ServiceUsage;
+  reset_time: number;
+}
+
+// Sections that failed to load are null and named in `errors`
+export interface GetDashboardResponseBody {
+  master: GetMasterResumeResponseBody | null;
+  tailored: GetTailoredResumesResponseBody | null;
+  usage: UsageStats | null;
+  errors?: Record<string, string>;
+}
+
 export default class masterHTTPClient {
   static async processMasterResume(
     file: string
@@ -70,11 +149,13 @@ export default class masterHTTPClient {
   }
 
   static async tailorMasterResume(
-    jobDescription: string
+    jobDescription: string,
+    jdHash?: string | null
   ): Promise<TailorMasterResumeResponseBody> {
-    const tailorMasterResumeRequestBody: TailorMasterResumeBody = {
-      jobDescription,
-    };
+    // A job description stored by an earlier call is sent by hash only
+    const tailorMasterResumeRequestBody: TailorMasterResumeBody = jdHash
+      ? { jdHash }
+      : { jobDescription };
     return await fetchHTTPClient<TailorMasterResumeResponseBody>(`/tailor`, {
       method: "POST",
       body: JSON.stringify(tailorMasterResumeRequestBody),
@@ -86,6 +167,66 @@ export default class masterHTTPClient {
     });
   }
 
+  static async startTailorBatch(
+    jobDescriptions: BatchJobDescription[],
+    concurrency?: number
+  ): Promise<TailorBatchResponseBody> {
+    const tailorBatchRequestBody: TailorBatchBody = {
+      jobDescriptions,
+      concurrency,
+    };
+    return await fetchHTTPClient<TailorBatchResponseBody>(`/tailor-batch`, {
+      method: "POST",
+      body: JSON.stringify(tailorBatchRequestBody),
+      headers: {
+        Authorization: `Bearer ${
+          (await fetchAuthSession()).tokens?.accessToken?.toString() || ""
+        }`,
+      },
+    });
+  }
+
+  static async getTailorBatch(
+    batchId: string
+  ): Promise<GetTailorBatchResponseBody> {
+    return await fetchHTTPClient<GetTailorBatchResponseBody>(
+      `/tailor-batch?batchId=${encodeURIComponent(batchId)}`,
+      {
+        headers: {
+          Authorization: `Bearer ${
+            (await fetchAuthSession()).tokens?.accessToken?.toString() || ""
+          }`,
+        },
+      }
+    );
+  }
+
+  static async getTailorBatchResult(
+    batchId: string,
+    index: number
+  ): Promise<GetTailorBatchResultResponseBody> {
+    return await fetchHTTPClient<GetTailorBatchResultResponseBody>(
+      `/tailor-batch?batchId=${encodeURIComponent(batchId)}&index=${index}`,
+      {
+        headers: {
+          Authorization: `Bearer ${
+            (await fetchAuthSession()).tokens?.accessToken?.toString() || ""
+          }`,
+        },
+      }
+    );
+  }
+
+  static async getDashboard(): Promise<GetDashboardResponseBody> {
+    return await fetchHTTPClient<GetDashboardResponseBody>(`/dashboard`, {
+      headers: {
+        Authorization: `Bearer ${
+          (await fetchAuthSession()).tokens?.accessToken?.toString() || ""
+        }`,
+      },
+    });
+  }
+
   static async getTailoredResumes(): Promise<GetTailoredResumesResponseBody> {
     return await fetchHTTPClient<GetTailoredResumesResponseBody>(`/tailor`, {
       headers: {
@@ -7,8 +7,13 @@ export interface ScoreResumeBody {
   with_auth?: boolean; // Optional parameter for authentication status
 }
 
+// A job description rejected before scoring has no resultId; its feedback says why
 export interface ScoreResumeResponseBody {
-  resultId: string;
+  resultId: string | null;
+  jdHash: string | null;
+  score?: number;
+  feedback?: string[];
+  reason?: string;
 }
 
 export interface GetScoreResponseBody {
@@ -31,7 +31,8 @@ import MultiStepProcessingLoader from "@/components/MultiStepProcessingLoader";
 import TextareaWithCounter from "@/components/TextareaWithCounter";
 import TailoredDiffViewer from "@/components/TailoredDiffViewer";
 import ResumePreviewModal from "@/components/ResumePreviewModal";
-import { TailoredResumeEntry } from "@/http/masterHTTPClient";
+import { TailoredResumeEntry, UsageStats } from "@/http/masterHTTPClient";
+import { ScoreResumeResponseBody } from "@/http/scoreHTTPClient";
 
 // Add these constants near the top of the file, after the imports
 const MAX_CHARACTERS = 5000; // You can adjust this number as needed
@@ -91,6 +92,11 @@ export default function Dashboard() {
     null
   );
   const [jobDescription, setJobDescription] = useState<string>("");
+  // Hash of the last job description tailored against, for re-tailoring it
+  const [storedJobDescription, setStoredJobDescription] = useState<{
+    text: string;
+    jdHash: string;
+  } | null>(null);
   const [tailoredJobDescription, setTailoredJobDescription] =
     useState<string>("");
   const [isResumePreviewCollapsed, setIsResumePreviewCollapsed] =
@@ -105,6 +111,7 @@ export default function Dashboard() {
     useState<boolean>(false);
 
   const [isScoring, setIsScoring] = useState<boolean>(false);
+  const [usage, setUsage] = useState<UsageStats | null>(null);
 
   const [tailoredResumes, setTailoredResumes] = useState<
     {
@@ -147,6 +154,18 @@ export default function Dashboard() {
     return false;
   };
 
+  // Open a score, or show why the job description was not scored
+  const showScoreResult = (response: ScoreResumeResponseBody) => {
+    if (response.resultId) {
+      router.push(`/score/${response.resultId}`);
+      return;
+    }
+    setUploadStatus({
+      message: response.feedback?.[0] || "The job description could not be scored.",
+      type: "error",
+    });
+  };
+
   // Define steps for Master Resume Processing
   const masterResumeProcessingSteps: ProcessingStep[] = [
     { id: 1, text: "Uploading Resume", duration: 2000 },
@@ -188,25 +207,27 @@ export default function Dashboard() {
         }
 
         try {
-          const resumeData = await masterHTTPClient.getMasterResume();
-          const tailoredResumes = await masterHTTPClient.getTailoredResumes();
-          setMasterResumeUrl(resumeData.url);
-          setResumeEntries(resumeData.entries);
-          setTailoredResumes(tailoredResumes.files);
-          setResumeError(null);
-        } catch (fetchError) {
-          console.log("Failed to fetch master resume data:", fetchError);
-          if ((fetchError as Error).message?.includes("404")) {
-            setMasterResumeUrl(null);
-            setResumeEntries(null);
-            setResumeError(null);
-          } else {
-            setMasterResumeUrl(null);
-            setResumeEntries(null);
+          // One request for the master resume, tailored resumes and usage
+          const dashboard = await masterHTTPClient.getDashboard();
+          setMasterResumeUrl(dashboard.master?.url ?? null);
+          setResumeEntries(dashboard.master?.entries ?? null);
+          setTailoredResumes(dashboard.tailored?.files ?? []);
+          setUsage(dashboard.usage);
+          if (dashboard.errors?.master) {
+            console.log("Failed to fetch master resume data:", dashboard.errors);
             setResumeError(
               "Failed to load master resume data. Please try again later."
             );
+          } else {
+            setResumeError(null);
           }
+        } catch (fetchError) {
+          console.log("Failed to fetch dashboard data:", fetchError);
+          setMasterResumeUrl(null);
+          setResumeEntries(null);
+          setResumeError(
+            "Failed to load master resume data. Please try again later."
+          );
         } finally {
           setResumeLoading(false);
         }
@@ -271,9 +292,9 @@ export default function Dashboard() {
       setIsUploading(true);
       try {
         const fileBase64 = await fileToBase64(file);
-        await masterHTTPClient.processMasterResume(fileBase64);
-
-        const resumeData = await masterHTTPClient.getMasterResume();
+        const resumeData = await masterHTTPClient.processMasterResume(
+          fileBase64
+        );
         setMasterResumeUrl(resumeData.url);
         setResumeEntries(resumeData.entries);
         setResumeError(null);
@@ -302,9 +323,15 @@ export default function Dashboard() {
     try {
       setIsTailoring(true);
       const response = await masterHTTPClient.tailorMasterResume(
-        jobDescription
+        jobDescription,
+        storedJobDescription?.text === jobDescription
+          ? storedJobDescription.jdHash
+          : null
       );
       setTailoredResumeEntries(response.resumeItems);
+      setStoredJobDescription(
+        response.jdHash ? { text: jobDescription, jdHash: response.jdHash } : null
+      );
       setIsTailoring(false);
       setViewTailoredResume(true);
     } catch (error) {
@@ -423,8 +450,7 @@ export default function Dashboard() {
           isAuthenticated
         );
 
-        const resultId = response.resultId;
-        router.push(`/score/${resultId}`);
+        showScoreResult(response);
       } catch (error) {
         console.error("Error scoring resume:", error);
         const errorMessage = (error as Error).message;
@@ -476,8 +502,7 @@ export default function Dashboard() {
         isAuthenticated
       );
 
-      const resultId = response.resultId;
-      router.push(`/score/${resultId}`);
+      showScoreResult(response);
     } catch (error) {
       console.error("Scoring failed:", error);
       const errorMessage = (error as Error).message;
@@ -527,8 +552,7 @@ export default function Dashboard() {
         isAuthenticated
       );
 
-      const resultId = response.resultId;
-      router.push(`/score/${resultId}`);
+      showScoreResult(response);
     } catch (error) {
       console.error("Scoring failed:", error);
       const errorMessage = (error as Error).message;
@@ -831,6 +855,12 @@ export default function Dashboard() {
                       Upload a master resume first.
                     </p>
                   )}
+                  {masterResumeUrl && usage && (
+                    <p className="text-xs text-center text-gray-500 mt-2">
+                      {usage.bedrock.remaining} of {usage.bedrock.daily_limit}{" "}
+                      AI requests left today.
+                    </p>
+                  )}
                 </div>
               </div>
 
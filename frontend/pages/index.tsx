@@ -277,8 +277,16 @@ const Home: React.FC = () => {
         jobDescription,
         isAuthenticated
       );
-      const resultId = response.resultId;
-      router.push(`/score/${resultId}`);
+      // A job description rejected before scoring has no result to open
+      if (!response.resultId) {
+        setUploadStatus({
+          message:
+            response.feedback?.[0] || "The job description could not be scored.",
+          type: "error",
+        });
+        return;
+      }
+      router.push(`/score/${response.resultId}`);
     } catch (error) {
       console.error("Error scoring resume:", error);
       const errorMessage = (error as Error).message;